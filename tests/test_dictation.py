@@ -0,0 +1,35 @@
+import importlib
+import random
+
+import pytest
+
+SP = importlib.import_module("СП")
+
+
+def levenshtein(expected, answer):
+    """Полная матрица расстояния Левенштейна - эталон для полосового расчета"""
+    previous = list(range(len(answer) + 1))
+    for i, expected_note in enumerate(expected, 1):
+        row = [i]
+        for j, answer_note in enumerate(answer, 1):
+            row.append(min(previous[j] + 1, row[j - 1] + 1,
+                           previous[j - 1] + (expected_note != answer_note)))
+        previous = row
+    return previous[-1]
+
+
+@pytest.mark.parametrize("band", [None, 0, 1, 3])
+def test_banded_distance_matches_full_matrix(band):
+    rng = random.Random(band)
+    for _ in range(300):
+        expected = [rng.randrange(4) for _ in range(rng.randrange(0, 10))]
+        answer = [rng.randrange(4) for _ in range(rng.randrange(0, 10))]
+        distance, alignment = SP.align_sequences(expected, answer, band=band)
+        assert distance == levenshtein(expected, answer)
+        assert [note for _, note, _ in alignment if note is not None] == expected
+        assert [note for _, _, note in alignment if note is not None] == answer
+
+
+def test_zero_band_with_equal_lengths_terminates():
+    distance, _ = SP.align_sequences([1, 2], [1, 3], band=0)
+    assert distance == 1
@@ -0,0 +1,39 @@
+import importlib
+
+import numpy as np
+import pytest
+
+SP = importlib.import_module("СП")
+
+
+def write_tone(path, midi, cents, timbre="sine", duration_ms=1000):
+    """WAV-запись ноты с заданным отклонением - вместо записи с микрофона"""
+    synth = SP.SynthEngine(timbre=timbre)
+    frequency = SP.DEFAULT_PITCH_TABLE.frequency(midi) * 2 ** (cents / 1200)
+    SP.write_wav(str(path), synth.to_int16(synth.render_note(frequency, duration_ms)), synth.sample_rate)
+
+
+@pytest.mark.parametrize("midi, cents, timbre", [(57, 0, "sine"), (69, 20, "sine"),
+                                                 (64, -30, "organ"), (72, 10, "piano")])
+def test_detector_finds_note_and_cents_in_wav(tmp_path, midi, cents, timbre):
+    path = tmp_path / "tone.wav"
+    write_tone(path, midi, cents, timbre)
+    samples, sample_rate = SP.read_wav(str(path))
+    segments = SP.pitch_segments(SP.PitchDetector(sample_rate).process(samples))
+    assert [segment["midi"] for segment in segments] == [midi]
+    assert segments[0]["cents"] == pytest.approx(cents, abs=5)
+
+
+def test_tracker_blocks_match_whole_recording(tmp_path):
+    path = tmp_path / "tone.wav"
+    write_tone(path, 62, 15)
+    samples, sample_rate = SP.read_wav(str(path))
+    detector = SP.PitchDetector(sample_rate)
+    tracker = SP.PitchTracker(detector)
+    # Блоки неровной длины, как их отдает звуковая карта
+    frames = np.concatenate([tracker.feed(samples[start:start + 700])
+                             for start in range(0, len(samples), 700)])
+    whole = detector.process(samples)
+    assert len(frames) == len(whole)
+    np.testing.assert_array_equal(frames["midi"], whole["midi"])
+    np.testing.assert_allclose(frames["cents"], whole["cents"], atol=1e-6)
@@ -1,792 +1,4574 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import json
+import re
 import os
+import sys
 import random
 import webbrowser
-import winsound
 import threading
 import time
+import io
+import math
+import wave
+import queue
+import itertools
+import tempfile
+import traceback
+import shutil
+import subprocess
+import importlib
+import importlib.util
+import functools
+import hashlib
+import gzip
+import heapq
+import bisect
+import sqlite3
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import OrderedDict
+import numpy as np
+
+# Частота дискретизации синтезатора (Гц)
+SAMPLE_RATE = 22050
+
+# Названия ступеней хроматической гаммы
+PITCH_CLASS_NAMES = ["До", "До♯", "Ре", "Ре♯", "Ми", "Фа", "Фа♯", "Соль", "Соль♯", "Ля", "Ля♯", "Си"]
+
+# Строи: положение каждой из 12 ступеней над До (в центах)
+TEMPERAMENTS = {
+    "equal": {"title": "Равномерная темперация",
+              "cents": [100.0 * step for step in range(12)]},
+    "just": {"title": "Чистый строй",
+             "cents": [1200 * math.log2(ratio) for ratio in
+                       (1, 16/15, 9/8, 6/5, 5/4, 4/3, 45/32, 3/2, 8/5, 5/3, 9/5, 15/8)]},
+    "pythagorean": {"title": "Пифагоров строй",
+                    "cents": [1200 * math.log2(ratio) for ratio in
+                              (1, 256/243, 9/8, 32/27, 81/64, 4/3, 729/512, 3/2, 128/81, 27/16, 16/9, 243/128)]},
+    # Четвертькоммовый среднетоновый: квинта сужена на 1/4 синтонической коммы,
+    # ступени - цепочка квинт от Ми♭ до Соль♯
+    "meantone": {"title": "Среднетоновый строй",
+                 "cents": [(fifths * (1200 * math.log2(3 / 2) - 1200 * math.log2(81 / 80) / 4)) % 1200
+                           for fifths in (0, 7, 2, -3, 4, -1, 6, 1, 8, 3, -2, 5)]}
+}
+
+
+class PitchTable:
+    """Частоты всех клавиш фортепиано (MIDI 21-108) для заданных A4 и строя"""
+    
+    LOWEST = 21    # Ля субконтроктавы
+    HIGHEST = 108  # До пятой октавы
+    
+    def __init__(self, a4=440.0, temperament="equal"):
+        self.a4 = a4
+        self.temperament = temperament
+        cents = np.array(TEMPERAMENTS[temperament]["cents"])
+        midi = np.arange(self.LOWEST, self.HIGHEST + 1)
+        octaves = midi // 12 - 1
+        # Строй отсчитывается от До, а A4 (MIDI 69) сохраняет заданную частоту
+        self.frequencies = a4 * 2.0 ** (octaves - 4 + (cents[midi % 12] - cents[9]) / 1200)
+        self.frequencies.flags.writeable = False
+    
+    def frequency(self, midi):
+        """Частота одной клавиши"""
+        return float(self.frequencies[midi - self.LOWEST])
+    
+    def lookup(self, midi):
+        """Частоты массива клавиш одной векторной выборкой"""
+        return self.frequencies[np.asarray(midi) - self.LOWEST]
+    
+    def chord(self, root, semitones):
+        """Частоты ступеней, отстоящих от корня на заданное число полутонов"""
+        return self.lookup(root + np.asarray(semitones)).tolist()
+    
+    @staticmethod
+    def name(midi):
+        """Название клавиши с номером октавы (До4 - до первой октавы)"""
+        return f"{PITCH_CLASS_NAMES[midi % 12]}{midi // 12 - 1}"
+
+
+DEFAULT_PITCH_TABLE = PitchTable()
+
+# Белые клавиши первой октавы (номера MIDI)
+WHITE_KEYS = {"До": 60, "Ре": 62, "Ми": 64, "Фа": 65, "Соль": 67, "Ля": 69, "Си": 71}
+
+# Частоты для нот (в герцах)
+NOTE_FREQUENCIES = {note: DEFAULT_PITCH_TABLE.frequency(midi) for note, midi in WHITE_KEYS.items()}
+
+# Словарь для отображения нот на русском с латинскими эквивалентами
+NOTES_DICT = {
+    "До": "C", "Ре": "D", "Ми": "E", 
+    "Фа": "F", "Соль": "G", "Ля": "A", "Си": "B"
+}
+
+# Интервалы и их характеристики
+INTERVALS = {
+    "Прима (ч.1)": {"semitones": 0, "example": "До-До", "character": "Полное слияние"},
+    "Малая секунда (м.2)": {"semitones": 1, "example": "До-Ре♭", "character": "Напряженно"},
+    "Большая секунда (б.2)": {"semitones": 2, "example": "До-Ре", "character": "Уверенно"},
+    "Малая терция (м.3)": {"semitones": 3, "example": "До-Ми♭", "character": "Грустно"},
+    "Большая терция (б.3)": {"semitones": 4, "example": "До-Ми", "character": "Радостно"},
+    "Чистая кварта (ч.4)": {"semitones": 5, "example": "До-Фа", "character": "Устойчиво"},
+    "Тритон (ув.4/ум.5)": {"semitones": 6, "example": "До-Фа♯/Соль♭", "character": "Драматично"},
+    "Чистая квинта (ч.5)": {"semitones": 7, "example": "До-Соль", "character": "Благозвучно"},
+    "Малая секста (м.6)": {"semitones": 8, "example": "До-Ля♭", "character": "Лирично"},
+    "Большая секста (б.6)": {"semitones": 9, "example": "До-Ля", "character": "Восторженно"},
+    "Малая септима (м.7)": {"semitones": 10, "example": "До-Си♭", "character": "Напряженно"},
+    "Большая септима (б.7)": {"semitones": 11, "example": "До-Си", "character": "Резко"},
+    "Чистая октава (ч.8)": {"semitones": 12, "example": "До-До", "character": "Полное слияние"}
+}
+
+# Составные интервалы (шире октавы): простой интервал плюс октава
+COMPOUND_INTERVALS = {
+    "Малая нона (м.9)": {"semitones": 13, "example": "До-Ре♭¹", "character": "Резко, колюче"},
+    "Большая нона (б.9)": {"semitones": 14, "example": "До-Ре¹", "character": "Светло, просторно"},
+    "Малая децима (м.10)": {"semitones": 15, "example": "До-Ми♭¹", "character": "Мягко, грустно"},
+    "Большая децима (б.10)": {"semitones": 16, "example": "До-Ми¹", "character": "Широко, радостно"},
+    "Чистая ундецима (ч.11)": {"semitones": 17, "example": "До-Фа¹", "character": "Прозрачно"},
+    "Увеличенная ундецима (ув.11)": {"semitones": 18, "example": "До-Фа♯¹", "character": "Остро, неустойчиво"},
+    "Чистая дуодецима (ч.12)": {"semitones": 19, "example": "До-Соль¹", "character": "Пусто, гулко"},
+    "Малая терцдецима (м.13)": {"semitones": 20, "example": "До-Ля♭¹", "character": "Печально"},
+    "Большая терцдецима (б.13)": {"semitones": 21, "example": "До-Ля¹", "character": "Открыто"},
+    "Малая квартдецима (м.14)": {"semitones": 22, "example": "До-Си♭¹", "character": "Напряженно"},
+    "Большая квартдецима (б.14)": {"semitones": 23, "example": "До-Си¹", "character": "Жестко"},
+    "Чистая квинтдецима (ч.15)": {"semitones": 24, "example": "До-До²", "character": "Полное слияние"}
+}
+
+# Все интервалы тренажера: простые и составные
+ALL_INTERVALS = {**INTERVALS, **COMPOUND_INTERVALS}
+
+# Аккорды для упражнения (название, структура, описание)
+CHORDS = {
+    "Мажорное трезвучие": {
+        "structure": "б.3 + м.3",
+        "example": "До-Ми-Соль",
+        "character": "Радостно, светло",
+        "semitones": [0, 4, 7]
+    },
+    "Минорное трезвучие": {
+        "structure": "м.3 + б.3",
+        "example": "До-Ми♭-Соль",
+        "character": "Грустно, темно",
+        "semitones": [0, 3, 7]
+    },
+    "Увеличенное трезвучие": {
+        "structure": "б.3 + б.3",
+        "example": "До-Ми-Соль♯",
+        "character": "Загадочно, напряженно",
+        "semitones": [0, 4, 8]
+    },
+    "Уменьшенное трезвучие": {
+        "structure": "м.3 + м.3",
+        "example": "До-Ми♭-Соль♭",
+        "character": "Тревожно, неустойчиво",
+        "semitones": [0, 3, 6]
+    },
+    "Большой мажорный септаккорд": {
+        "structure": "маж.трезв. + б.3",
+        "example": "До-Ми-Соль-Си",
+        "character": "Ярко, мечтательно",
+        "semitones": [0, 4, 7, 11]
+    },
+    "Малый мажорный септаккорд": {
+        "structure": "маж.трезв. + м.3",
+        "example": "До-Ми-Соль-Си♭",
+        "character": "Напряженно, ожидаемо",
+        "semitones": [0, 4, 7, 10]
+    },
+    "Малый минорный септаккорд": {
+        "structure": "мин.трезв. + м.3",
+        "example": "До-Ми♭-Соль-Си♭",
+        "character": "Лирично, меланхолично",
+        "semitones": [0, 3, 7, 10]
+    },
+    "Уменьшенный септаккорд": {
+        "structure": "ум.трезв. + м.3",
+        "example": "До-Ми♭-Соль♭-Си♭♭",
+        "character": "Тайнственно, драматично",
+        "semitones": [0, 3, 6, 9]
+    }
+}
+
+# Уровни сложности
+DIFFICULTY_LEVELS = {
+    "Начальный": ["Мажорное трезвучие", "Минорное трезвучие"],
+    "Средний": ["Мажорное трезвучие", "Минорное трезвучие", 
+               "Увеличенное трезвучие", "Уменьшенное трезвучие"],
+    "Продвинутый": list(CHORDS.keys())
+}
+
+# Названия обращений по числу звуков аккорда
+INVERSION_NAMES = {
+    3: ["основной вид", "секстаккорд", "квартсекстаккорд"],
+    4: ["основной вид", "квинтсекстаккорд", "терцквартаккорд", "секундаккорд"]
+}
+
+# Расположения: тесное, широкое (верхние голоса через один на октаву выше)
+# и разнесенное (широкое с басом октавой ниже)
+VOICING_TITLES = {"close": "тесное", "open": "широкое", "spread": "разнесенное"}
+
+# Обращения и расположения аккордов по уровням сложности (inversions - сколько первых обращений)
+CHORD_VOICING_LEVELS = {
+    "Начальный": {"inversions": 1, "voicings": ("close",)},
+    "Средний": {"inversions": 4, "voicings": ("close",)},
+    "Продвинутый": {"inversions": 4, "voicings": ("close", "open", "spread")}
+}
+
+
+@functools.lru_cache(maxsize=None)
+def chord_voicings(semitones, root, inversions=4, voicings=("close",),
+                   lowest=21, highest=108):
+    """Все обращения и расположения аккорда от корня root в пределах клавиатуры
+    
+    semitones - кортеж ступеней основного вида от корня; возвращает кортеж
+    (номер обращения, расположение, кортеж нот MIDI снизу вверх). Перебор
+    запоминается по всем аргументам, так что раунд не перебирает сочетания заново.
+    """
+    result = []
+    count = len(semitones)
+    for inversion in range(min(inversions, count)):
+        # Тесное расположение: бас - ступень обращения, остальные ступени над ним
+        close = [root + step for step in semitones[inversion:]]
+        close += [root + step + 12 for step in semitones[:inversion]]
+        for voicing in voicings:
+            if voicing == "close":
+                notes = close
+            else:
+                upper = [note + 12 if i % 2 else note for i, note in enumerate(close[1:], start=1)]
+                bass = close[0] - 12 if voicing == "spread" else close[0]
+                notes = [bass] + sorted(upper)
+            if notes[0] >= lowest and max(notes) <= highest:
+                result.append((inversion, voicing, tuple(notes)))
+    return tuple(result)
+
+# Раскладки звучания: вид, длительность (мс) и пауза между нотами (мс)
+NOTE_LAYOUT = ("note", 1000)
+INTERVAL_LAYOUT = ("sequence", 1000, 200)
+ARPEGGIO_LAYOUT = ("sequence", 500, 100)
+BLOCK_CHORD_LAYOUT = ("chord", 1500)
+HARMONIC_INTERVAL_LAYOUT = ("chord", 1500)
+
+# Способы звучания интервала: мелодический вверх, мелодический вниз, гармонический
+INTERVAL_MODES = ("up", "down", "harmonic")
+
+
+# Тембры: название, амплитуды гармоник и огибающая ADSR
+# (атака мс, спад мс, уровень поддержки, затухание мс)
+TIMBRE_PRESETS = {
+    "sine": {"title": "Синус", "harmonics": [1.0], "adsr": (5, 0, 1.0, 5)},
+    "organ": {"title": "Орган", "harmonics": [1.0, 0.6, 0.0, 0.4, 0.0, 0.25, 0.0, 0.15],
+              "adsr": (15, 0, 1.0, 40)},
+    "piano": {"title": "Фортепиано", "harmonics": [1.0, 0.5, 0.3, 0.2, 0.12, 0.08, 0.05, 0.03],
+              "adsr": (4, 350, 0.35, 120)}
+}
+
+# Размер таблицы одного периода волны (степень двойки, в отсчетах)
+WAVETABLE_BITS = 14
+WAVETABLE_SIZE = 1 << WAVETABLE_BITS
+
+# Бюджет синтеза: секунд работы процессора на секунду готового звука
+SYNTH_CPU_BUDGET = 0.005
+
+
+class Wavetable:
+    """Предрасчитанные таблицы периода волны с разным числом гармоник"""
+    
+    def __init__(self, harmonics, size=WAVETABLE_SIZE):
+        self.size = size
+        phase = np.arange(size) * (2 * np.pi / size)
+        self.tables = []
+        for count in range(1, len(harmonics) + 1):
+            table = np.zeros(size)
+            for number, amplitude in enumerate(harmonics[:count], start=1):
+                if amplitude:
+                    table += amplitude * np.sin(number * phase)
+            peak = np.abs(table).max()
+            self.tables.append((table / peak if peak else table).astype(np.float32))
+    
+    def table_for(self, frequency, sample_rate):
+        """Таблица только с гармониками ниже частоты Найквиста, чтобы не было наложения спектра"""
+        limit = int(sample_rate / 2 // frequency)
+        return self.tables[max(1, min(limit, len(self.tables))) - 1]
+    
+    def render(self, frequency, n, sample_rate):
+        """Сэмплы осциллятора для номеров сэмплов n (uint32) от начала звука
+        
+        Фаза - 32-битный целочисленный аккумулятор: переполнение uint32 дает
+        взятие по модулю периода бесплатно и без накопления ошибки.
+        """
+        table = self.table_for(frequency, sample_rate)
+        increment = np.uint32(round(frequency * 2 ** 32 / sample_rate) % 2 ** 32)
+        phase = n * increment
+        phase >>= np.uint32(32 - WAVETABLE_BITS)
+        return table[phase]
 
-class SolfeggioApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Сольфеджио-Про v1.0")
-        self.root.geometry("1000x750")
-        self.root.configure(bg='#2c3e50')
+
+@functools.lru_cache(maxsize=None)
+def get_wavetable(timbre):
+    """Таблицы волны тембра, рассчитываются один раз"""
+    return Wavetable(TIMBRE_PRESETS[timbre]["harmonics"])
+
+
+_sample_numbers = np.arange(0, dtype=np.uint32)
+
+
+def sample_numbers(start, stop):
+    """Номера сэмплов [start, stop) как uint32 без повторного создания массива"""
+    global _sample_numbers
+    if stop > len(_sample_numbers):
+        _sample_numbers = np.arange(max(stop, 2 * len(_sample_numbers)), dtype=np.uint32)
+    return _sample_numbers[start:stop]
+
+
+def adsr_breakpoints(length, adsr, sample_rate):
+    """Точки излома огибающей ADSR (в сэмплах) и уровни в них"""
+    attack_ms, decay_ms, sustain, release_ms = adsr
+    attack, decay, release = (ms * sample_rate / 1000 for ms in (attack_ms, decay_ms, release_ms))
+    # У короткого звука фазы пропорционально сжимаются
+    phases = attack + decay + release
+    if phases > length:
+        scale = length / phases
+        attack, decay, release = attack * scale, decay * scale, release * scale
+    times = [0.0, attack, attack + decay, length - release, float(length)]
+    levels = [0.0, 1.0, sustain, sustain, 0.0]
+    return times, levels
+
+
+def apply_adsr(samples, offset, length, adsr, sample_rate):
+    """Огибающая ADSR для куска голоса длиной length, начинающегося со смещения offset
+    
+    Считается только на участках атаки, спада и затухания; участок поддержки -
+    умножение на константу.
+    """
+    times, levels = adsr_breakpoints(length, adsr, sample_rate)
+    count = len(samples)
+    head = min(count, max(0, int(np.ceil(times[2])) - offset))
+    tail = max(head, min(count, int(times[3]) - offset))
+    if head:
+        samples[:head] *= np.interp(np.arange(offset, offset + head), times, levels).astype(np.float32)
+    if tail > head and levels[2] != 1.0:
+        samples[head:tail] *= np.float32(levels[2])
+    if tail < count:
+        samples[tail:] *= np.interp(np.arange(offset + tail, offset + count), times, levels).astype(np.float32)
+    return samples
+
+
+class SynthEngine:
+    """Векторный синтез нот, интервалов и аккордов в PCM-буферы"""
+    
+    def __init__(self, sample_rate=SAMPLE_RATE, volume=0.5, timbre="sine"):
+        self.sample_rate = sample_rate
+        self.volume = volume
+        self.timbre = timbre
+        # Общие голоса пакетного синтеза (см. render_batch)
+        self._voices = None
+    
+    def ms_to_samples(self, ms):
+        """Перевод миллисекунд в количество сэмплов"""
+        return int(round(ms * self.sample_rate / 1000))
+    
+    def render_voice(self, frequency, length):
+        """Один голос текущего тембра: осциллятор по таблице волны и огибающая ADSR"""
+        voices = self._voices
+        if voices is not None:
+            key = (frequency, length, self.timbre)
+            voice = voices.get(key)
+            if voice is None:
+                voice = voices[key] = self._render_voice(frequency, length)
+            return voice
+        return self._render_voice(frequency, length)
+    
+    def _render_voice(self, frequency, length):
+        voice = get_wavetable(self.timbre).render(frequency, sample_numbers(0, length), self.sample_rate)
+        return apply_adsr(voice, 0, length, TIMBRE_PRESETS[self.timbre]["adsr"], self.sample_rate)
+    
+    def render_batch(self, requests, voices=None):
+        """Пакетный синтез: список (частоты, раскладка) -> список буферов int16
+        
+        Интервалы и аккорды от соседних корней состоят из одних и тех же голосов,
+        поэтому каждый голос (частота, длина) синтезируется один раз на пакет.
+        Словарь voices можно передавать между пакетами, чтобы голоса переиспользовались.
+        """
+        self._voices = {} if voices is None else voices
+        try:
+            return [self.to_int16(self.render_layout(frequencies, layout))
+                    for frequencies, layout in requests]
+        finally:
+            self._voices = None
+    
+    def render_events(self, frequencies, onsets_ms, durations_ms):
+        """Синтез последовательности звуков (частота, начало, длительность) в один буфер"""
+        if len(frequencies) == 0:
+            return np.zeros(0, dtype=np.float32)
+        
+        onsets = [self.ms_to_samples(ms) for ms in onsets_ms]
+        lengths = [self.ms_to_samples(ms) for ms in durations_ms]
+        total = max(o + l for o, l in zip(onsets, lengths))
+        
+        # Раскладываем голоса по их позициям в общем буфере
+        mixed = np.zeros(total, dtype=np.float32)
+        for frequency, onset, length in zip(frequencies, onsets, lengths):
+            mixed[onset:onset + length] += self.render_voice(frequency, length)
+        mixed *= self.volume
+        return mixed
+    
+    def render_layout(self, frequencies, layout):
+        """Синтез по описанию раскладки (см. NOTE_LAYOUT и соседние константы)"""
+        kind = layout[0]
+        if kind == "note":
+            return self.render_note(frequencies[0], layout[1])
+        if kind == "sequence":
+            return self.render_sequence(frequencies, layout[1], gap_ms=layout[2])
+        if kind == "chord":
+            return self.render_chord(frequencies, layout[1])
+        if kind == "rhythm":
+            onsets, durations = compile_rhythm(layout[1])
+            return self.render_rhythm(onsets, durations, layout[2], frequencies[0])
+        raise ValueError(f"Неизвестная раскладка: {kind}")
+    
+    def stream_events(self, events, block_size=1024):
+        """Потоковый синтез: события (частота, начало_мс, длительность_мс) -> блоки float32
+        
+        События должны идти по возрастанию начала и читаются по мере надобности,
+        поэтому память не зависит от длины последовательности.
+        """
+        segments = self._stream_oscillators(events, block_size)
+        segments = self._stream_envelopes(segments)
+        return self._stream_mix(segments, block_size)
+    
+    def _stream_oscillators(self, events, block_size):
+        """Стадия синтеза: для каждого блока - куски звучащих в нем голосов"""
+        events = iter(events)
+        pending = next(events, None)
+        active = []
+        wavetable = get_wavetable(self.timbre)
+        block_start = 0
+        
+        while pending is not None or active:
+            block_end = block_start + block_size
+            while pending is not None:
+                frequency, onset_ms, duration_ms = pending
+                onset = self.ms_to_samples(onset_ms)
+                if onset >= block_end:
+                    break
+                active.append((frequency, onset, self.ms_to_samples(duration_ms)))
+                pending = next(events, None)
+            
+            # Кусок голоса: (позиция в блоке, смещение от начала голоса, длина голоса, сэмплы)
+            segments = []
+            for frequency, onset, length in active:
+                first = max(block_start, onset)
+                last = min(block_end, onset + length)
+                if first < last:
+                    n = sample_numbers(first - onset, last - onset)
+                    segments.append((first - block_start, first - onset, length,
+                                     wavetable.render(frequency, n, self.sample_rate)))
+            active = [voice for voice in active if voice[1] + voice[2] > block_end]
+            yield segments
+            block_start = block_end
+    
+    def _stream_envelopes(self, segment_blocks):
+        """Стадия огибающей: ADSR тембра для каждого куска голоса"""
+        adsr = TIMBRE_PRESETS[self.timbre]["adsr"]
+        for segments in segment_blocks:
+            for _, offset, length, samples in segments:
+                apply_adsr(samples, offset, length, adsr, self.sample_rate)
+            yield segments
+    
+    def _stream_mix(self, segment_blocks, block_size):
+        """Стадия сведения: сумма голосов в блок фиксированного размера"""
+        for segments in segment_blocks:
+            block = np.zeros(block_size, dtype=np.float32)
+            for position, _, _, samples in segments:
+                block[position:position + len(samples)] += samples
+            block *= self.volume
+            yield self.soft_limit(block)
+    
+    def stream_int16(self, blocks):
+        """Стадия вывода: перевод потока блоков в 16-битный PCM"""
+        for block in blocks:
+            yield self.to_int16(block)
+    
+    def render_note(self, frequency, duration_ms=1000):
+        """Одна нота"""
+        return self.render_events([frequency], [0], [duration_ms])
+    
+    def render_sequence(self, frequencies, duration_ms, gap_ms=0):
+        """Ноты по очереди с паузой между ними"""
+        step = duration_ms + gap_ms
+        onsets = [i * step for i in range(len(frequencies))]
+        return self.render_events(frequencies, onsets, [duration_ms] * len(frequencies))
+    
+    def render_rhythm(self, onsets_beats, durations_beats, tempo, frequency, articulation=0.85):
+        """Ритмический рисунок одной высоты в один буфер с точностью до сэмпла"""
+        beat_ms = 60000 / tempo
+        onsets_ms = [onset * beat_ms for onset in onsets_beats]
+        # Звук короче длительности, чтобы соседние одинаковые ноты не сливались
+        durations_ms = [duration * beat_ms * articulation for duration in durations_beats]
+        return self.render_events([frequency] * len(onsets_ms), onsets_ms, durations_ms)
+    
+    def render_chord(self, frequencies, duration_ms=1500):
+        """Гармоническое (одновременное) звучание всех голосов аккорда"""
+        count = len(frequencies)
+        if count == 0:
+            return np.zeros(0, dtype=np.float32)
+        mixed = self.render_events(frequencies, [0] * count, [duration_ms] * count)
+        # Нормируем громкость по числу голосов и мягко ограничиваем пики
+        mixed *= np.float32(1.0 / np.sqrt(count))
+        return self.soft_limit(mixed)
+    
+    @staticmethod
+    def soft_limit(buffer, threshold=0.8):
+        """Мягкий лимитер: выше порога амплитуда плавно сжимается к 1.0"""
+        magnitude = np.abs(buffer)
+        over = magnitude > threshold
+        if over.any():
+            knee = 1.0 - threshold
+            compressed = threshold + knee * np.tanh((magnitude[over] - threshold) / knee)
+            buffer[over] = np.sign(buffer[over]) * compressed
+        return buffer
+    
+    @staticmethod
+    def to_int16(buffer):
+        """Перевод float32-буфера в 16-битный PCM"""
+        return (np.clip(buffer, -1.0, 1.0) * 32767).astype(np.int16)
+    
+    def to_wav_bytes(self, buffer):
+        """Упаковка буфера в WAV (моно, 16 бит) в памяти"""
+        pcm = buffer if buffer.dtype == np.int16 else self.to_int16(buffer)
+        stream = io.BytesIO()
+        write_wav(stream, pcm, self.sample_rate)
+        return stream.getvalue()
+
+
+def write_wav(target, pcm, sample_rate):
+    """Запись int16-буфера в WAV (моно, 16 бит); target - путь или файловый объект"""
+    with wave.open(target, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+
+
+# Длительности ритмических знаков в долях (четверть = 1 доля)
+RHYTHM_GLYPHS = {
+    "𝅝": 4.0,    # Целая нота
+    "𝅗𝅥": 2.0,    # Половинная
+    "♩": 1.0,    # Четвертная
+    "♪": 0.5,    # Восьмая
+    "♬": 0.25,   # Шестнадцатая
+}
+
+
+@functools.lru_cache(maxsize=None)
+def compile_rhythm(pattern):
+    """Разбор ритмического рисунка в массивы начал и длительностей (в долях)"""
+    # Длинные знаки проверяем первыми: половинная записывается двумя символами
+    glyphs = sorted(RHYTHM_GLYPHS, key=len, reverse=True)
+    durations = []
+    position = 0
+    while position < len(pattern):
+        for glyph in glyphs:
+            if pattern.startswith(glyph, position):
+                durations.append(RHYTHM_GLYPHS[glyph])
+                position += len(glyph)
+                break
+        else:
+            # Точка увеличивает предыдущую ноту наполовину, пробелы только разделяют группы
+            if pattern[position] == "." and durations:
+                durations[-1] *= 1.5
+            position += 1
+    
+    durations = np.array(durations, dtype=np.float64)
+    onsets = np.concatenate(([0.0], np.cumsum(durations)[:-1])) if len(durations) else durations.copy()
+    onsets.flags.writeable = False
+    durations.flags.writeable = False
+    return onsets, durations
+
+
+class WaveformCache:
+    """LRU-кэш готовых PCM-буферов с ограничением по объему памяти"""
+    
+    def __init__(self, max_bytes=32 * 1024 * 1024, limit=128 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        # Предел, до которого объем можно поднять под банк упражнения (см. reserve)
+        self.limit = limit
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Буфер по ключу или None; найденный элемент становится самым свежим"""
+        with self._lock:
+            buffer = self._items.get(key)
+            if buffer is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return buffer
+    
+    def put(self, key, buffer):
+        """Добавление буфера с вытеснением самых старых элементов"""
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old.nbytes
+            if buffer.nbytes > self.max_bytes:
+                return
+            self._items[key] = buffer
+            self.current_bytes += buffer.nbytes
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+                self.evictions += 1
+    
+    def get_or_render(self, key, render_func):
+        """Буфер из кэша, а при промахе - синтез и сохранение"""
+        buffer = self.get(key)
+        if buffer is None:
+            buffer = render_func()
+            self.put(key, buffer)
+        return buffer
+    
+    def reserve(self, nbytes):
+        """Увеличение объема до nbytes, но не выше предела; возвращает итоговый объем"""
+        with self._lock:
+            self.max_bytes = max(self.max_bytes, min(nbytes, self.limit))
+            return self.max_bytes
+    
+    def contains(self, key):
+        """Проверка наличия без изменения счетчиков и порядка"""
+        with self._lock:
+            return key in self._items
+    
+    def stats(self):
+        """Статистика работы кэша"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "items": len(self._items),
+                "bytes": self.current_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+class AudioBackend:
+    """Базовый интерфейс вывода звука"""
+    
+    name = "base"
+    # Размер порции при записи в устройство (в сэмплах), между порциями проверяется отмена
+    chunk_size = 2048
+    
+    @classmethod
+    def is_available(cls):
+        """Можно ли использовать этот вывод в текущей системе"""
+        return True
+    
+    def play(self, pcm, sample_rate, cancel_event):
+        """Блокирующее воспроизведение int16-буфера; прерывается cancel_event"""
+        raise NotImplementedError
+    
+    def play_stream(self, blocks, sample_rate, cancel_event):
+        """Воспроизведение потока int16-блоков; без потокового вывода блоки собираются целиком"""
+        collected = []
+        for block in blocks:
+            if cancel_event.is_set():
+                return
+            collected.append(block)
+        if collected:
+            self.play(np.concatenate(collected), sample_rate, cancel_event)
+    
+    def split_chunks(self, pcm):
+        """Нарезка буфера на порции для потокового вывода"""
+        for start in range(0, len(pcm), self.chunk_size):
+            yield pcm[start:start + self.chunk_size]
+
+
+class SounddeviceBackend(AudioBackend):
+    """Вывод через библиотеку sounddevice (PortAudio), если она установлена"""
+    
+    name = "sounddevice"
+    
+    @classmethod
+    def is_available(cls):
+        return importlib.util.find_spec("sounddevice") is not None
+    
+    def __init__(self):
+        self._sounddevice = importlib.import_module("sounddevice")
+    
+    def play(self, pcm, sample_rate, cancel_event):
+        self.play_stream(self.split_chunks(pcm), sample_rate, cancel_event)
+    
+    def play_stream(self, blocks, sample_rate, cancel_event):
+        with self._sounddevice.OutputStream(samplerate=sample_rate, channels=1,
+                                            dtype='int16') as stream:
+            for block in blocks:
+                if cancel_event.is_set():
+                    stream.abort()
+                    break
+                stream.write(block)
+
+
+class WinsoundBackend(AudioBackend):
+    """Вывод через winsound (только Windows)"""
+    
+    name = "winsound"
+    
+    @classmethod
+    def is_available(cls):
+        return importlib.util.find_spec("winsound") is not None
+    
+    def __init__(self):
+        self._winsound = importlib.import_module("winsound")
+    
+    def play(self, pcm, sample_rate, cancel_event):
+        # SND_MEMORY нельзя прервать, поэтому играем временный файл асинхронно
+        winsound = self._winsound
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        with os.fdopen(fd, 'wb') as f:
+            write_wav(f, pcm, sample_rate)
+        try:
+            winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC | winsound.SND_NODEFAULT)
+            if cancel_event.wait(len(pcm) / sample_rate):
+                winsound.PlaySound(None, 0)
+        finally:
+            os.remove(path)
+
+
+class AplayBackend(AudioBackend):
+    """Вывод через утилиту aplay (ALSA) на Linux"""
+    
+    name = "aplay"
+    
+    @classmethod
+    def is_available(cls):
+        return shutil.which("aplay") is not None
+    
+    def play(self, pcm, sample_rate, cancel_event):
+        self.play_stream(self.split_chunks(pcm), sample_rate, cancel_event)
+    
+    def play_stream(self, blocks, sample_rate, cancel_event):
+        process = subprocess.Popen(
+            ["aplay", "-q", "-t", "raw", "-f", "S16_LE", "-c", "1", "-r", str(sample_rate)],
+            stdin=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        try:
+            for block in blocks:
+                if cancel_event.is_set():
+                    break
+                process.stdin.write(block.tobytes())
+            process.stdin.close()
+            while process.poll() is None:
+                if cancel_event.wait(0.01):
+                    process.terminate()
+        except (BrokenPipeError, OSError):
+            pass
+        finally:
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+
+
+class WavFileBackend(AudioBackend):
+    """Запись каждого звука в отдельный WAV-файл вместо воспроизведения"""
+    
+    name = "wav"
+    
+    def __init__(self, directory="audio_out"):
+        self.directory = directory
+        self._numbers = itertools.count(1)
+        os.makedirs(directory, exist_ok=True)
+    
+    def play(self, pcm, sample_rate, cancel_event):
+        path = os.path.join(self.directory, f"sound_{next(self._numbers):05d}.wav")
+        write_wav(path, pcm, sample_rate)
+    
+    def play_stream(self, blocks, sample_rate, cancel_event):
+        path = os.path.join(self.directory, f"sound_{next(self._numbers):05d}.wav")
+        with wave.open(path, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            for block in blocks:
+                if cancel_event.is_set():
+                    break
+                wav.writeframes(block.tobytes())
+
+
+class NullBackend(AudioBackend):
+    """Пустой вывод: звук отбрасывается, считается только объем"""
+    
+    name = "null"
+    
+    def __init__(self):
+        self.buffers_played = 0
+        self.samples_played = 0
+    
+    def play(self, pcm, sample_rate, cancel_event):
+        self.buffers_played += 1
+        self.samples_played += len(pcm)
+    
+    def play_stream(self, blocks, sample_rate, cancel_event):
+        self.buffers_played += 1
+        for block in blocks:
+            if cancel_event.is_set():
+                break
+            self.samples_played += len(block)
+
+
+# Выводы в порядке предпочтения при автоматическом выборе
+AUDIO_BACKENDS = [SounddeviceBackend, WinsoundBackend, AplayBackend, NullBackend]
+
+
+def audio_backend_names():
+    """Допустимые имена вывода звука (значения SOLFEGGIO_AUDIO)"""
+    return [backend_class.name for backend_class in AUDIO_BACKENDS] + [WavFileBackend.name]
+
+
+def check_audio_backend_name(name):
+    """Проверка имени вывода: опечатка не должна молча оставлять программу без звука"""
+    if name and name not in audio_backend_names():
+        raise ValueError(f"Неизвестный вывод звука {name!r}; допустимые значения: "
+                         f"{', '.join(audio_backend_names())}")
+
+
+def create_audio_backend(preferred=None):
+    """Создание вывода звука: явно заданного (или из SOLFEGGIO_AUDIO) либо первого доступного"""
+    if preferred is None:
+        preferred = os.environ.get("SOLFEGGIO_AUDIO")
+    check_audio_backend_name(preferred)
+    if preferred == WavFileBackend.name:
+        return WavFileBackend(os.environ.get("SOLFEGGIO_WAV_DIR", "audio_out"))
+    
+    for backend_class in AUDIO_BACKENDS:
+        if preferred and backend_class.name != preferred:
+            continue
+        if backend_class.is_available():
+            try:
+                return backend_class()
+            except Exception:
+                traceback.print_exc()
+    return NullBackend()
+
+
+class AudioWorker:
+    """Единственный фоновый поток воспроизведения с очередью заданий по приоритету
+    
+    Внутри приоритета задания идут по моменту начала: отложенное задание (start_at)
+    не задерживает те, что должны прозвучать раньше него, даже поставленные позже.
+    """
+    
+    PRIORITY_FEEDBACK = 0
+    PRIORITY_NORMAL = 1
+    # За сколько секунд до start_at перестаем спать и ждем начала активно
+    SPIN_WINDOW = 0.002
+    
+    def __init__(self, output):
+        # output(buffer, cancel_event) - блокирующий вывод звука, прерываемый событием
+        self.output = output
+        self.jobs_started = 0
+        self.jobs_done = 0
+        self.jobs_canceled = 0
+        self.total_latency_ns = 0
+        self.max_latency_ns = 0
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._generation = 0
+        self._current_cancel = None
+        self._lock = threading.Lock()
+        # Будит поток, ждущий начала отложенного задания, при новом задании или отмене
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="audio-worker", daemon=True)
+        self._thread.start()
+    
+    def submit(self, buffer, priority=PRIORITY_NORMAL, start_at=None, on_done=None, on_start=None):
+        """Постановка буфера в очередь; start_at - момент начала по time.perf_counter
+        
+        on_start(started_ns) вызывается в потоке воспроизведения, когда вывод (уже открытый)
+        забирает первую порцию буфера; on_done(finished_ns) - если буфер доиграл до конца
+        без отмены. Оба момента - по time.perf_counter_ns.
+        """
+        with self._lock:
+            generation = self._generation
+        submitted_ns = time.perf_counter_ns()
+        begin = submitted_ns / 1e9 if start_at is None else start_at
+        self._queue.put((priority, begin, next(self._sequence), submitted_ns,
+                         generation, buffer, start_at, on_done, on_start))
+        self._wakeup.set()
+    
+    def cancel(self):
+        """Отмена звучащего звука и всех ожидающих заданий"""
+        with self._lock:
+            self._generation += 1
+            if self._current_cancel is not None:
+                self._current_cancel.set()
+        self._wakeup.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self.jobs_canceled += 1
+    
+    def _run(self):
+        """Цикл потока: берем задание с наивысшим приоритетом и проигрываем его"""
+        job = None
+        while True:
+            if job is None:
+                job = self._queue.get()
+            _, _, _, submitted_ns, generation, buffer, start_at, on_done, on_start = job
+            cancel_event = threading.Event()
+            with self._lock:
+                if generation != self._generation:
+                    self.jobs_canceled += 1
+                    job = None
+                    continue
+                self._current_cancel = cancel_event
+            
+            if start_at is not None:
+                earlier = self._wait_for_start(job, cancel_event)
+                if earlier is not None or cancel_event.is_set():
+                    with self._lock:
+                        self._current_cancel = None
+                    if earlier is None:
+                        self.jobs_canceled += 1
+                    job = earlier
+                    continue
+                submitted_ns = max(submitted_ns, int(start_at * 1e9))
+            job = None
+            
+            latency = time.perf_counter_ns() - submitted_ns
+            self.jobs_started += 1
+            self.total_latency_ns += latency
+            self.max_latency_ns = max(self.max_latency_ns, latency)
+            if on_start is not None:
+                buffer = self._announce_start(buffer, on_start)
+            try:
+                self.output(buffer, cancel_event)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                with self._lock:
+                    self._current_cancel = None
+            
+            if cancel_event.is_set():
+                self.jobs_canceled += 1
+            else:
+                self.jobs_done += 1
+                if on_done is not None:
+                    on_done(time.perf_counter_ns())
+    
+    def _wait_for_start(self, job, cancel_event):
+        """Ожидание момента начала задания
+        
+        Если за это время пришло задание, которое должно начаться раньше, ожидаемое
+        возвращается в очередь, а пришедшее - результат; иначе результат None.
+        """
+        start_at = job[6]
+        while True:
+            delay = start_at - time.perf_counter() - self.SPIN_WINDOW
+            if delay <= 0:
+                break
+            if not self._wakeup.wait(delay):
+                continue
+            self._wakeup.clear()
+            if cancel_event.is_set():
+                return None
+            try:
+                other = self._queue.get_nowait()
+            except queue.Empty:
+                continue
+            if other[:3] < job[:3]:
+                self._queue.put(job)
+                return other
+            self._queue.put(other)
+        # Сон неточен на миллисекунды, последние из них ждем активно
+        while time.perf_counter() < start_at:
+            time.sleep(0)
+        return None
+    
+    @staticmethod
+    def _announce_start(buffer, on_start):
+        """Буфер как поток порций; on_start вызывается, когда вывод забирает первую"""
+        blocks = buffer
+        if isinstance(buffer, np.ndarray):
+            size = AudioBackend.chunk_size
+            blocks = (buffer[start:start + size] for start in range(0, len(buffer), size))
+        for number, block in enumerate(blocks):
+            if number == 0:
+                on_start(time.perf_counter_ns())
+            yield block
+    
+    def stats(self):
+        """Глубина очереди и задержка от постановки задания до начала звучания"""
+        started = self.jobs_started
+        return {
+            "queue_depth": self._queue.qsize(),
+            "jobs_done": self.jobs_done,
+            "jobs_canceled": self.jobs_canceled,
+            "avg_latency_ms": self.total_latency_ns / started / 1e6 if started else 0.0,
+            "max_latency_ms": self.max_latency_ns / 1e6
+        }
+
+
+class Metronome:
+    """Метроном с расписанием долей по монотонным часам: ошибка не накапливается
+    
+    Сам метроном звук не выводит: незадолго до доли он ставит щелчок в общий поток
+    воспроизведения с точным моментом начала.
+    
+    Дрожание - отклонение от доли момента, когда вывод забрал первую порцию щелчка.
+    В него входят ожидание в потоке воспроизведения и открытие потока sounddevice;
+    буфер устройства, а для aplay и открытие устройства внутри процесса aplay идут
+    позже и в дрожание не входят, так что слышимый щелчок запаздывает еще на
+    задержку вывода. Это точность расписания программы, а не задержка звука.
+    """
+    
+    # За сколько секунд до доли щелчок ставится в очередь вывода
+    LOOKAHEAD = 0.05
+    
+    def __init__(self, play_click, tempo=120, beats_per_bar=4):
+        # play_click(accent, deadline, on_start) - постановка щелчка доли в вывод:
+        # accent=True для первой доли такта, deadline - момент начала по time.perf_counter,
+        # on_start(started_ns) нужно вызвать, когда щелчок начнет звучать
+        self.play_click = play_click
+        self.tempo = tempo
+        self.beats_per_bar = beats_per_bar
+        self._lock = threading.Lock()
+        # Запуск и остановка из потока интерфейса не должны пересекаться
+        self._start_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._anchor = 0.0
+        self._anchor_beat = 0
+        self._beat_index = 0
+        self._period = 60.0 / tempo
+        # Промежуток, доли которого не ставятся в вывод (их щелчки вмешаны в другой буфер)
+        self._muted = (0.0, 0.0)
+        self._reset_jitter()
+    
+    def _reset_jitter(self):
+        """Сброс статистики дрожания (алгоритм Уэлфорда)"""
+        self.jitter_count = 0
+        self._jitter_mean = 0.0
+        self._jitter_m2 = 0.0
+        self.jitter_max = 0.0
+    
+    def is_running(self):
+        """Работает ли метроном"""
+        return (self._thread is not None and self._thread.is_alive()
+                and not self._stop_event.is_set())
+    
+    def start(self):
+        """Запуск метронома с первой доли такта
+        
+        Поток, остановленный только что, может еще не завершиться; его не ждем, чтобы
+        не задерживать интерфейс. Новый поток получает собственное событие остановки,
+        а старый, увидев свое событие, больше не ставит щелчков и не трогает расписание.
+        """
+        with self._start_lock:
+            if self.is_running():
+                return
+            with self._lock:
+                self._period = 60.0 / self.tempo
+                self._anchor = time.perf_counter() + self.LOOKAHEAD
+                self._anchor_beat = 0
+                self._beat_index = 0
+                self._muted = (0.0, 0.0)
+                self._reset_jitter()
+            self._stop_event = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(self._stop_event,),
+                                            name="metronome", daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        """Остановка метронома"""
+        with self._start_lock:
+            self._stop_event.set()
+    
+    def set_tempo(self, tempo):
+        """Смена темпа на лету: новая сетка начинается со следующей доли"""
+        with self._lock:
+            self.tempo = tempo
+            next_beat_time = self._anchor + (self._beat_index - self._anchor_beat) * self._period
+            self._anchor = next_beat_time
+            self._anchor_beat = self._beat_index
+            self._period = 60.0 / tempo
+    
+    def beat_time(self, beat_index):
+        """Момент (по time.perf_counter) доли с заданным номером"""
+        with self._lock:
+            return self._anchor + (beat_index - self._anchor_beat) * self._period
+    
+    def nearest_downbeat(self, moment):
+        """Момент сильной доли, ближайшей к заданному моменту (по time.perf_counter)"""
+        with self._lock:
+            beat = self._anchor_beat + round((moment - self._anchor) / self._period)
+        return self.beat_time(round(beat / self.beats_per_bar) * self.beats_per_bar)
+    
+    def downbeat_after(self, bars=1):
+        """Момент сильной доли, перед которой прозвучит не меньше bars полных тактов"""
+        with self._lock:
+            upcoming = self._beat_index
+        first_downbeat = -(-upcoming // self.beats_per_bar) * self.beats_per_bar
+        return self.beat_time(first_downbeat + bars * self.beats_per_bar)
+    
+    def beats_between(self, start, end):
+        """Доли в промежутке [start, end): список (момент, сильная ли доля)"""
+        with self._lock:
+            first = self._anchor_beat + math.ceil((start - self._anchor) / self._period - 1e-9)
+        beats = []
+        beat = first
+        while True:
+            moment = self.beat_time(beat)
+            if moment >= end:
+                return beats
+            beats.append((moment, beat % self.beats_per_bar == 0))
+            beat += 1
+    
+    def mute(self, start, end):
+        """Доли в промежутке [start, end) не ставятся в вывод: их щелчки звучат в другом буфере"""
+        with self._lock:
+            self._muted = (start, end)
+    
+    def _run(self, stop_event):
+        """Цикл потока: ждем дедлайн доли, ставим щелчок в вывод, планируем следующую"""
+        while not stop_event.is_set():
+            with self._lock:
+                beat = self._beat_index
+                deadline = self._anchor + (beat - self._anchor_beat) * self._period
+                muted_from, muted_to = self._muted
+            
+            remaining = deadline - self.LOOKAHEAD - time.perf_counter()
+            if remaining > 0:
+                if stop_event.wait(remaining):
+                    break
+                # Темп мог измениться, пока поток спал: пересчитываем дедлайн
+                continue
+            
+            if stop_event.is_set():
+                break
+            if not muted_from <= deadline < muted_to:
+                self.play_click(beat % self.beats_per_bar == 0, deadline,
+                                functools.partial(self._on_click_start, deadline, stop_event))
+            
+            with self._lock:
+                # Остановленный поток не сдвигает расписание уже запущенного нового
+                if stop_event.is_set():
+                    break
+                self._beat_index += 1
+                # Если отстали больше чем на долю (например, система засыпала), пропускаем доли
+                behind = int((time.perf_counter() - self._anchor) / self._period) - (self._beat_index - self._anchor_beat)
+                if behind > 0:
+                    self._beat_index += behind
+    
+    def _on_click_start(self, deadline, stop_event, started_ns):
+        """Щелчок начал звучать (вызывается из потока воспроизведения)"""
+        if not stop_event.is_set():
+            self._record_jitter(started_ns / 1e9 - deadline)
+    
+    def _record_jitter(self, error):
+        """Учет отклонения момента доли от расписания (в секундах)"""
+        with self._lock:
+            self.jitter_count += 1
+            delta = error - self._jitter_mean
+            self._jitter_mean += delta / self.jitter_count
+            self._jitter_m2 += delta * (error - self._jitter_mean)
+            self.jitter_max = max(self.jitter_max, abs(error))
+    
+    def jitter_stats(self):
+        """Статистика дрожания в миллисекундах (что измеряется - см. описание класса)"""
+        count = self.jitter_count
+        std = (self._jitter_m2 / (count - 1)) ** 0.5 if count > 1 else 0.0
+        return {
+            "beats": count,
+            "mean_ms": self._jitter_mean * 1000,
+            "std_ms": std * 1000,
+            "max_ms": self.jitter_max * 1000
+        }
+
+
+class TapRecorder:
+    """Удары пользователя (клавиша или мышь) с метками времени самих событий
+    
+    Tk сообщает event.time - миллисекунды от произвольного начала (32 бита, с переполнением).
+    Смещение до time.perf_counter оценивается как наименьшая разность между моментом
+    обработки и меткой события: очередь событий только добавляет задержку, поэтому
+    минимум ближе всего к истинному смещению, а задержка обработчика не искажает удары.
+    """
+    
+    WRAP = 1 << 32
+    # Удары ближе этого интервала (с) считаются дребезгом или автоповтором клавиши
+    MIN_GAP = 0.04
+    
+    def __init__(self):
+        self.offset = None
+        self._raw = []
+        self._epoch = 0
+        self._last_ms = None
+    
+    def tap(self, event_time_ms=None, received=None):
+        """Учет удара; без метки события (None) берется момент вызова
+        
+        Возвращает False, если удар отброшен как повтор.
+        """
+        if received is None:
+            received = time.perf_counter()
+        if event_time_ms is None:
+            raw = received
+        else:
+            event_time_ms %= self.WRAP
+            if self._last_ms is not None and event_time_ms < self._last_ms - self.WRAP // 2:
+                self._epoch += self.WRAP
+            self._last_ms = event_time_ms
+            raw = (self._epoch + event_time_ms) / 1000
+        lag = received - raw
+        self.offset = lag if self.offset is None else min(self.offset, lag)
+        if self._raw and raw - self._raw[-1] < self.MIN_GAP:
+            return False
+        self._raw.append(raw)
+        return True
+    
+    def __len__(self):
+        return len(self._raw)
+    
+    def times(self):
+        """Моменты ударов по time.perf_counter"""
+        return np.asarray(self._raw, dtype=np.float64) + (self.offset or 0.0)
+
+
+def score_rhythm_taps(onsets, taps, tolerance=None):
+    """Сопоставление ударов с сеткой начал нот по ближайшему началу
+    
+    onsets и taps - моменты в секундах на одной шкале. Каждому началу достается
+    не больше одного удара (ближайший), остальные удары лишние. tolerance - наибольшая
+    засчитываемая ошибка; по умолчанию половина кратчайшего расстояния между нотами,
+    но не больше 0.2 с.
+    Возвращает словарь: errors_ms (ошибка по каждой ноте, None - пропуск; минус - раньше),
+    hits, missed, extra, mean_ms, std_ms и score от 0 до 100.
+    """
+    onsets = np.asarray(onsets, dtype=np.float64)
+    taps = np.sort(np.asarray(taps, dtype=np.float64))
+    count = len(onsets)
+    if tolerance is None:
+        gaps = np.diff(onsets)
+        tolerance = min(0.5 * gaps.min(), 0.2) if len(gaps) else 0.2
+    errors = np.full(count, np.nan)
+    extra = len(taps)
+    if count and len(taps):
+        right = np.clip(np.searchsorted(onsets, taps), 0, count - 1)
+        left = np.maximum(right - 1, 0)
+        nearest = np.where(np.abs(taps - onsets[left]) <= np.abs(taps - onsets[right]), left, right)
+        error = taps - onsets[nearest]
+        within = np.flatnonzero(np.abs(error) <= tolerance)
+        # На каждое начало - удар с наименьшей ошибкой
+        order = within[np.lexsort((np.abs(error[within]), nearest[within]))]
+        _, first = np.unique(nearest[order], return_index=True)
+        kept = order[first]
+        errors[nearest[kept]] = error[kept]
+        extra -= len(kept)
+    
+    hit = ~np.isnan(errors)
+    hits = int(np.count_nonzero(hit))
+    accuracy = np.sum(1.0 - np.abs(errors[hit]) / tolerance) if hits else 0.0
+    return {
+        "errors_ms": [None if np.isnan(value) else float(value * 1000) for value in errors],
+        "hits": hits,
+        "missed": count - hits,
+        "extra": extra,
+        "mean_ms": float(errors[hit].mean() * 1000) if hits else 0.0,
+        "std_ms": float(errors[hit].std() * 1000) if hits else 0.0,
+        "tolerance_ms": float(tolerance * 1000),
+        "score": float(100.0 * accuracy / (count + extra)) if count + extra else 0.0
+    }
+
+
+def _safe_file_name(name):
+    """Имя файла без символов, недопустимых в путях"""
+    return name.replace("/", "-").replace("\\", "-")
+
+
+def build_export_items(pitch_table=DEFAULT_PITCH_TABLE):
+    """Весь банк упражнений для выгрузки: (относительный путь, частоты, раскладка)"""
+    items = []
+    for note, midi in WHITE_KEYS.items():
+        items.append((f"notes/{note}.wav", [pitch_table.frequency(midi)], NOTE_LAYOUT))
+    
+    for base_note, root in WHITE_KEYS.items():
+        for interval_name, info in INTERVALS.items():
+            path = f"intervals/{base_note}/{_safe_file_name(interval_name)}.wav"
+            items.append((path, pitch_table.chord(root, [0, info["semitones"]]), INTERVAL_LAYOUT))
+    
+    for difficulty, chord_names in DIFFICULTY_LEVELS.items():
+        for base_note, root in WHITE_KEYS.items():
+            for chord_name in chord_names:
+                frequencies = pitch_table.chord(root, CHORDS[chord_name]["semitones"])
+                for mode, layout in (("арпеджио", ARPEGGIO_LAYOUT), ("гармонически", BLOCK_CHORD_LAYOUT)):
+                    path = f"chords/{difficulty}/{base_note}/{chord_name} ({mode}).wav"
+                    items.append((path, frequencies, layout))
+    return items
+
+
+def synth_parameters(synth):
+    """Параметры синтезатора, от которых зависит звучание"""
+    return {"sample_rate": synth.sample_rate, "volume": synth.volume, "timbre": synth.timbre}
+
+
+def export_item_hash(frequencies, layout, parameters):
+    """Отпечаток параметров синтеза элемента: по нему определяем, что надо перерисовать"""
+    preset = TIMBRE_PRESETS[parameters["timbre"]]
+    description = json.dumps([[round(f, 6) for f in frequencies], list(layout), parameters, preset],
+                             sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(description.encode('utf-8')).hexdigest()
+
+
+def _export_item(job):
+    """Синтез и запись одного элемента (выполняется в процессе пула)"""
+    out_dir, path, frequencies, layout, parameters = job
+    synth = SynthEngine(**parameters)
+    full_path = os.path.join(out_dir, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    write_wav(full_path, synth.to_int16(synth.render_layout(frequencies, tuple(layout))),
+              synth.sample_rate)
+    return path
+
+
+def export_exercise_bank(out_dir, workers=None, synth=None):
+    """Выгрузка банка упражнений в WAV пулом процессов; перерисовываются только измененные элементы"""
+    synth = synth or SynthEngine()
+    parameters = synth_parameters(synth)
+    manifest_path = os.path.join(out_dir, "manifest.json")
+    os.makedirs(out_dir, exist_ok=True)
+    
+    old_items = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            old_items = json.load(f).get("items", {})
+    
+    manifest_items = {}
+    jobs = []
+    for path, frequencies, layout in build_export_items():
+        item_hash = export_item_hash(frequencies, layout, parameters)
+        manifest_items[path] = {"hash": item_hash, "frequencies": frequencies, "layout": list(layout)}
+        old = old_items.get(path)
+        if old is None or old["hash"] != item_hash or not os.path.exists(os.path.join(out_dir, path)):
+            jobs.append((out_dir, path, frequencies, layout, parameters))
+    
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    if jobs:
+        if workers == 1:
+            for job in jobs:
+                _export_item(job)
+        else:
+            chunksize = max(1, len(jobs) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for _ in pool.map(_export_item, jobs, chunksize=chunksize):
+                    pass
+    elapsed = time.perf_counter() - started
+    
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({"parameters": parameters, "items": manifest_items}, f,
+                  ensure_ascii=False, indent=1)
+    
+    return {
+        "total": len(manifest_items),
+        "rendered": len(jobs),
+        "skipped": len(manifest_items) - len(jobs),
+        "workers": workers,
+        "seconds": elapsed,
+        "items_per_second": len(jobs) / elapsed if jobs and elapsed > 0 else 0.0
+    }
+
+
+def export_scaling_report(max_workers=None):
+    """Замер скорости полной выгрузки при разном числе процессов"""
+    max_workers = max_workers or os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    
+    rows = []
+    for workers in counts:
+        with tempfile.TemporaryDirectory() as out_dir:
+            rows.append(export_exercise_bank(out_dir, workers=workers))
+    base = rows[0]["items_per_second"]
+    for row in rows:
+        row["speedup"] = row["items_per_second"] / base if base else 0.0
+    return rows
+
+
+def benchmark_synthesis(budget=SYNTH_CPU_BUDGET, repeats=50):
+    """Замер стоимости синтеза каждого тембра в секундах процессора на секунду звука"""
+    chord = DEFAULT_PITCH_TABLE.chord(WHITE_KEYS["До"], CHORDS["Большой мажорный септаккорд"]["semitones"])
+    results = {}
+    for timbre in TIMBRE_PRESETS:
+        synth = SynthEngine(timbre=timbre)
+        rendered = 0.0
+        started = time.thread_time()
+        for _ in range(repeats):
+            for layout in (NOTE_LAYOUT, INTERVAL_LAYOUT, ARPEGGIO_LAYOUT, BLOCK_CHORD_LAYOUT):
+                buffer = synth.render_layout(chord if layout[0] != "note" else chord[:1], layout)
+                rendered += len(buffer) / synth.sample_rate
+        cost = (time.thread_time() - started) / rendered
+        results[timbre] = {"cost": cost, "within_budget": cost <= budget}
+    return results
+
+
+# Анализ высоты тона: шаг кадров и бюджет процессора на один кадр (с)
+PITCH_HOP_MS = 20
+PITCH_CPU_BUDGET = 0.010
+
+# Кадр результата: время начала (с), частота (Гц, 0 - нет тона), ближайшая клавиша,
+# отклонение от нее в центах и уверенность 0..1
+PITCH_FRAME_DTYPE = np.dtype([("time", np.float64), ("frequency", np.float32), ("midi", np.int16),
+                              ("cents", np.float32), ("confidence", np.float32)])
+
+
+def read_wav(source):
+    """Чтение WAV (8/16/32 бит, любое число каналов) в моно float32 от -1 до 1
+    
+    Возвращает (сэмплы, частота дискретизации); source - путь или файловый объект.
+    """
+    with wave.open(source, 'rb') as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        sample_rate = wav.getframerate()
+        raw = wav.readframes(wav.getnframes())
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype='<i4').astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"Неподдерживаемая разрядность WAV: {width * 8} бит")
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, sample_rate
+
+
+class PitchDetector:
+    """Определение высоты тона алгоритмом YIN (de Cheveigné, Kawahara, 2002)
+    
+    Разностная функция считается через автокорреляцию в частотной области сразу
+    для пачки кадров, поэтому длинная запись анализируется одним проходом rfft,
+    а живой поток - по кадру на каждый шаг PITCH_HOP_MS.
+    """
+    
+    def __init__(self, sample_rate=SAMPLE_RATE, fmin=60.0, fmax=1100.0, window_ms=40,
+                 hop_ms=PITCH_HOP_MS, threshold=0.15, silence_db=-45.0, pitch_table=DEFAULT_PITCH_TABLE):
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.silence_rms = 10 ** (silence_db / 20)
+        self.pitch_table = pitch_table
+        self.hop = max(1, round(sample_rate * hop_ms / 1000))
+        # Окно интегрирования W и наибольший сдвиг: кадр длиной W + tau_max
+        self.window = round(sample_rate * window_ms / 1000)
+        self.tau_min = max(2, int(sample_rate / fmax))
+        self.tau_max = min(self.window, int(math.ceil(sample_rate / fmin)) + 1)
+        self.frame_length = self.window + self.tau_max
+        self.fft_size = 1 << (self.frame_length + self.window - 1).bit_length()
+        self._log_frequencies = np.log2(pitch_table.frequencies)
+    
+    def frames(self, samples):
+        """Кадры записи как окна без копирования: (число кадров, frame_length)"""
+        samples = np.asarray(samples, dtype=np.float32)
+        if len(samples) < self.frame_length:
+            samples = np.pad(samples, (0, self.frame_length - len(samples)))
+        count = (len(samples) - self.frame_length) // self.hop + 1
+        return np.lib.stride_tricks.as_strided(
+            samples, shape=(count, self.frame_length),
+            strides=(samples.strides[0] * self.hop, samples.strides[0]), writeable=False)
+    
+    def difference(self, frames):
+        """Кумулятивная нормированная разностная функция d'(tau) для пачки кадров"""
+        frames = np.asarray(frames, dtype=np.float64)
+        window, tau_max = self.window, self.tau_max
+        # r(tau) = сумма x[j] * x[j + tau] по j < W - одна свертка через rfft
+        spectrum = np.fft.rfft(frames, self.fft_size, axis=1)
+        head = np.fft.rfft(frames[:, :window], self.fft_size, axis=1)
+        correlation = np.fft.irfft(spectrum * np.conj(head), self.fft_size, axis=1)[:, :tau_max]
+        # Энергии окон [0, W) и [tau, tau + W) - из накопленной суммы квадратов
+        energy = np.concatenate((np.zeros((len(frames), 1)), np.cumsum(frames ** 2, axis=1)), axis=1)
+        shifted = energy[:, window:window + tau_max] - energy[:, :tau_max]
+        diff = energy[:, window:window + 1] + shifted - 2 * correlation
+        diff[:, 0] = 0.0
+        np.maximum(diff, 0.0, out=diff)
+        # d'(tau) = d(tau) * tau / сумма d(1..tau)
+        running = np.cumsum(diff[:, 1:], axis=1)
+        normalized = np.ones_like(diff)
+        np.divide(diff[:, 1:] * np.arange(1, tau_max), running, out=normalized[:, 1:], where=running > 0)
+        return normalized
+    
+    def analyze(self, frames, start_time=0.0):
+        """Высота тона пачки кадров: массив PITCH_FRAME_DTYPE"""
+        frames = np.atleast_2d(frames)
+        count = len(frames)
+        result = np.zeros(count, dtype=PITCH_FRAME_DTYPE)
+        result["time"] = start_time + np.arange(count) * self.hop / self.sample_rate
+        if count == 0:
+            return result
+        normalized = self.difference(frames)
+        rows = np.arange(count)
+        
+        # Первый провал ниже порога: первый tau, где d' ниже порога и дальше не убывает
+        search = normalized[:, self.tau_min:self.tau_max - 1]
+        dip = (search < self.threshold) & (normalized[:, self.tau_min + 1:] >= search)
+        found = dip.any(axis=1)
+        tau = np.where(found, dip.argmax(axis=1), search.argmin(axis=1)) + self.tau_min
+        
+        # Уточнение минимума параболой по трем соседним точкам
+        left = normalized[rows, tau - 1]
+        center = normalized[rows, tau]
+        right = normalized[rows, np.minimum(tau + 1, self.tau_max - 1)]
+        curvature = left - 2 * center + right
+        offset = np.zeros(count)
+        np.divide(left - right, 2 * curvature, out=offset, where=curvature > 1e-12)
+        period = tau + np.clip(offset, -0.5, 0.5)
+        
+        rms = np.sqrt(np.mean(np.square(frames[:, :self.window], dtype=np.float64), axis=1))
+        confidence = np.clip(1.0 - center, 0.0, 1.0)
+        voiced = found & (rms >= self.silence_rms)
+        frequency = np.where(voiced, self.sample_rate / period, 0.0)
+        
+        # Ближайшая клавиша в текущем строе и отклонение от нее
+        log_frequency = np.log2(np.where(voiced, frequency, 1.0))
+        index = np.clip(np.searchsorted(self._log_frequencies, log_frequency), 1, len(self._log_frequencies) - 1)
+        lower = self._log_frequencies[index - 1]
+        upper = self._log_frequencies[index]
+        index -= (log_frequency - lower) < (upper - log_frequency)
+        
+        result["frequency"] = frequency
+        result["confidence"] = np.where(voiced, confidence, 0.0)
+        result["midi"] = np.where(voiced, index + self.pitch_table.LOWEST, 0)
+        result["cents"] = np.where(voiced, 1200 * (log_frequency - self._log_frequencies[index]), 0.0)
+        return result
+    
+    def process(self, samples):
+        """Анализ всей записи"""
+        return self.analyze(self.frames(samples))
+
+
+class PitchTracker:
+    """Потоковый анализ: блоки звука произвольной длины на входе, кадры по мере готовности на выходе"""
+    
+    def __init__(self, detector):
+        self.detector = detector
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._consumed = 0
+        # Время анализа одного кадра (мкс)
+        self.frame_costs = LatencyHistogram()
+    
+    def feed(self, block):
+        """Добавление блока; возвращает новые кадры (массив PITCH_FRAME_DTYPE)"""
+        detector = self.detector
+        self._buffer = np.concatenate((self._buffer, np.asarray(block, dtype=np.float32)))
+        ready = (len(self._buffer) - detector.frame_length) // detector.hop + 1
+        if ready <= 0:
+            return np.zeros(0, dtype=PITCH_FRAME_DTYPE)
+        results = []
+        for number in range(ready):
+            started = time.thread_time_ns()
+            start = number * detector.hop
+            results.append(detector.analyze(self._buffer[start:start + detector.frame_length],
+                                            (self._consumed + start) / detector.sample_rate))
+            self.frame_costs.record((time.thread_time_ns() - started) // 1000)
+        advance = ready * detector.hop
+        self._buffer = self._buffer[advance:]
+        self._consumed += advance
+        return np.concatenate(results)
+
+
+def pitch_segments(frames, min_confidence=0.8, min_frames=3):
+    """Склейка кадров в ноты: подряд идущие уверенные кадры с одной клавишей
+    
+    Возвращает список словарей с полями midi, start, end (с) и cents (медиана).
+    """
+    segments = []
+    if len(frames) == 0:
+        return segments
+    step = frames["time"][1] - frames["time"][0] if len(frames) > 1 else 0.0
+    keys = np.where(frames["confidence"] >= min_confidence, frames["midi"], 0)
+    # Границы участков с одинаковой клавишей
+    bounds = np.flatnonzero(np.diff(keys)) + 1
+    for start, end in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(keys)]))):
+        if keys[start] and end - start >= min_frames:
+            segments.append({"midi": int(keys[start]),
+                             "start": float(frames["time"][start]),
+                             "end": float(frames["time"][end - 1] + step),
+                             "cents": float(np.median(frames["cents"][start:end]))})
+    return segments
+
+
+def microphone_available():
+    """Есть ли библиотека для записи с микрофона"""
+    return importlib.util.find_spec("sounddevice") is not None
+
+
+def listen_microphone(tracker, on_frames, stop_event):
+    """Запись с микрофона блоками по шагу анализа до stop_event (блокирующий вызов для фонового потока)
+    
+    on_frames(frames) получает каждую новую пачку кадров PITCH_FRAME_DTYPE.
+    """
+    sounddevice = importlib.import_module("sounddevice")
+    detector = tracker.detector
+    with sounddevice.InputStream(samplerate=detector.sample_rate, channels=1, dtype='float32',
+                                 blocksize=detector.hop) as stream:
+        while not stop_event.is_set():
+            block, _ = stream.read(detector.hop)
+            frames = tracker.feed(block[:, 0])
+            if len(frames):
+                on_frames(frames)
+
+
+def benchmark_pitch_detection(seconds=10.0, sample_rate=SAMPLE_RATE):
+    """Стоимость анализа одного кадра при потоковой подаче по PITCH_HOP_MS
+    
+    Сигнал - гармонический тон с вибрато и шумом; возвращает перцентили (мс)
+    и долю кадров, где нота определена верно.
+    """
+    detector = PitchDetector(sample_rate)
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    frequency = 220.0 * 2 ** (0.3 / 12 * np.sin(2 * np.pi * 5 * t))
+    phase = 2 * np.pi * np.cumsum(frequency) / sample_rate
+    signal = sum(np.sin(k * phase) / k for k in range(1, 6)) * 0.3 + rng.normal(0, 0.01, len(t))
+    tracker = PitchTracker(detector)
+    frames = np.concatenate([tracker.feed(block) for block in np.array_split(signal, len(signal) // detector.hop)])
+    costs = tracker.frame_costs
+    return {
+        "frames": len(frames),
+        "p50_ms": costs.percentile(50) / 1000,
+        "p99_ms": costs.percentile(99) / 1000,
+        "max_ms": costs.max_us / 1000,
+        "accuracy": float(np.mean(frames["midi"] == 57)),
+        "within_budget": costs.percentile(99) / 1e6 <= PITCH_CPU_BUDGET
+    }
+
+
+class LatencyHistogram:
+    """Потоковая гистограмма времени реакции в стиле HDR Histogram
+    
+    Значения в микросекундах раскладываются по логарифмически-линейным корзинам:
+    SUB_BITS старших бит значения задают корзину, поэтому относительная погрешность
+    не превышает 1 / 2**SUB_BITS, а число корзин фиксировано при любом числе замеров.
+    """
+    
+    SUB_BITS = 5
+    MAX_VALUE_BITS = 27  # около 134 с; большие значения попадают в последнюю корзину
+    
+    def __init__(self):
+        self.counts = [0] * self._index((1 << self.MAX_VALUE_BITS) - 1) + [0]
+        self.total = 0
+        self.min_us = None
+        self.max_us = 0
+    
+    @classmethod
+    def _index(cls, value):
+        bits = value.bit_length()
+        if bits <= cls.SUB_BITS + 1:
+            return value
+        shift = bits - cls.SUB_BITS - 1
+        return ((shift + 1) << cls.SUB_BITS) + (value >> shift) - (1 << cls.SUB_BITS)
+    
+    @classmethod
+    def _bucket_value(cls, index):
+        """Середина диапазона значений корзины"""
+        if index < 2 << cls.SUB_BITS:
+            return index
+        shift = (index >> cls.SUB_BITS) - 1
+        low = ((index & ((1 << cls.SUB_BITS) - 1)) + (1 << cls.SUB_BITS)) << shift
+        return low + ((1 << shift) - 1) / 2
+    
+    def record(self, value_us):
+        value = min(max(int(value_us), 0), (1 << self.MAX_VALUE_BITS) - 1)
+        self.counts[self._index(value)] += 1
+        self.total += 1
+        self.min_us = value if self.min_us is None else min(self.min_us, value)
+        self.max_us = max(self.max_us, value)
+    
+    def percentile(self, percent):
+        """Значение (мкс), не превышаемое percent процентами замеров"""
+        if not self.total:
+            return 0.0
+        rank = max(1, math.ceil(self.total * percent / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(max(self._bucket_value(index), self.min_us), self.max_us)
+        return float(self.max_us)
+
+
+class ExerciseEngine:
+    """Логика упражнения без интерфейса: выбор вопроса, проверка ответа и счет"""
+    
+    name = "base"
+    
+    def __init__(self, rng=None):
+        self.rng = rng or random.Random()
+        self.active = False
+        self.current = None
+        self.pending = False
+        self.asked_ns = 0
+        self.round = 0
+        self.score = 0
+        self.attempts = 0
+        # Гистограммы времени реакции по правильным ответам (названию интервала, аккорда...)
+        self.response_times = {}
+        # Внешний выбор вопросов (например, интервальное повторение):
+        # объект с методами next_item() и record(item, correct)
+        self.sampler = None
+    
+    def generate(self):
+        """Случайный вопрос"""
+        raise NotImplementedError
+    
+    def bank(self):
+        """Все возможные вопросы при текущих настройках"""
+        raise NotImplementedError
+    
+    def answer_of(self, item):
+        """Правильный ответ на вопрос"""
+        return item
+    
+    def response_key(self, expected):
+        """Под каким ключом копить время реакции для этого ответа"""
+        return expected
+    
+    def grade(self, expected, answer):
+        """Оценка ответа: словарь как минимум с полем correct"""
+        return {"correct": answer == expected}
+    
+    def start(self):
+        """Начало упражнения со сбросом счета"""
+        self.active = True
+        self.current = None
+        self.pending = False
+        self.score = 0
+        self.attempts = 0
+    
+    def stop(self):
+        """Остановка упражнения"""
+        self.active = False
+        self.current = None
+        self.pending = False
+    
+    def next_item(self):
+        """Следующий вопрос (None, если упражнение не идет)"""
+        if not self.active:
+            return None
+        self.current = self.sampler.next_item() if self.sampler else self.generate()
+        self.pending = True
+        self.round += 1
+        self.asked_ns = time.perf_counter_ns()
+        return self.current
+    
+    def mark_presented(self, round_id, finished_ns):
+        """Отсчет времени реакции от конца звучания вопроса раунда round_id
+        
+        Вызывается из потока воспроизведения; для прошедших раундов ничего не делает.
+        """
+        if self.pending and round_id == self.round:
+            self.asked_ns = finished_ns
+    
+    def submit_answer(self, answer):
+        """Проверка ответа на текущий вопрос
+        
+        Возвращает словарь с полями item, expected, correct и response_ms (время от
+        конца последнего прослушивания, а без него - от вопроса, до ответа)
+        или None, если отвечать сейчас не на что.
+        Повторный ответ на тот же вопрос не засчитывается.
+        """
+        if not self.active or not self.pending:
+            return None
+        response_ns = max(0, time.perf_counter_ns() - self.asked_ns)
+        item = self.current
+        expected = self.answer_of(item)
+        details = self.grade(expected, answer)
+        correct = details["correct"]
+        # Ошибочные ответы - часто догадки, их время не смешивается со временем узнавания
+        if correct:
+            key = self.response_key(expected)
+            histogram = self.response_times.get(key)
+            if histogram is None:
+                histogram = self.response_times[key] = LatencyHistogram()
+            histogram.record(response_ns // 1000)
+        self.attempts += 1
+        if correct:
+            self.score += 1
+        if self.sampler:
+            self.sampler.record(item, correct)
+        self.pending = False
+        return dict(details, item=item, expected=expected, response_ms=response_ns / 1e6)
+    
+    def response_percentiles(self, percents=(50, 90, 99)):
+        """Перцентили времени реакции (мс) по каждому правильному ответу: {ответ: (число, [p50, ...])}"""
+        return {
+            answer: (histogram.total, [histogram.percentile(p) / 1000 for p in percents])
+            for answer, histogram in self.response_times.items()
+        }
+    
+    def stats(self):
+        """Счет текущего упражнения"""
+        return {
+            "score": self.score,
+            "attempts": self.attempts,
+            "accuracy": self.score / self.attempts if self.attempts else 0.0
+        }
+
+
+class NoteExercise(ExerciseEngine):
+    """Определение нот: вопрос - название ноты"""
+    
+    name = "notes"
+    
+    def __init__(self, notes=None, rng=None):
+        super().__init__(rng)
+        self.notes = list(notes or WHITE_KEYS)
+    
+    def generate(self):
+        return self.rng.choice(self.notes)
+    
+    def bank(self):
+        return list(self.notes)
+
+
+class IntervalExercise(ExerciseEngine):
+    """Определение интервалов: вопрос - (название интервала, корень MIDI, способ звучания)
+    
+    Все вопросы всех режимов заранее собраны в компактный массив по 3 байта
+    (номер интервала, корень, способ). Включение и выключение режимов только
+    пересчитывает индексы разрешенных вопросов, не создавая новых объектов.
+    """
+    
+    name = "intervals"
+    ITEM_DTYPE = np.dtype([("interval", np.uint8), ("root", np.uint8), ("mode", np.uint8)])
+    
+    def __init__(self, intervals=None, roots=None, modes=("up",), compound=False, rng=None):
+        super().__init__(rng)
+        intervals = ALL_INTERVALS if intervals is None else intervals
+        self.interval_names = list(intervals)
+        self._compound = np.array([intervals[name]["semitones"] > 12 for name in self.interval_names])
+        self.modes = tuple(modes)
+        self.compound = compound
+        self.roots = list(WHITE_KEYS.values()) if roots is None else list(roots)
+    
+    @property
+    def roots(self):
+        return self._roots
+    
+    @roots.setter
+    def roots(self, roots):
+        """Новый набор корней: массив вопросов строится заново"""
+        self._roots = list(roots)
+        interval, root, mode = np.meshgrid(np.arange(len(self.interval_names)), self._roots,
+                                           np.arange(len(INTERVAL_MODES)), indexing="ij")
+        items = np.empty(interval.size, dtype=self.ITEM_DTYPE)
+        items["interval"] = interval.ravel()
+        items["root"] = root.ravel()
+        items["mode"] = mode.ravel()
+        self.items = items
+        self._select()
+    
+    def configure(self, modes=None, compound=None):
+        """Смена режимов: способы звучания и составные интервалы"""
+        if modes is not None:
+            self.modes = tuple(modes)
+        if compound is not None:
+            self.compound = compound
+        self._select()
+    
+    def _select(self):
+        mode_mask = np.isin(self.items["mode"], [INTERVAL_MODES.index(mode) for mode in self.modes])
+        if not self.compound:
+            mode_mask &= ~self._compound[self.items["interval"]]
+        self.selection = np.flatnonzero(mode_mask)
+    
+    def decode(self, index):
+        interval, root, mode = self.items[index].tolist()
+        return self.interval_names[interval], root, INTERVAL_MODES[mode]
+    
+    def generate(self):
+        return self.decode(self.selection[self.rng.randrange(len(self.selection))])
+    
+    def bank(self):
+        return [self.decode(index) for index in self.selection]
+    
+    def answer_of(self, item):
+        return item[0]
+
+
+class ChordExercise(ExerciseEngine):
+    """Определение аккордов: вопрос - (название аккорда, корень MIDI, обращение, расположение)
+    
+    Обращения и расположения задает уровень сложности (CHORD_VOICING_LEVELS).
+    Список вопросов строится из запомненных перечислений chord_voicings один раз
+    на уровень и набор корней; раунд - случайный выбор из готового списка.
+    """
+    
+    name = "chords"
+    
+    def __init__(self, difficulty="Начальный", roots=None, rng=None):
+        super().__init__(rng)
+        self._difficulty = difficulty
+        self.roots = list(WHITE_KEYS.values()) if roots is None else roots
+    
+    @property
+    def difficulty(self):
+        return self._difficulty
+    
+    @difficulty.setter
+    def difficulty(self, difficulty):
+        self._difficulty = difficulty
+        self._items = None
+    
+    @property
+    def roots(self):
+        return self._roots
+    
+    @roots.setter
+    def roots(self, roots):
+        self._roots = list(roots)
+        self._items = None
+    
+    def generate(self):
+        if self._items is None:
+            self._items = self.bank()
+        return self.rng.choice(self._items)
+    
+    def bank(self):
+        level = CHORD_VOICING_LEVELS[self.difficulty]
+        return [(name, root, inversion, voicing)
+                for root in self.roots
+                for name in DIFFICULTY_LEVELS[self.difficulty]
+                for inversion, voicing, _ in chord_voicings(
+                    tuple(CHORDS[name]["semitones"]), root, level["inversions"], level["voicings"])]
+    
+    def answer_of(self, item):
+        return item[0]
+
+
+# Ступени натурального мажора (полутоны от тоники); 7 - тоника октавой выше
+MAJOR_SCALE_STEPS = (0, 2, 4, 5, 7, 9, 11, 12)
+
+# Веса переходов между ступенями для мелодий диктанта (строка - откуда, столбец - куда):
+# чаще поступенное движение и скачки по тоническому трезвучию, VII ступень тяготеет в тонику
+DICTATION_TRANSITIONS = (
+    (1, 6, 4, 2, 3, 1, 1, 2),
+    (6, 1, 6, 2, 2, 1, 1, 1),
+    (4, 6, 1, 6, 3, 1, 0, 1),
+    (2, 2, 6, 1, 6, 2, 1, 1),
+    (3, 1, 3, 6, 1, 6, 2, 3),
+    (1, 1, 1, 2, 6, 1, 6, 3),
+    (0, 0, 0, 0, 1, 2, 0, 12),
+    (3, 1, 1, 1, 3, 2, 6, 1)
+)
+
+
+class MelodyGenerator:
+    """Мелодии диктанта по марковской цепи на ступенях мажора
+    
+    Накопленные веса переходов считаются один раз, поэтому каждая следующая
+    нота - один случайный выбор и двоичный поиск по строке из восьми чисел.
+    """
+    
+    def __init__(self, transitions=DICTATION_TRANSITIONS, steps=MAJOR_SCALE_STEPS, rng=None):
+        self.steps = steps
+        self.rng = rng or random.Random()
+        self.cumulative = [list(itertools.accumulate(row)) for row in transitions]
+    
+    def degrees(self, length):
+        """Последовательность ступеней: от тоники или терции к тонике"""
+        rng = self.rng
+        degree = rng.choice((0, 0, 2, 4))
+        result = [degree]
+        for _ in range(length - 2):
+            row = self.cumulative[degree]
+            degree = bisect.bisect_right(row, rng.random() * row[-1])
+            result.append(degree)
+        if length > 1:
+            # Последняя нота - тоника, ближайшая к предыдущей
+            result.append(7 if degree >= 4 else 0)
+        return result[:length]
+    
+    def generate(self, length, tonic=60):
+        """Мелодия из length нот (номера MIDI) в мажоре от тоники tonic"""
+        steps = self.steps
+        return [tonic + steps[degree] for degree in self.degrees(length)]
+
+
+def align_sequences(expected, answer, band=None):
+    """Выравнивание ответа с эталоном по расстоянию Левенштейна в полосе вокруг диагонали
+    
+    Считаются только клетки с |i - j| <= band, поэтому время O(n * band), а не O(n * m).
+    Если расстояние больше полосы, полоса удваивается и расчет повторяется -
+    результат всегда точный. Возвращает расстояние и пошаговое выравнивание:
+    список (операция, эталон, ответ), где операция - match, substitute, insert или delete.
+    """
+    n, m = len(expected), len(answer)
+    if band is None:
+        band = max(abs(n - m), 2)
+    # Полоса не уже 1: иначе удвоение ее не расширит и цикл не закончится
+    band = max(band, abs(n - m), 1)
+    infinity = n + m + 1
+    
+    while True:
+        # Строки матрицы хранятся только внутри полосы: столбец j хранится под индексом j - i + band
+        width = 2 * band + 1
+        rows = [[infinity] * width for _ in range(n + 1)]
+        for j in range(min(m, band) + 1):
+            rows[0][j + band] = j
+        for i in range(1, n + 1):
+            row, previous = rows[i], rows[i - 1]
+            low, high = max(0, i - band), min(m, i + band)
+            if low == 0:
+                row[band - i] = i
+                low = 1
+            expected_note = expected[i - 1]
+            for j in range(low, high + 1):
+                k = j - i + band
+                # previous: тот же столбец j - под индексом k + 1, столбец j - 1 - под k
+                best = previous[k] + (expected_note != answer[j - 1])
+                if k + 1 < width and previous[k + 1] + 1 < best:
+                    best = previous[k + 1] + 1
+                if k > 0 and row[k - 1] + 1 < best:
+                    best = row[k - 1] + 1
+                row[k] = best
+        distance = rows[n][m - n + band]
+        if distance <= band or band >= max(n, m):
+            break
+        band *= 2
+    
+    # Обратный проход по сохраненной полосе
+    operations = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        k = j - i + band
+        current = rows[i][k]
+        if i > 0 and j > 0:
+            cost = expected[i - 1] != answer[j - 1]
+            if rows[i - 1][k] + cost == current:
+                operations.append(("substitute" if cost else "match", expected[i - 1], answer[j - 1]))
+                i, j = i - 1, j - 1
+                continue
+        if i > 0 and k + 1 < 2 * band + 1 and rows[i - 1][k + 1] + 1 == current:
+            operations.append(("delete", expected[i - 1], None))
+            i -= 1
+        else:
+            operations.append(("insert", None, answer[j - 1]))
+            j -= 1
+    operations.reverse()
+    return distance, operations
+
+
+class DictationExercise(ExerciseEngine):
+    """Мелодический диктант: вопрос - кортеж нот MIDI, ответ - введенная последовательность
+    
+    Правильным считается диктант без единой ошибки; оценка содержит выравнивание
+    и долю верно записанных нот.
+    """
+    
+    name = "dictation"
+    
+    def __init__(self, length=8, tonic=60, rng=None):
+        super().__init__(rng)
+        self.length = length
+        self.tonic = tonic
+        self.generator = MelodyGenerator(rng=self.rng)
+    
+    def generate(self):
+        return tuple(self.generator.generate(self.length, self.tonic))
+    
+    def response_key(self, expected):
+        return len(expected)
+    
+    def grade(self, expected, answer):
+        answer = tuple(answer or ())
+        distance, operations = align_sequences(expected, answer)
+        matches = sum(1 for operation, _, _ in operations if operation == "match")
+        return {
+            "correct": distance == 0,
+            "distance": distance,
+            "operations": operations,
+            "note_accuracy": matches / len(expected) if expected else 1.0
+        }
+
+
+class SingingExercise(ExerciseEngine):
+    """Пение нот: вопрос - клавиша MIDI, ответ - клавиша, определенная по голосу
+    
+    Засчитывается нота в любой октаве, чтобы низкие и высокие голоса пели в своем регистре.
+    """
+    
+    name = "singing"
+    
+    def __init__(self, notes=None, rng=None):
+        super().__init__(rng)
+        self.notes = list(notes or WHITE_KEYS.values())
+    
+    def generate(self):
+        return self.rng.choice(self.notes)
+    
+    def bank(self):
+        return list(self.notes)
+    
+    def response_key(self, expected):
+        return PITCH_CLASS_NAMES[expected % 12]
+    
+    def grade(self, expected, answer):
+        return {
+            "correct": answer is not None and answer % 12 == expected % 12,
+            "octave_shift": (answer - expected + 6) // 12 if answer is not None else 0
+        }
+
+
+# Темы теории: файл theory/<ключ>.txt.gz рядом с программой и название на кнопке
+THEORY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "theory")
+THEORY_TOPICS = (
+    ("sound_basics", "🎵 Основы звука"),
+    ("notes", "🎼 Ноты и нотный стан"),
+    ("rhythm", "⏱️ Ритм и длительности"),
+    ("intervals", "📐 Интервалы"),
+    ("chords", "🎹 Аккорды"),
+    ("modes", "🎶 Лад и тональность"),
+    ("musical_form", "📝 Музыкальная форма"),
+    ("harmony", "🎻 Гармония"),
+    ("dictation", "✍️ Музыкальный диктант"),
+    ("solfeggio", "🎤 Сольфеджио"),
+)
+
+
+def load_theory_text(key):
+    """Текст темы теории из сжатого файла; читается только при открытии темы"""
+    with gzip.open(os.path.join(THEORY_DIR, f"{key}.txt.gz"), 'rt', encoding='utf-8') as f:
+        return f.read()
+
+
+# Поиск по теории: слова из букв и цифр и окончания, отбрасываемые легким стеммингом
+WORD_PATTERN = re.compile(r"[^\W_]+")
+RUSSIAN_ENDINGS = tuple(sorted((
+    "иями", "иях", "иям", "ием", "ией", "ями", "ами", "ого", "его", "ому", "ему", "ыми", "ими", "ость", "ости", "остью",
+    "ой", "ей", "ий", "ый", "ая", "яя", "ое", "ее", "ые", "ие", "ую", "юю", "ов", "ев", "ах", "ях",
+    "ам", "ям", "ом", "ем", "ою", "ею", "ых", "их", "ым", "им", "ия", "ья", "ье", "ии", "ьи", "ию", "ью", "ть", "ет", "ут", "ют", "ит",
+    "ат", "ят", "а", "я", "о", "е", "ы", "и", "у", "ю", "ь", "й"), key=len, reverse=True))
+# Короче этого основа не обрезается
+MIN_STEM_LENGTH = 3
+
+
+def normalize_word(word):
+    """Поисковая форма слова: нижний регистр, ё как е, без одного окончания"""
+    word = word.lower().replace("ё", "е")
+    for ending in RUSSIAN_ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= MIN_STEM_LENGTH:
+            return word[:-len(ending)]
+    return word
+
+
+def theory_content_hash():
+    """Хэш файлов всех тем: кэш индекса годен, пока тексты не изменились"""
+    digest = hashlib.sha256(f"{TheorySearchIndex.FORMAT_VERSION}".encode())
+    for key, _ in THEORY_TOPICS:
+        digest.update(key.encode())
+        with open(os.path.join(THEORY_DIR, f"{key}.txt.gz"), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class TheorySearchIndex:
+    """Обратный индекс по темам теории: поисковая форма слова -> строки тем, где оно есть
+    
+    Строка засчитывается, если в ней есть все слова запроса; последнее слово запроса,
+    пока оно набирается (нет пробела в конце), ищется как начало слова. Строки ранжируются
+    по числу точных совпадений, затем по сумме IDF найденных слов.
+    """
+    
+    FORMAT_VERSION = 1
+    
+    def __init__(self, lines, postings, content_hash=None):
+        # lines: {ключ темы: [строки]}, postings: {слово: [(номер темы, номер строки от 1)]}
+        self.lines = lines
+        self.postings = postings
+        self.content_hash = content_hash
+        self.keys = [key for key, _ in THEORY_TOPICS]
+        self.terms = sorted(postings)
+        line_count = sum(len(topic_lines) for topic_lines in lines.values())
+        self.idf = {term: math.log(1 + line_count / len(set(entries)))
+                    for term, entries in postings.items()}
+    
+    @classmethod
+    def build(cls, texts, content_hash=None):
+        """Индекс по текстам {ключ темы: текст}"""
+        lines = {}
+        postings = {}
+        for topic, (key, _) in enumerate(THEORY_TOPICS):
+            lines[key] = texts[key].split("\n")
+            for number, line in enumerate(lines[key], 1):
+                for term in {normalize_word(word) for word in WORD_PATTERN.findall(line)}:
+                    postings.setdefault(term, []).append((topic, number))
+        return cls(lines, postings, content_hash)
+    
+    def save(self, path):
+        """Сохранение индекса (атомарная запись через временный файл)"""
+        data = {"version": self.FORMAT_VERSION, "hash": self.content_hash,
+                "lines": self.lines, "postings": self.postings}
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path, content_hash):
+        """Индекс из файла или None, если файла нет или он построен по другим текстам"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != cls.FORMAT_VERSION or data.get("hash") != content_hash:
+            return None
+        postings = {term: [tuple(entry) for entry in entries] for term, entries in data["postings"].items()}
+        return cls(data["lines"], postings, content_hash)
+    
+    def expand(self, term, prefix=False):
+        """Слова индекса для слова запроса: точное совпадение или все слова с этим началом"""
+        if not prefix:
+            return [term] if term in self.postings else []
+        start = bisect.bisect_left(self.terms, term)
+        end = bisect.bisect_left(self.terms, term + "\uffff")
+        return self.terms[start:end]
+    
+    def search(self, query, limit=20):
+        """Найденные строки по убыванию релевантности
+        
+        Каждая находка - словарь: key (тема), line (номер строки от 1), text и terms
+        (слова индекса, совпавшие в этой строке, - для подсветки).
+        """
+        words = WORD_PATTERN.findall(query)
+        if not words:
+            return []
+        typing = not query[-1:].isspace()
+        scores = None
+        matched = {}
+        for position, word in enumerate(words):
+            term = normalize_word(word)
+            prefix = typing and position == len(words) - 1 and len(term) > 1
+            # Оценка строки по слову: (точное совпадение, IDF); точные совпадения идут первыми
+            word_scores = {}
+            for candidate in self.expand(term, prefix):
+                score = (int(candidate == term), self.idf[candidate])
+                for entry in self.postings[candidate]:
+                    if score > word_scores.get(entry, (0, 0.0)):
+                        word_scores[entry] = score
+                    matched.setdefault(entry, set()).add(candidate)
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {entry: (exact + word_scores[entry][0], weight + word_scores[entry][1])
+                          for entry, (exact, weight) in scores.items() if entry in word_scores}
+            if not scores:
+                return []
+        ranked = heapq.nsmallest(limit, scores.items(),
+                                 key=lambda item: (-item[1][0], -item[1][1], item[0]))
+        return [{"key": self.keys[topic], "line": number,
+                 "text": self.lines[self.keys[topic]][number - 1],
+                 "terms": matched[(topic, number)]}
+                for (topic, number), _ in ranked]
+
+
+def load_theory_index(path=None):
+    """Индекс поиска по теории: из кэша на диске, а если тексты изменились - построенный заново"""
+    if path is None:
+        path = user_data_path("theory_index.json")
+    content_hash = theory_content_hash()
+    index = TheorySearchIndex.load(path, content_hash)
+    if index is None:
+        index = TheorySearchIndex.build({key: load_theory_text(key) for key, _ in THEORY_TOPICS}, content_hash)
+        try:
+            index.save(path)
+        except OSError:
+            traceback.print_exc()
+    return index
+
+
+def match_spans(line, terms):
+    """Позиции (начало, конец) слов строки, поисковая форма которых входит в terms"""
+    return [match.span() for match in WORD_PATTERN.finditer(line)
+            if normalize_word(match.group()) in terms]
+
+
+# Папка с данными пользователя (расписание повторений и т.п.)
+USER_DATA_DIR = os.path.join(os.path.expanduser("~"), ".solfeggio_pro")
+
+
+def user_data_path(name):
+    """Путь к файлу в папке данных пользователя; папка создается при первом обращении"""
+    os.makedirs(USER_DATA_DIR, exist_ok=True)
+    return os.path.join(USER_DATA_DIR, name)
+
+
+def build_interval_bank(intervals=INTERVALS, roots=None, modes=("up", "down"),
+                        octaves=(-1, 0, 1)):
+    """Банк карточек интервалов: интервал × корень × способ звучания × октава
+    
+    Карточка - кортеж (название интервала, корень MIDI, способ), корень
+    уже сдвинут на нужную октаву относительно первой.
+    """
+    roots = list(WHITE_KEYS.values()) if roots is None else list(roots)
+    return [(name, root + 12 * octave, mode)
+            for octave in octaves
+            for root in roots
+            for name in intervals
+            for mode in modes]
+
+
+class SpacedRepetitionScheduler:
+    """Интервальное повторение карточек по алгоритму SM-2
+    
+    Состояние изученной карточки - [легкость, интервал в секундах, повторений подряд, срок].
+    Изученные карточки лежат в куче по сроку; после переоценки старая запись не
+    удаляется, а пропускается при выборе, поэтому выбор и запись ответа стоят O(log n).
+    Новые карточки выдаются, только когда нет просроченных повторений.
+    """
+    
+    FIRST_INTERVAL = 60.0
+    SECOND_INTERVAL = 600.0
+    RELEARN_DELAY = 20.0
+    START_EASINESS = 2.5
+    MIN_EASINESS = 1.3
+    FORMAT_VERSION = 1
+    
+    def __init__(self, items, clock=time.time, rng=None):
+        self.clock = clock
+        self.cards = {}
+        self.heap = []
+        self._latest = {}
+        self._counter = itertools.count()
+        new_items = list(dict.fromkeys(items))
+        (rng or random.Random()).shuffle(new_items)
+        # Новые карточки выдаются с конца перемешанного списка за O(1)
+        self.new_items = new_items
+        self._new_set = set(new_items)
+        # Карточки из файла, которых нет в текущем банке (другие режимы): сохраняются как есть
+        self.dormant = {}
+    
+    def __len__(self):
+        return len(self.cards) + len(self.new_items)
+    
+    def _push(self, item):
+        seq = next(self._counter)
+        self._latest[item] = seq
+        heapq.heappush(self.heap, (self.cards[item][3], seq, item))
+    
+    def _top(self):
+        """Ближайшая по сроку изученная карточка (устаревшие записи выбрасываются)"""
+        heap = self.heap
+        while heap and self._latest.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+    
+    def next_item(self):
+        """Следующая карточка: просроченное повторение, затем новая, затем ближайшая"""
+        top = self._top()
+        if top is not None and top[0] <= self.clock():
+            return top[2]
+        while self.new_items:
+            item = self.new_items[-1]
+            if item in self._new_set:
+                return item
+            self.new_items.pop()
+        return top[2] if top is not None else None
+    
+    def record(self, item, correct, quality=None):
+        """Учет ответа; quality - оценка SM-2 от 0 до 5 (по умолчанию 4 или 1)"""
+        if quality is None:
+            quality = 4 if correct else 1
+        if item in self._new_set:
+            self._new_set.discard(item)
+            self.cards[item] = [self.START_EASINESS, 0.0, 0, 0.0]
+        elif item not in self.cards:
+            return
+        card = self.cards[item]
+        
+        if quality < 3:
+            card[2] = 0
+            card[1] = self.RELEARN_DELAY
+        else:
+            card[2] += 1
+            if card[2] == 1:
+                card[1] = self.FIRST_INTERVAL
+            elif card[2] == 2:
+                card[1] = self.SECOND_INTERVAL
+            else:
+                card[1] *= card[0]
+        card[0] = max(self.MIN_EASINESS,
+                      card[0] + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        card[3] = self.clock() + card[1]
+        self._push(item)
+    
+    def stats(self):
+        """Число новых, изученных и просроченных карточек"""
+        now = self.clock()
+        due = sum(1 for card in self.cards.values() if card[3] <= now)
+        return {"new": len(self._new_set), "learned": len(self.cards), "due": due}
+    
+    def save(self, path):
+        """Сохранение состояния изученных карточек (атомарная запись через временный файл)"""
+        data = {
+            "version": self.FORMAT_VERSION,
+            "cards": [[list(item), card]
+                      for item, card in itertools.chain(self.dormant.items(), self.cards.items())]
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path, items, clock=time.time, rng=None):
+        """Расписание для банка items с состоянием из файла (если он есть)
+        
+        Карточки из файла, которых нет в банке, не участвуют в выборе,
+        но сохраняются обратно при save().
+        """
+        scheduler = cls(items, clock=clock, rng=rng)
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return scheduler
+        if data.get("version") != cls.FORMAT_VERSION:
+            return scheduler
+        for item, card in data.get("cards", []):
+            item = tuple(item)
+            card = [float(card[0]), float(card[1]), int(card[2]), float(card[3])]
+            if item in scheduler._new_set:
+                scheduler._new_set.discard(item)
+                scheduler.cards[item] = card
+                scheduler._push(item)
+            else:
+                scheduler.dormant[item] = card
+        return scheduler
+
+
+class AdaptiveSampler:
+    """Выбор вопросов с весом, пропорциональным доле ошибок (метод псевдонимов Уолкера)
+    
+    Вес вопроса - (ошибки + 1) / (ответы + 2), так что новые вопросы имеют вес 1/2.
+    Таблица псевдонимов строится по весам на момент построения и дает кандидата
+    за O(1); кандидат принимается с вероятностью (текущий вес / вес при построении) / M,
+    где M - верхняя граница этого отношения. Поэтому выбор точен и при устаревшей
+    таблице, а перестраивается она за O(n) не чаще раза на n / REBUILD_FRACTION ответов
+    и только когда ожидаемое число попыток превышает REBUILD_TRIALS.
+    """
+    
+    REBUILD_TRIALS = 3.0
+    REBUILD_FRACTION = 8
+    
+    def __init__(self, items, counts=None, rng=None):
+        self.items = list(dict.fromkeys(items))
+        if not self.items:
+            raise ValueError("Пустой банк вопросов")
+        self.index = {item: i for i, item in enumerate(self.items)}
+        # Ошибки и ответы по вопросам; словарь можно передать из прошлого сеанса
+        self.counts = {} if counts is None else counts
+        self.rng = rng or random.Random()
+        self.weights = [self.weight(item) for item in self.items]
+        self.rebuilds = 0
+        self._build()
+    
+    def weight(self, item):
+        errors, attempts = self.counts.get(item, (0, 0))
+        return (errors + 1) / (attempts + 2)
+    
+    def _build(self):
+        """Построение таблицы псевдонимов (алгоритм Воуза) по текущим весам"""
+        n = len(self.weights)
+        total = sum(self.weights)
+        scaled = [w * n / total for w in self.weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        
+        self.prob = prob
+        self.alias = alias
+        self.built_weights = list(self.weights)
+        self.built_total = total
+        self.total = total
+        self.max_ratio = 1.0
+        self.updates = 0
+        self.rebuilds += 1
+    
+    def expected_trials(self):
+        """Ожидаемое число попыток на один выбор при текущей таблице"""
+        return self.max_ratio * self.built_total / self.total
+    
+    def next_item(self):
+        n = len(self.items)
+        rng = self.rng
+        while True:
+            u = rng.random() * n
+            i = int(u)
+            if u - i >= self.prob[i]:
+                i = self.alias[i]
+            ratio = self.weights[i] / self.built_weights[i]
+            if ratio >= self.max_ratio or rng.random() * self.max_ratio < ratio:
+                return self.items[i]
+    
+    def record(self, item, correct):
+        i = self.index.get(item)
+        if i is None:
+            return
+        errors, attempts = self.counts.get(item, (0, 0))
+        self.counts[item] = (errors + (not correct), attempts + 1)
+        
+        weight = self.weight(item)
+        self.total += weight - self.weights[i]
+        self.weights[i] = weight
+        self.max_ratio = max(self.max_ratio, weight / self.built_weights[i])
+        self.updates += 1
+        if (self.updates * self.REBUILD_FRACTION >= len(self.items)
+                and self.expected_trials() > self.REBUILD_TRIALS):
+            self._build()
+
+
+class HistoryStore:
+    """Журнал всех ответов в SQLite (режим WAL), дописываемый только в конец
+    
+    append() лишь кладет запись в очередь: фоновый поток забирает из нее все,
+    что накопилось, и пишет пачкой в одной транзакции, так что интерфейс не ждет диска.
+    Вместе с журналом в той же транзакции обновляется сводка item_stats (точность
+    по каждому вопросу), поэтому запрос точности читает сотни строк, а не всю историю.
+    Индекс (exercise, item) журнала нужен для выборки истории отдельного вопроса.
+    """
+    
+    BATCH_SIZE = 500
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS answers (
+            id INTEGER PRIMARY KEY,
+            ts REAL NOT NULL,
+            exercise TEXT NOT NULL,
+            item TEXT NOT NULL,
+            answer TEXT,
+            correct INTEGER NOT NULL,
+            response_ms REAL
+        );
+        CREATE INDEX IF NOT EXISTS answers_by_item ON answers (exercise, item);
+        CREATE TABLE IF NOT EXISTS item_stats (
+            exercise TEXT NOT NULL,
+            item TEXT NOT NULL,
+            correct INTEGER NOT NULL,
+            attempts INTEGER NOT NULL,
+            PRIMARY KEY (exercise, item)
+        ) WITHOUT ROWID;
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.written = 0
+        self.batches = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        
+        conn = self._connect()
+        try:
+            conn.executescript(self.SCHEMA)
+            # Итоги за все время читаются один раз, дальше ведутся в памяти
+            self._totals = {
+                exercise: [correct, attempts]
+                for exercise, correct, attempts in conn.execute(
+                    "SELECT exercise, SUM(correct), SUM(attempts) FROM item_stats GROUP BY exercise")
+            }
+        finally:
+            conn.close()
+        
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+    
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
+    @staticmethod
+    def _encode(value):
+        return json.dumps(value, ensure_ascii=False)
+    
+    @staticmethod
+    def _decode(text):
+        value = json.loads(text)
+        return tuple(value) if isinstance(value, list) else value
+    
+    def append(self, exercise, item, answer, correct, response_ms=None, ts=None):
+        """Добавление ответа в журнал (без ожидания записи на диск)"""
+        record = (time.time() if ts is None else ts, exercise, self._encode(item),
+                  self._encode(answer), int(bool(correct)), response_ms)
+        with self._lock:
+            totals = self._totals.setdefault(exercise, [0, 0])
+            totals[0] += int(bool(correct))
+            totals[1] += 1
+        self._queue.put(record)
+    
+    def flush(self, timeout=None):
+        """Ожидание записи всех ранее добавленных ответов"""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+    
+    def close(self):
+        """Запись остатка очереди и остановка фонового потока"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+    
+    def _run(self):
+        """Цикл потока записи: одна транзакция на все, что накопилось в очереди"""
+        conn = self._connect()
+        running = True
+        while running:
+            pending = [self._queue.get()]
+            while len(pending) < self.BATCH_SIZE:
+                try:
+                    pending.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            records = [entry for entry in pending if isinstance(entry, tuple)]
+            if records:
+                summary = {}
+                for _, exercise, item, _, correct, _ in records:
+                    counts = summary.setdefault((exercise, item), [0, 0])
+                    counts[0] += correct
+                    counts[1] += 1
+                try:
+                    with conn:
+                        conn.executemany(
+                            "INSERT INTO answers (ts, exercise, item, answer, correct, response_ms) "
+                            "VALUES (?, ?, ?, ?, ?, ?)", records)
+                        conn.executemany(
+                            "INSERT INTO item_stats (exercise, item, correct, attempts) VALUES (?, ?, ?, ?) "
+                            "ON CONFLICT (exercise, item) DO UPDATE SET "
+                            "correct = correct + excluded.correct, attempts = attempts + excluded.attempts",
+                            [(exercise, item, correct, attempts)
+                             for (exercise, item), (correct, attempts) in summary.items()])
+                    self.written += len(records)
+                    self.batches += 1
+                except sqlite3.Error:
+                    traceback.print_exc()
+            for entry in pending:
+                if entry is None:
+                    running = False
+                elif isinstance(entry, threading.Event):
+                    entry.set()
+        conn.close()
+    
+    def totals(self, exercise):
+        """Правильных ответов и всего ответов за все время"""
+        with self._lock:
+            correct, attempts = self._totals.get(exercise, (0, 0))
+        return {"score": correct, "attempts": attempts,
+                "accuracy": correct / attempts if attempts else 0.0}
+    
+    def item_accuracy(self, exercise):
+        """Точность по каждому вопросу упражнения: {вопрос: (правильно, всего)}
+        
+        Видит только уже записанные ответы; для точного среза сначала вызовите flush().
+        """
+        conn = sqlite3.connect(self.path)
+        try:
+            rows = conn.execute(
+                "SELECT item, correct, attempts FROM item_stats WHERE exercise = ?",
+                (exercise,)).fetchall()
+        finally:
+            conn.close()
+        return {self._decode(item): (correct, attempts) for item, correct, attempts in rows}
+
+
+def simulate_exercise(engine, rounds, accuracy=0.8, rng=None):
+    """Прогон упражнения без интерфейса: ученик отвечает верно с вероятностью accuracy
+    
+    Проверяет, что счет движка совпадает с числом верных ответов, и возвращает
+    статистику со скоростью в раундах в минуту.
+    """
+    rng = rng or random.Random(0)
+    engine.start()
+    expected_score = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        item = engine.next_item()
+        answer = engine.answer_of(item)
+        if rng.random() >= accuracy:
+            answer = None
+        result = engine.submit_answer(answer)
+        expected_score += result["correct"]
+    elapsed = time.perf_counter() - started
+    engine.stop()
+    
+    stats = engine.stats()
+    if stats["score"] != expected_score or stats["attempts"] != rounds:
+        raise AssertionError(f"Счет движка {stats} не совпадает с ожидаемым {expected_score}/{rounds}")
+    stats["rounds_per_minute"] = rounds / elapsed * 60 if elapsed > 0 else float("inf")
+    return stats
+
+
+class ScreenManager:
+    """Экраны главного окна: каждый строится один раз и дальше только показывается или скрывается
+    
+    Время переключения (вместе с пересчетом геометрии) копится отдельно для первого
+    показа экрана и для возврата на уже построенный.
+    """
+    
+    def __init__(self, root, background, on_leave=None):
+        self.root = root
+        self.background = background
+        # on_leave(name) вызывается перед скрытием экрана name
+        self.on_leave = on_leave
+        self.frames = {}
+        self.current = None
+        self.switch_times = {"build": LatencyHistogram(), "cached": LatencyHistogram()}
+        self.last_switch_ms = 0.0
+    
+    def show(self, name, build, enter=None):
+        """Показ экрана: build(frame) - только при первом показе, enter() - при каждом"""
+        started = time.perf_counter_ns()
+        if self.current is not None:
+            if self.on_leave is not None:
+                self.on_leave(self.current)
+            self.frames[self.current].pack_forget()
+        frame = self.frames.get(name)
+        kind = "cached"
+        if frame is None:
+            kind = "build"
+            frame = self.frames[name] = tk.Frame(self.root, bg=self.background)
+            build(frame)
+        frame.pack(fill=tk.BOTH, expand=True)
+        self.current = name
+        if enter is not None:
+            enter()
+        self.root.update_idletasks()
+        elapsed_us = (time.perf_counter_ns() - started) // 1000
+        self.switch_times[kind].record(elapsed_us)
+        self.last_switch_ms = elapsed_us / 1000
+        return frame
+    
+    def switch_stats(self, percents=(50, 99)):
+        """Число переключений и перцентили времени (мс): {"build"|"cached": (число, [p50, p99])}"""
+        return {kind: (histogram.total, [histogram.percentile(p) / 1000 for p in percents])
+                for kind, histogram in self.switch_times.items()}
+
+
+class SolfeggioApp:
+    # Буферов за один шаг фонового прогрева кэша
+    WARM_UP_BATCH = 16
+    # Длительность ноты и пауза между нотами диктанта (мс)
+    DICTATION_NOTE_MS = 500
+    DICTATION_GAP_MS = 100
+    # Пауза перед ритмом без метронома (с): успеть приготовиться к простукиванию
+    RHYTHM_LEAD_IN = 0.5
+    # Сколько кадров подряд нужно держать ноту, чтобы она засчиталась (по PITCH_HOP_MS)
+    SINGING_HOLD_FRAMES = 25
+    SINGING_MIN_CONFIDENCE = 0.8
+    
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Сольфеджио-Про v1.0")
+        self.root.geometry("1000x750")
+        self.root.configure(bg='#2c3e50')
+        
+        # Стили для виджетов
+        self.style = ttk.Style()
+        self.style.theme_use('clam')
+        
+        # Настройка цветов
+        self.colors = {
+            'bg': '#2c3e50',
+            'fg': '#ecf0f1',
+            'accent': '#3498db',
+            'success': '#2ecc71',
+            'danger': '#e74c3c',
+            'warning': '#f39c12',
+            'card': '#34495e',
+            'light_bg': '#ecf0f1',
+            'dark_bg': '#1a252f'
+        }
+        
+        # Настройка шрифтов
+        self.fonts = {
+            'title': ('Segoe UI', 24, 'bold'),
+            'heading': ('Segoe UI', 16, 'bold'),
+            'subheading': ('Segoe UI', 14, 'bold'),
+            'normal': ('Segoe UI', 11),
+            'small': ('Segoe UI', 9)
+        }
+        
+        # Синтезатор звуков и кэш готовых буферов
+        self.synth = SynthEngine()
+        self.waveform_cache = WaveformCache()
+        
+        # Единый поток воспроизведения звука; вывод выбирается при первом звуке
+        self.audio_backend = None
+        self.audio_backend_lock = threading.Lock()
+        self.audio_worker = AudioWorker(self.output_pcm)
+        
+        # Таблица высот всех клавиш и частоты нот первой октавы (в герцах)
+        self.pitch_table = DEFAULT_PITCH_TABLE
+        self.note_frequencies = dict(NOTE_FREQUENCIES)
+        self.extended_roots = False
+        
+        # Словарь для отображения нот на русском с латинскими эквивалентами
+        self.notes_dict = NOTES_DICT
+        
+        # Интервалы и их характеристики
+        self.intervals = ALL_INTERVALS
+        
+        # Аккорды для упражнения (название, структура, описание)
+        self.chords = CHORDS
+        
+        # Уровни сложности
+        self.difficulty_levels = DIFFICULTY_LEVELS
+        
+        # Движки упражнений: вопрос, проверка и счет без привязки к интерфейсу
+        self.current_difficulty = "Начальный"
+        self.note_engine = NoteExercise(self.note_frequencies)
+        self.interval_engine = IntervalExercise(self.intervals)
+        self.interval_mode_titles = {"up": "Восходящие", "down": "Нисходящие", "harmonic": "Гармонические"}
+        # Расписание интервального повторения загружается при первом включении режима
+        self.interval_scheduler = None
+        self.interval_scheduler_key = None
+        # Ошибки и ответы по вопросам для адаптивного режима (на время работы программы)
+        self.adaptive_counts = {"notes": {}, "intervals": {}, "chords": {}, "dictation": {}, "singing": {}}
+        # Флажки адаптивного режима на экранах упражнений
+        self.adaptive_modes = {}
+        # Журнал всех ответов на диске
+        self.history = self.open_history()
+        # Номер текущего фонового прогрева кэша (новый прогрев отменяет старый)
+        self._warm_up_token = 0
+        self.chord_engine = ChordExercise(self.current_difficulty)
+        self.dictation_engine = DictationExercise()
+        self.dictation_input = []
+        self.singing_engine = SingingExercise()
+        # Кадры высоты тона от потока записи с микрофона; пока поток идет, есть событие остановки
+        self.pitch_queue = queue.Queue()
+        self.listen_stop = None
+        self.singing_hold = (0, 0)
+        # Звучит ли образец ноты (кадры с микрофона в это время отбрасываются)
+        self.singing_reference_playing = False
+        
+        # Для ритмических упражнений
+        self.rhythm_patterns = {
+            "Начальный": [
+                ("♩ ♩ ♩ ♩", "4 четверти, ровный пульс"),
+                ("♩ 𝅗𝅥 ♩", "Четверть - половинная - четверть"),
+                ("𝅗𝅥 ♩ ♩", "Половинная - две четверти"),
+                ("♩ ♩ 𝅗𝅥", "Две четверти - половинная")
+            ],
+            "Средний": [
+                ("♩ ♪♪ ♩ ♪♪", "Четверть - две восьмых - четверть - две восьмых"),
+                ("♪♪ ♩ ♪♪ ♩", "Две восьмых - четверть - две восьмых - четверть"),
+                ("♩ . ♪ ♩ ♪♪", "Четверть с точкой - восьмая - четверть - две восьмых"),
+                ("♪♪ ♪♪ ♩ ♩", "Четыре восьмых - две четверти")
+            ],
+            "Продвинутый": [
+                ("♬♬ ♪ ♩ ♪♪", "Четыре шестнадцатых - восьмая - четверть - две восьмых"),
+                ("♩ ♪ ♬♬ ♪ ♩", "Четверть - восьмая - две шестнадцатых - восьмая - четверть"),
+                ("♪. ♬ ♪ ♩", "Восьмая с точкой - шестнадцатая - восьмая - четверть"),
+                ("♩ ♪ ♪ ♬♬ ♪", "Сложный синкопированный ритм")
+            ]
+        }
+        self.current_rhythm_level = "Начальный"
+        self.current_rhythm = None
+        self.current_rhythm_explanation = None
+        self.metronome_active = False
+        self.metronome_tempo = 120  # BPM
+        self.metronome = Metronome(self.play_metronome_click, tempo=self.metronome_tempo)
+        # До какого момента (по time.perf_counter) звучит последний поставленный рисунок
+        self.rhythm_playing_until = 0.0
+        # Простукивание ритма: текущая попытка и фоновая оценка ударов
+        self.rhythm_take = None
+        self.rhythm_takes = itertools.count(1)
+        # Номер последней попытки: оценки прежних попыток, пришедшие позже, не выводятся
+        self.rhythm_take_id = None
+        self.rhythm_scorer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rhythm-scorer")
+        self.rhythm_results = queue.Queue()
+        
+        # Тексты тем теории после первого открытия и открытые окна тем (по одному на тему)
+        self.topic_texts = {}
+        self.topic_windows = {}
+        self.topic_text_widgets = {}
+        # Индекс поиска по теории строится в фоне при первом открытии раздела
+        self.theory_index = None
+        self.theory_index_thread = None
+        
+        # Экраны строятся при первом показе и дальше только переключаются
+        self.screens = ScreenManager(self.root, self.colors['bg'], on_leave=self.leave_screen)
+        
+        # Создание главного меню
+        self.create_main_menu()
+    
+    def create_main_menu(self):
+        """Создание главного меню"""
+        self.screens.show("main_menu", self.build_main_menu)
+    
+    def build_main_menu(self, screen):
+        """Главное меню: строится один раз"""
+        
+        # Главный контейнер
+        main_container = tk.Frame(screen, bg=self.colors['bg'])
+        main_container.pack(fill=tk.BOTH, expand=True, padx=30, pady=30)
+        
+        # Заголовок
+        title_frame = tk.Frame(main_container, bg=self.colors['bg'])
+        title_frame.pack(pady=(0, 30))
+        
+        title_label = tk.Label(title_frame, text="🎵 Сольфеджио-Про", 
+                              font=self.fonts['title'], bg=self.colors['bg'], 
+                              fg=self.colors['fg'])
+        title_label.pack()
+        
+        subtitle_label = tk.Label(title_frame, text="Обучение музыкальной грамоте", 
+                                 font=self.fonts['normal'], bg=self.colors['bg'], 
+                                 fg=self.colors['accent'])
+        subtitle_label.pack()
+        
+        # Контейнер для кнопок
+        buttons_container = tk.Frame(main_container, bg=self.colors['bg'])
+        buttons_container.pack(pady=20, fill=tk.BOTH, expand=True)
+        
+        # Стиль для кнопок меню
+        menu_buttons_style = {
+            'font': self.fonts['subheading'],
+            'width': 25,
+            'height': 2,
+            'bg': self.colors['accent'],
+            'fg': self.colors['light_bg'],
+            'activebackground': '#2980b9',
+            'activeforeground': 'white',
+            'relief': tk.RAISED,
+            'bd': 0,
+            'cursor': 'hand2'
+        }
+        
+        # Кнопки для выбора раздела
+        theory_btn = tk.Button(buttons_container, text="📚 Музыкальная теория", 
+                              command=self.show_theory, **menu_buttons_style)
+        theory_btn.pack(pady=15)
+        
+        ear_trainer_btn = tk.Button(buttons_container, text="🎧 Тренажер слуха", 
+                                   command=self.show_ear_trainer, **menu_buttons_style)
+        ear_trainer_btn.pack(pady=15)
+        
+        # Нижняя панель
+        bottom_frame = tk.Frame(main_container, bg=self.colors['bg'])
+        bottom_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=20)
+        
+        # Кнопка "О программе"
+        about_btn = tk.Button(bottom_frame, text="ℹ️ О программе", 
+                             font=self.fonts['small'], bg=self.colors['card'], 
+                             fg=self.colors['fg'], padx=15, pady=5,
+                             command=self.show_about, cursor='hand2',
+                             activebackground='#3d566e', activeforeground='white',
+                             relief=tk.RAISED, bd=0)
+        about_btn.pack(side=tk.LEFT)
+        
+        # Версия
+        version_label = tk.Label(bottom_frame, text="v1.0", 
+                                font=self.fonts['small'], bg=self.colors['bg'], 
+                                fg=self.colors['accent'])
+        version_label.pack(side=tk.RIGHT)
+    
+    def show_about(self):
+        """Окно 'О программе'"""
+        about_window = tk.Toplevel(self.root)
+        about_window.title("О программе")
+        about_window.geometry("500x600")
+        about_window.configure(bg=self.colors['light_bg'])
+        about_window.resizable(False, False)
+        about_window.transient(self.root)
+        about_window.grab_set()
+        
+        # Центрирование окна
+        about_window.update_idletasks()
+        x = (about_window.winfo_screenwidth() // 2) - (about_window.winfo_width() // 2)
+        y = (about_window.winfo_screenheight() // 2) - (about_window.winfo_height() // 2)
+        about_window.geometry(f"+{x}+{y}")
+        
+        # Содержание окна "О программе"
+        content_frame = tk.Frame(about_window, bg=self.colors['light_bg'])
+        content_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        
+        # Иконка и заголовок
+        header_frame = tk.Frame(content_frame, bg=self.colors['light_bg'])
+        header_frame.pack(pady=(0, 20))
+        
+        tk.Label(header_frame, text="🎵", font=("Arial", 40), 
+                bg=self.colors['light_bg']).pack()
+        
+        tk.Label(header_frame, text="Сольфеджио-Про", 
+                font=self.fonts['heading'], bg=self.colors['light_bg']).pack()
+        
+        tk.Label(header_frame, text="Версия: 1.0 (build t10e4i1)", 
+                font=self.fonts['small'], bg=self.colors['light_bg'], 
+                fg='#7f8c8d').pack()
+        
+        # Скорость переключения экранов: повторный показ и первое построение
+        switch_stats = self.screens.switch_stats()
+        cached_count, (cached_p50, cached_p99) = switch_stats["cached"]
+        build_count, (build_p50, _) = switch_stats["build"]
+        tk.Label(header_frame, 
+                text=f"Переход между экранами: p50 {cached_p50:.1f} мс, p99 {cached_p99:.1f} мс "
+                     f"({cached_count} повторных), построение p50 {build_p50:.1f} мс ({build_count})", 
+                font=self.fonts['small'], bg=self.colors['light_bg'], 
+                fg='#7f8c8d').pack()
+        
+        # Информация о программе
+        info_frame = tk.Frame(content_frame, bg=self.colors['light_bg'])
+        info_frame.pack(fill=tk.BOTH, expand=True)
+        
+        info_text = """Программа для обучения основам музыкальной грамоты 
+и развития музыкального слуха.
+Функции:
+• Теория музыки (10 тем).
+• Тренажер слуха (6 типов упражнений).
+• Справочная информация.
+• Статистика прогресса."""
+        
+        info_label = tk.Label(info_frame, text=info_text, 
+                             font=self.fonts['normal'], bg=self.colors['light_bg'],
+                             justify=tk.LEFT)
+        info_label.pack(pady=10)
+        
+        # Автор
+        author_frame = tk.Frame(content_frame, bg=self.colors['light_bg'])
+        author_frame.pack(pady=10)
+        
+        tk.Label(author_frame, text="Разработчик: ", 
+                font=self.fonts['normal'], bg=self.colors['light_bg']).pack(side=tk.LEFT)
+        
+        author_link = tk.Label(author_frame, text="OdusseusGVK", 
+                              font=self.fonts['normal'], bg=self.colors['light_bg'],
+                              fg=self.colors['accent'], cursor="hand2")
+        author_link.pack(side=tk.LEFT)
+        author_link.bind("<Button-1>", lambda e: self.open_author_link())
+        
+        # Кнопка закрытия
+        close_btn = tk.Button(content_frame, text="Закрыть", 
+                             font=self.fonts['normal'], bg=self.colors['accent'],
+                             fg='white', padx=30, pady=8,
+                             command=about_window.destroy,
+                             cursor='hand2', relief=tk.RAISED, bd=0,
+                             activebackground='#2980b9', activeforeground='white')
+        close_btn.pack(pady=15)
+    
+    def open_author_link(self):
+        """Открытие ссылки на автора"""
+        webbrowser.open("https://github.com/OdusseusGVK")
+    
+    def show_theory(self):
+        """Раздел музыкальной теории с кнопками тем"""
+        self.screens.show("theory", self.build_theory_screen)
+    
+    def build_theory_screen(self, screen):
+        """Экран раздела теории: строится один раз"""
+        self.start_theory_index()
+        
+        # Заголовок
+        title_frame = tk.Frame(screen, bg=self.colors['bg'])
+        title_frame.pack(pady=(20, 10), fill=tk.X)
+        
+        tk.Label(title_frame, text="📚 Музыкальная теория", 
+                font=self.fonts['title'], bg=self.colors['bg'], 
+                fg=self.colors['fg']).pack()
+        
+        tk.Label(title_frame, text="Выберите тему для изучения:", 
+                font=self.fonts['normal'], bg=self.colors['bg'], 
+                fg=self.colors['accent']).pack()
+        
+        # Поиск по всем темам
+        search_frame = tk.Frame(screen, bg=self.colors['bg'])
+        search_frame.pack(fill=tk.X, padx=50)
+        
+        tk.Label(search_frame, text="🔍 Поиск:", 
+                font=self.fonts['normal'], bg=self.colors['bg'], 
+                fg=self.colors['fg']).pack(side=tk.LEFT, padx=5)
+        
+        self.theory_search_var = tk.StringVar()
+        self.theory_search_var.trace_add("write", lambda *_: self.run_theory_search())
+        tk.Entry(search_frame, textvariable=self.theory_search_var, 
+                font=self.fonts['normal'], width=40).pack(side=tk.LEFT, padx=5)
+        
+        self.theory_search_status = tk.Label(search_frame, text="", 
+                                            font=self.fonts['small'], bg=self.colors['bg'], 
+                                            fg=self.colors['accent'])
+        self.theory_search_status.pack(side=tk.LEFT, padx=10)
+        
+        # Найденные строки; показываются, только пока есть запрос
+        self.theory_search_results = tk.Listbox(screen, font=self.fonts['small'], height=8,
+                                                bg=self.colors['card'], fg=self.colors['fg'],
+                                                selectbackground=self.colors['accent'],
+                                                relief=tk.FLAT, activestyle='none')
+        self.theory_search_results.bind('<<ListboxSelect>>', self.open_theory_hit)
+        self.theory_search_hits = []
+        
+        # Контейнер для кнопок тем
+        topics_container = tk.Frame(screen, bg=self.colors['bg'])
+        topics_container.pack(fill=tk.BOTH, expand=True, padx=40, pady=20)
+        self.theory_topics_container = topics_container
+        
+        # Создаем кнопки для каждой темы учебника; текст читается с диска при открытии
+        for i, (key, topic_name) in enumerate(THEORY_TOPICS):
+            content_func = functools.partial(load_theory_text, key)
+            btn_frame = tk.Frame(topics_container, bg=self.colors['bg'])
+            btn_frame.grid(row=i//3, column=i%3, padx=10, pady=10, sticky="nsew")
+            
+            btn = tk.Button(btn_frame, text=topic_name, 
+                          font=self.fonts['normal'], bg=self.colors['card'],
+                          fg=self.colors['fg'], width=20, height=3,
+                          command=lambda t=topic_name, c=content_func: self.show_topic(t, c),
+                          cursor='hand2', relief=tk.RAISED, bd=0,
+                          activebackground='#3d566e', activeforeground='white')
+            btn.pack(fill=tk.BOTH, expand=True)
+        
+        # Настройка равномерного распределения колонок
+        for i in range(3):
+            topics_container.columnconfigure(i, weight=1)
+        topics_container.rowconfigure(0, weight=1)
+        topics_container.rowconfigure(1, weight=1)
+        topics_container.rowconfigure(2, weight=1)
+        topics_container.rowconfigure(3, weight=1)
+        
+        # Кнопка возврата
+        back_frame = tk.Frame(screen, bg=self.colors['bg'])
+        back_frame.pack(pady=20)
+        
+        back_btn = tk.Button(back_frame, text="← Назад в главное меню", 
+                            font=self.fonts['normal'], bg=self.colors['card'],
+                            fg=self.colors['fg'], padx=20, pady=8,
+                            command=self.create_main_menu, cursor='hand2',
+                            relief=tk.RAISED, bd=0,
+                            activebackground='#3d566e', activeforeground='white')
+        back_btn.pack()
+    
+    def get_topic_text(self, topic_name, content_func):
+        """Текст темы: content_func вызывается только при первом обращении"""
+        content = self.topic_texts.get(topic_name)
+        if content is None:
+            content = self.topic_texts[topic_name] = content_func()
+        return content
+    
+    def show_topic(self, topic_name, content_func):
+        """Показать отдельную тему в отдельном окне (у каждой темы не больше одного окна)"""
+        topic_window = self.topic_windows.get(topic_name)
+        if topic_window is not None and topic_window.winfo_exists():
+            topic_window.deiconify()
+            topic_window.lift()
+            topic_window.focus_force()
+            return
+        
+        try:
+            content = self.get_topic_text(topic_name, content_func)
+        except OSError as error:
+            messagebox.showerror("Музыкальная теория", f"Не удалось загрузить тему: {error}")
+            return
+        topic_window = tk.Toplevel(self.root)
+        self.topic_windows[topic_name] = topic_window
+        topic_window.protocol("WM_DELETE_WINDOW", lambda: self.close_topic(topic_name))
+        topic_window.title(f"Музыкальная теория - {topic_name}")
+        topic_window.geometry("900x700")
+        topic_window.configure(bg=self.colors['light_bg'])
+        topic_window.minsize(800, 600)
+        
+        # Заголовок темы
+        header_frame = tk.Frame(topic_window, bg=self.colors['accent'])
+        header_frame.pack(fill=tk.X, padx=0, pady=0)
+        
+        tk.Label(header_frame, text=topic_name, 
+                font=self.fonts['heading'], bg=self.colors['accent'], 
+                fg='white', padx=20, pady=15).pack()
+        
+        # Текст темы с прокруткой
+        text_frame = tk.Frame(topic_window, bg=self.colors['light_bg'])
+        text_frame.pack(fill=tk.BOTH, expand=True, padx=0, pady=0)
+        
+        # Панель инструментов
+        toolbar = tk.Frame(text_frame, bg=self.colors['light_bg'])
+        toolbar.pack(fill=tk.X, padx=10, pady=10)
+        
+        # Кнопка копирования
+        copy_btn = tk.Button(toolbar, text="📋 Копировать", 
+                           font=self.fonts['small'], bg=self.colors['card'],
+                           fg=self.colors['fg'], command=lambda: self.copy_to_clipboard(content),
+                           cursor='hand2', relief=tk.RAISED, bd=0, padx=10, pady=5,
+                           activebackground='#3d566e', activeforeground='white')
+        copy_btn.pack(side=tk.LEFT)
+        
+        # Кнопка печати
+        print_btn = tk.Button(toolbar, text="🖨️ Печать", 
+                            font=self.fonts['small'], bg=self.colors['card'],
+                            fg=self.colors['fg'], command=lambda: self.print_content(topic_name, content),
+                            cursor='hand2', relief=tk.RAISED, bd=0, padx=10, pady=5,
+                            activebackground='#3d566e', activeforeground='white')
+        print_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Текстовое поле
+        text_container = tk.Frame(text_frame, bg=self.colors['light_bg'])
+        text_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        
+        text_widget = tk.Text(text_container, wrap=tk.WORD, font=("Segoe UI", 11), 
+                             bg='white', fg='#2c3e50', padx=15, pady=15, 
+                             spacing2=3, spacing3=5, relief=tk.FLAT, bd=2)
+        
+        scrollbar = tk.Scrollbar(text_container, command=text_widget.yview,
+                                bg=self.colors['light_bg'])
+        text_widget.config(yscrollcommand=scrollbar.set)
+        
+        # Вставляем текст
+        text_widget.insert(tk.END, content)
+        text_widget.config(state=tk.DISABLED)
+        # Подсветка найденного поиском: все совпадения и выбранная строка
+        text_widget.tag_configure("search_line", background='#d6eaf8')
+        text_widget.tag_configure("search_hit", background='#f9e79f')
+        self.topic_text_widgets[topic_name] = text_widget
+        
+        text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Кнопка закрытия
+        close_frame = tk.Frame(topic_window, bg=self.colors['light_bg'])
+        close_frame.pack(pady=10)
+        
+        close_btn = tk.Button(close_frame, text="Закрыть", 
+                             font=self.fonts['normal'], bg=self.colors['accent'],
+                             fg='white', padx=30, pady=8,
+                             command=lambda: self.close_topic(topic_name), cursor='hand2',
+                             relief=tk.RAISED, bd=0,
+                             activebackground='#2980b9', activeforeground='white')
+        close_btn.pack()
+        
+        # Центрирование окна
+        topic_window.update_idletasks()
+        x = (topic_window.winfo_screenwidth() // 2) - (topic_window.winfo_width() // 2)
+        y = (topic_window.winfo_screenheight() // 2) - (topic_window.winfo_height() // 2)
+        topic_window.geometry(f"+{x}+{y}")
+    
+    def close_topic(self, topic_name):
+        """Закрытие окна темы; текст темы остается в памяти для следующего открытия"""
+        topic_window = self.topic_windows.pop(topic_name, None)
+        self.topic_text_widgets.pop(topic_name, None)
+        if topic_window is not None:
+            topic_window.destroy()
+    
+    def start_theory_index(self):
+        """Загрузка или построение индекса поиска в фоновом потоке (один раз)"""
+        if self.theory_index is None and self.theory_index_thread is None:
+            self.theory_index_thread = threading.Thread(target=self._load_theory_index,
+                                                        name="theory-index", daemon=True)
+            self.theory_index_thread.start()
+    
+    def _load_theory_index(self):
+        try:
+            self.theory_index = load_theory_index()
+        except (OSError, ValueError):
+            traceback.print_exc()
+    
+    def run_theory_search(self):
+        """Поиск по мере набора запроса"""
+        query = self.theory_search_var.get()
+        results = self.theory_search_results
+        if not query.strip():
+            self.theory_search_hits = []
+            results.pack_forget()
+            self.theory_search_status.config(text="")
+            return
+        if self.theory_index is None:
+            if self.theory_index_thread is not None and self.theory_index_thread.is_alive():
+                self.theory_search_status.config(text="Индекс строится...")
+                self.root.after(100, self.run_theory_search)
+            else:
+                self.theory_search_status.config(text="Поиск недоступен")
+            return
+        
+        started = time.perf_counter()
+        self.theory_search_hits = self.theory_index.search(query)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        titles = dict(THEORY_TOPICS)
+        results.delete(0, tk.END)
+        for hit in self.theory_search_hits:
+            results.insert(tk.END, f"{titles[hit['key']]}, строка {hit['line']}: {hit['text'].strip()[:90]}")
+        self.theory_search_status.config(text=f"Найдено: {len(self.theory_search_hits)} ({elapsed_ms:.2f} мс)")
+        if self.theory_search_hits:
+            results.pack(fill=tk.X, padx=50, pady=(5, 0), before=self.theory_topics_container)
+        else:
+            results.pack_forget()
+    
+    def open_theory_hit(self, event=None):
+        """Открытие темы на выбранной находке"""
+        selection = self.theory_search_results.curselection()
+        if not selection or selection[0] >= len(self.theory_search_hits):
+            return
+        hit = self.theory_search_hits[selection[0]]
+        topic_name = dict(THEORY_TOPICS)[hit["key"]]
+        self.show_topic(topic_name, functools.partial(load_theory_text, hit["key"]))
+        self.highlight_topic(topic_name, hit)
+    
+    @staticmethod
+    def text_index(line_number, line, offset):
+        """Индекс Text для позиции в строке: Tcl 8 считает символ вне BMP (эмодзи) за два"""
+        if tk.TclVersion < 9:
+            offset = len(line[:offset].encode('utf-16-le')) // 2
+        return f"{line_number}.{offset}"
+    
+    def highlight_topic(self, topic_name, hit):
+        """Подсветка слов запроса в окне темы и прокрутка к найденной строке"""
+        text_widget = self.topic_text_widgets.get(topic_name)
+        if text_widget is None:
+            return
+        text_widget.tag_remove("search_hit", "1.0", tk.END)
+        text_widget.tag_remove("search_line", "1.0", tk.END)
+        for number, line in enumerate(self.theory_index.lines[hit["key"]], 1):
+            for start, end in match_spans(line, hit["terms"]):
+                text_widget.tag_add("search_hit", self.text_index(number, line, start),
+                                    self.text_index(number, line, end))
+        text_widget.tag_add("search_line", f"{hit['line']}.0", f"{hit['line']}.end")
+        text_widget.see(f"{hit['line']}.0")
+    
+    def copy_to_clipboard(self, text):
+        """Копирование текста в буфер обмена"""
+        self.root.clipboard_clear()
+        self.root.clipboard_append(text)
+        messagebox.showinfo("Копирование", "Текст скопирован в буфер обмена!")
+    
+    def print_content(self, title, content):
+        """Имитация печати"""
+        response = messagebox.askyesno("Печать", "Хотите сохранить текст в файл?")
+        if response:
+            filename = f"{title}.txt"
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(content)
+            messagebox.showinfo("Сохранение", f"Текст сохранен в файл: {filename}")
+    
+    def show_ear_trainer(self):
+        """Тренажер слуха"""
+        self.screens.show("ear_trainer", self.build_ear_trainer_screen)
+    
+    def build_ear_trainer_screen(self, screen):
+        """Экран тренажера слуха: строится один раз"""
         
-        # Стили для виджетов
-        self.style = ttk.Style()
-        self.style.theme_use('clam')
+        # Заголовок
+        title_frame = tk.Frame(screen, bg=self.colors['bg'])
+        title_frame.pack(pady=(20, 10), fill=tk.X)
         
-        # Настройка цветов
-        self.colors = {
-            'bg': '#2c3e50',
-            'fg': '#ecf0f1',
-            'accent': '#3498db',
-            'success': '#2ecc71',
-            'danger': '#e74c3c',
-            'warning': '#f39c12',
-            'card': '#34495e',
-            'light_bg': '#ecf0f1',
-            'dark_bg': '#1a252f'
-        }
+        tk.Label(title_frame, text="🎧 Тренажер слуха", 
+                font=self.fonts['title'], bg=self.colors['bg'], 
+                fg=self.colors['fg']).pack()
         
-        # Настройка шрифтов
-        self.fonts = {
-            'title': ('Segoe UI', 24, 'bold'),
-            'heading': ('Segoe UI', 16, 'bold'),
-            'subheading': ('Segoe UI', 14, 'bold'),
-            'normal': ('Segoe UI', 11),
-            'small': ('Segoe UI', 9)
-        }
+        tk.Label(title_frame, text="Выберите тип упражнения:", 
+                font=self.fonts['normal'], bg=self.colors['bg'], 
+                fg=self.colors['accent']).pack()
         
-        # Частоты для нот (в герцах)
-        self.note_frequencies = {
-            "До": 261.63,    # C4
-            "Ре": 293.66,    # D4
-            "Ми": 329.63,    # E4
-            "Фа": 349.23,    # F4
-            "Соль": 392.00,  # G4
-            "Ля": 440.00,    # A4
-            "Си": 493.88     # B4
-        }
+        # Выбор тембра
+        timbre_frame = tk.Frame(screen, bg=self.colors['bg'])
+        timbre_frame.pack()
         
-        # Словарь для отображения нот на русском с латинскими эквивалентами
-        self.notes_dict = {
-            "До": "C", "Ре": "D", "Ми": "E", 
-            "Фа": "F", "Соль": "G", "Ля": "A", "Си": "B"
-        }
+        tk.Label(timbre_frame, text="Тембр:", 
+                font=self.fonts['normal'], bg=self.colors['bg'], 
+                fg=self.colors['fg']).pack(side=tk.LEFT, padx=5)
         
-        # Интервалы и их характеристики
-        self.intervals = {
-            "Прима (ч.1)": {"semitones": 0, "example": "До-До", "character": "Полное слияние"},
-            "Малая секунда (м.2)": {"semitones": 1, "example": "До-Ре♭", "character": "Напряженно"},
-            "Большая секунда (б.2)": {"semitones": 2, "example": "До-Ре", "character": "Уверенно"},
-            "Малая терция (м.3)": {"semitones": 3, "example": "До-Ми♭", "character": "Грустно"},
-            "Большая терция (б.3)": {"semitones": 4, "example": "До-Ми", "character": "Радостно"},
-            "Чистая кварта (ч.4)": {"semitones": 5, "example": "До-Фа", "character": "Устойчиво"},
-            "Тритон (ув.4/ум.5)": {"semitones": 6, "example": "До-Фа♯/Соль♭", "character": "Драматично"},
-            "Чистая квинта (ч.5)": {"semitones": 7, "example": "До-Соль", "character": "Благозвучно"},
-            "Малая секста (м.6)": {"semitones": 8, "example": "До-Ля♭", "character": "Лирично"},
-            "Большая секста (б.6)": {"semitones": 9, "example": "До-Ля", "character": "Восторженно"},
-            "Малая септима (м.7)": {"semitones": 10, "example": "До-Си♭", "character": "Напряженно"},
-            "Большая септима (б.7)": {"semitones": 11, "example": "До-Си", "character": "Резко"},
-            "Чистая октава (ч.8)": {"semitones": 12, "example": "До-До", "character": "Полное слияние"}
-        }
+        self.timbre_var = tk.StringVar(value=self.synth.timbre)
+        for timbre, preset in TIMBRE_PRESETS.items():
+            tk.Radiobutton(timbre_frame, text=preset["title"], 
+                          variable=self.timbre_var, value=timbre,
+                          font=self.fonts['small'], bg=self.colors['bg'],
+                          fg=self.colors['fg'], selectcolor=self.colors['accent'],
+                          activebackground=self.colors['bg'],
+                          activeforeground=self.colors['fg'],
+                          command=self.change_timbre).pack(side=tk.LEFT, padx=5)
+        
+        # Настройка строя и диапазона
+        tuning_frame = tk.Frame(screen, bg=self.colors['bg'])
+        tuning_frame.pack(pady=5)
+        
+        tk.Label(tuning_frame, text="A4 (Гц):", 
+                font=self.fonts['normal'], bg=self.colors['bg'], 
+                fg=self.colors['fg']).pack(side=tk.LEFT, padx=5)
         
-        # Аккорды для упражнения (название, структура, описание)
-        self.chords = {
-            "Мажорное трезвучие": {
-                "structure": "б.3 + м.3",
-                "example": "До-Ми-Соль",
-                "character": "Радостно, светло",
-                "semitones": [0, 4, 7]
-            },
-            "Минорное трезвучие": {
-                "structure": "м.3 + б.3",
-                "example": "До-Ми♭-Соль",
-                "character": "Грустно, темно",
-                "semitones": [0, 3, 7]
-            },
-            "Увеличенное трезвучие": {
-                "structure": "б.3 + б.3",
-                "example": "До-Ми-Соль♯",
-                "character": "Загадочно, напряженно",
-                "semitones": [0, 4, 8]
-            },
-            "Уменьшенное трезвучие": {
-                "structure": "м.3 + м.3",
-                "example": "До-Ми♭-Соль♭",
-                "character": "Тревожно, неустойчиво",
-                "semitones": [0, 3, 6]
-            },
-            "Большой мажорный септаккорд": {
-                "structure": "маж.трезв. + б.3",
-                "example": "До-Ми-Соль-Си",
-                "character": "Ярко, мечтательно",
-                "semitones": [0, 4, 7, 11]
-            },
-            "Малый мажорный септаккорд": {
-                "structure": "маж.трезв. + м.3",
-                "example": "До-Ми-Соль-Си♭",
-                "character": "Напряженно, ожидаемо",
-                "semitones": [0, 4, 7, 10]
-            },
-            "Малый минорный септаккорд": {
-                "structure": "мин.трезв. + м.3",
-                "example": "До-Ми♭-Соль-Си♭",
-                "character": "Лирично, меланхолично",
-                "semitones": [0, 3, 7, 10]
-            },
-            "Уменьшенный септаккорд": {
-                "structure": "ум.трезв. + м.3",
-                "example": "До-Ми♭-Соль♭-Си♭♭",
-                "character": "Тайнственно, драматично",
-                "semitones": [0, 3, 6, 9]
-            }
-        }
+        self.a4_var = tk.StringVar(value=f"{self.pitch_table.a4:g}")
+        tk.Spinbox(tuning_frame, from_=415, to=466, increment=1, width=5,
+                  textvariable=self.a4_var, font=self.fonts['small'],
+                  command=self.change_tuning).pack(side=tk.LEFT, padx=5)
         
-        # Уровни сложности
-        self.difficulty_levels = {
-            "Начальный": ["Мажорное трезвучие", "Минорное трезвучие"],
-            "Средний": ["Мажорное трезвучие", "Минорное трезвучие", 
-                       "Увеличенное трезвучие", "Уменьшенное трезвучие"],
-            "Продвинутый": list(self.chords.keys())
-        }
+        tk.Label(tuning_frame, text="Строй:", 
+                font=self.fonts['normal'], bg=self.colors['bg'], 
+                fg=self.colors['fg']).pack(side=tk.LEFT, padx=5)
         
-        # Для упражнения по определению аккордов
-        self.current_chord = None
-        self.current_base_note = None
-        self.current_difficulty = "Начальный"
-        self.chord_score = 0
-        self.chord_attempts = 0
-        self.chord_game_active = False
+        temperament_titles = [info["title"] for info in TEMPERAMENTS.values()]
+        self.temperament_var = tk.StringVar(value=TEMPERAMENTS[self.pitch_table.temperament]["title"])
+        temperament_menu = tk.OptionMenu(tuning_frame, self.temperament_var, *temperament_titles,
+                                         command=lambda _: self.change_tuning())
+        temperament_menu.config(font=self.fonts['small'], bg=self.colors['card'],
+                                fg=self.colors['fg'], relief=tk.FLAT, bd=0,
+                                activebackground='#3d566e', activeforeground='white')
+        temperament_menu.pack(side=tk.LEFT, padx=5)
+        
+        self.extended_roots_var = tk.BooleanVar(value=self.extended_roots)
+        tk.Checkbutton(tuning_frame, text="Все октавы и черные клавиши",
+                      variable=self.extended_roots_var, font=self.fonts['small'],
+                      bg=self.colors['bg'], fg=self.colors['fg'],
+                      selectcolor=self.colors['accent'],
+                      activebackground=self.colors['bg'],
+                      activeforeground=self.colors['fg'],
+                      command=self.change_tuning).pack(side=tk.LEFT, padx=10)
         
-        # Для упражнения по определению нот
-        self.game_active = False
-        self.score = 0
-        self.total_attempts = 0
-        self.current_note = None
+        # Контейнер для упражнений
+        exercises_container = tk.Frame(screen, bg=self.colors['bg'])
+        exercises_container.pack(fill=tk.BOTH, expand=True, padx=50, pady=30)
         
-        # Для упражнения по определению интервалов
-        self.interval_game_active = False
-        self.interval_score = 0
-        self.interval_attempts = 0
-        self.current_interval = None
-        self.current_base_note_interval = None
+        # Упражнения
+        exercises = [
+            ("🎵 Определение нот", self.note_recognition_exercise),
+            ("📐 Определение интервалов", self.interval_recognition_exercise),
+            ("🎹 Определение аккордов", self.chord_recognition_exercise),
+            ("⏱️ Ритмические упражнения", self.rhythm_exercise),
+            ("✍️ Мелодический диктант", self.dictation_exercise),
+            ("🎤 Пение нот", self.singing_exercise)
+        ]
         
-        # Для ритмических упражнений
-        self.rhythm_patterns = {
-            "Начальный": [
-                ("♩ ♩ ♩ ♩", "4 четверти, ровный пульс"),
-                ("♩ 𝅗𝅥 ♩", "Четверть - половинная - четверть"),
-                ("𝅗𝅥 ♩ ♩", "Половинная - две четверти"),
-                ("♩ ♩ 𝅗𝅥", "Две четверти - половинная")
-            ],
-            "Средний": [
-                ("♩ ♪♪ ♩ ♪♪", "Четверть - две восьмых - четверть - две восьмых"),
-                ("♪♪ ♩ ♪♪ ♩", "Две восьмых - четверть - две восьмых - четверть"),
-                ("♩ . ♪ ♩ ♪♪", "Четверть с точкой - восьмая - четверть - две восьмых"),
-                ("♪♪ ♪♪ ♩ ♩", "Четыре восьмых - две четверти")
-            ],
-            "Продвинутый": [
-                ("♬♬ ♪ ♩ ♪♪", "Четыре шестнадцатых - восьмая - четверть - две восьмых"),
-                ("♩ ♪ ♬♬ ♪ ♩", "Четверть - восьмая - две шестнадцатых - восьмая - четверть"),
-                ("♪. ♬ ♪ ♩", "Восьмая с точкой - шестнадцатая - восьмая - четверть"),
-                ("♩ ♪ ♪ ♬♬ ♪", "Сложный синкопированный ритм")
-            ]
-        }
-        self.current_rhythm_level = "Начальный"
-        self.current_rhythm = None
-        self.current_rhythm_explanation = None
-        self.metronome_active = False
-        self.metronome_tempo = 120  # BPM
-        self.metronome_thread = None
+        for text, command in exercises:
+            btn_frame = tk.Frame(exercises_container, bg=self.colors['bg'])
+            btn_frame.pack(pady=10)
+            
+            btn = tk.Button(btn_frame, text=text, font=self.fonts['subheading'],
+                          bg=self.colors['accent'], fg='white', width=30, height=2,
+                          command=command, cursor='hand2', relief=tk.RAISED, bd=0,
+                          activebackground='#2980b9', activeforeground='white')
+            btn.pack(fill=tk.BOTH, expand=True)
         
-        # Создание главного меню
-        self.create_main_menu()
-    
-    def create_main_menu(self):
-        """Создание главного меню"""
-        self.clear_window()
+        # Кнопка возврата
+        back_frame = tk.Frame(screen, bg=self.colors['bg'])
+        back_frame.pack(pady=20)
         
-        # Главный контейнер
-        main_container = tk.Frame(self.root, bg=self.colors['bg'])
-        main_container.pack(fill=tk.BOTH, expand=True, padx=30, pady=30)
+        back_btn = tk.Button(back_frame, text="← Назад в главное меню", 
+                            font=self.fonts['normal'], bg=self.colors['card'],
+                            fg=self.colors['fg'], padx=20, pady=8,
+                            command=self.create_main_menu, cursor='hand2',
+                            relief=tk.RAISED, bd=0,
+                            activebackground='#3d566e', activeforeground='white')
+        back_btn.pack()
+    
+    def get_audio_backend(self):
+        """Вывод звука, создаваемый при первом обращении (из любого потока, но только один раз)"""
+        if self.audio_backend is None:
+            with self.audio_backend_lock:
+                if self.audio_backend is None:
+                    self.audio_backend = create_audio_backend()
+        return self.audio_backend
+    
+    def output_pcm(self, buffer, cancel_event):
+        """Вывод PCM-буфера или потока блоков (вызывается из потока воспроизведения)"""
+        backend = self.get_audio_backend()
+        if isinstance(buffer, np.ndarray):
+            backend.play(buffer, self.synth.sample_rate, cancel_event)
+        else:
+            backend.play_stream(buffer, self.synth.sample_rate, cancel_event)
+    
+    def play_stream(self, events, priority=AudioWorker.PRIORITY_NORMAL, interrupt=True, on_done=None):
+        """Потоковое воспроизведение длинной последовательности событий
+        (частота, начало_мс, длительность_мс): звук начинается с первого блока"""
+        blocks = self.synth.stream_int16(self.synth.stream_events(events))
+        self.play_buffer(blocks, priority, interrupt, on_done)
+    
+    def play_scale(self, duration=400, gap=50):
+        """Гамма до мажор вверх от До первой октавы до До второй"""
+        frequencies = list(self.note_frequencies.values())
+        frequencies.append(frequencies[0] * 2)
+        step = duration + gap
+        self.play_stream((freq, i * step, duration) for i, freq in enumerate(frequencies))
+    
+    def play_buffer(self, buffer, priority=AudioWorker.PRIORITY_NORMAL, interrupt=True, on_done=None):
+        """Воспроизведение готового PCM-буфера через поток воспроизведения"""
+        if interrupt:
+            self.audio_worker.cancel()
+        self.audio_worker.submit(buffer, priority, on_done=on_done)
+    
+    def play_question(self, engine, buffer, on_done=None):
+        """Воспроизведение вопроса упражнения; время реакции отсчитывается от конца звучания
         
-        # Заголовок
-        title_frame = tk.Frame(main_container, bg=self.colors['bg'])
-        title_frame.pack(pady=(0, 30))
+        on_done(finished_ns) вызывается в потоке воспроизведения после отметки конца звучания.
+        """
+        round_id = engine.round
         
-        title_label = tk.Label(title_frame, text="🎵 Сольфеджио-Про", 
-                              font=self.fonts['title'], bg=self.colors['bg'], 
-                              fg=self.colors['fg'])
-        title_label.pack()
+        def presented(finished_ns):
+            engine.mark_presented(round_id, finished_ns)
+            if on_done is not None:
+                on_done(finished_ns)
         
-        subtitle_label = tk.Label(title_frame, text="Обучение музыкальной грамоте", 
-                                 font=self.fonts['normal'], bg=self.colors['bg'], 
-                                 fg=self.colors['accent'])
-        subtitle_label.pack()
+        self.play_buffer(buffer, on_done=presented)
+    
+    def play_feedback_sound(self, correct):
+        """Звуковой сигнал после ответа: высокий - верно, низкий - ошибка"""
+        frequency, duration = (800, 300) if correct else (400, 500)
+        buffer = self._cached_render([frequency], ("note", duration))
+        self.play_buffer(buffer, priority=AudioWorker.PRIORITY_FEEDBACK)
+    
+    def _render_key(self, frequencies, layout):
+        return (tuple(round(f, 3) for f in frequencies), layout, self.synth.timbre)
+    
+    def _cached_render(self, frequencies, layout):
+        """Буфер из кэша по ключу (частоты, длительность/раскладка, тембр)"""
+        return self.waveform_cache.get_or_render(
+            self._render_key(frequencies, layout),
+            lambda: self.synth.to_int16(self.synth.render_layout(frequencies, layout)))
+    
+    def _cached_render_batch(self, requests, voices=None):
+        """Дозаполнение кэша пакетом (частоты, раскладка): синтезируются только промахи"""
+        missing = [(self._render_key(frequencies, layout), (frequencies, layout))
+                   for frequencies, layout in requests
+                   if not self.waveform_cache.contains(self._render_key(frequencies, layout))]
+        buffers = self.synth.render_batch([request for _, request in missing], voices)
+        for (key, _), buffer in zip(missing, buffers):
+            self.waveform_cache.put(key, buffer)
+        return len(missing)
+    
+    def render_note_buffer(self, note_name, duration=1000):
+        """Буфер для ноты"""
+        frequency = self.note_frequencies[note_name]
+        return self._cached_render([frequency], ("note", duration))
+    
+    def interval_request(self, root, interval_name, mode="up"):
+        """Частоты и раскладка интервала; root - номер MIDI нижней ноты"""
+        semitones = self.intervals[interval_name]["semitones"]
+        frequencies = self.pitch_table.chord(root, [0, semitones])
+        if mode == "harmonic":
+            return frequencies, HARMONIC_INTERVAL_LAYOUT
+        if mode == "down":
+            frequencies.reverse()
+        return frequencies, INTERVAL_LAYOUT
+    
+    def render_interval_buffer(self, root, interval_name, mode="up"):
+        """Буфер для интервала: две ноты вверх, вниз или одновременно"""
+        return self._cached_render(*self.interval_request(root, interval_name, mode))
+    
+    def chord_request(self, root, chord_name, arpeggio=True, inversion=0, voicing="close"):
+        """Частоты и раскладка аккорда в заданном обращении и расположении"""
+        semitones = tuple(self.chords[chord_name]["semitones"])
+        notes = next(notes for number, _, notes in chord_voicings(semitones, root, inversion + 1, (voicing,))
+                     if number == inversion)
+        frequencies = self.pitch_table.lookup(notes).tolist()
+        return frequencies, ARPEGGIO_LAYOUT if arpeggio else BLOCK_CHORD_LAYOUT
+    
+    def render_chord_buffer(self, root, chord_name, arpeggio=True, inversion=0, voicing="close"):
+        """Буфер для аккорда (арпеджио или одновременно); root - номер MIDI основного тона"""
+        return self._cached_render(*self.chord_request(root, chord_name, arpeggio, inversion, voicing))
+    
+    def set_tuning(self, a4=None, temperament=None):
+        """Смена частоты A4 и/или строя: таблица высот строится заново один раз"""
+        a4 = self.pitch_table.a4 if a4 is None else a4
+        temperament = temperament or self.pitch_table.temperament
+        self.pitch_table = PitchTable(a4, temperament)
+        self.note_frequencies = {note: self.pitch_table.frequency(midi)
+                                 for note, midi in WHITE_KEYS.items()}
+    
+    def root_choices(self, max_semitones):
+        """Возможные корни: белые клавиши первой октавы или все клавиши всех октав"""
+        if self.extended_roots:
+            return list(range(PitchTable.LOWEST, PitchTable.HIGHEST - max_semitones + 1))
+        return list(WHITE_KEYS.values())
+    
+    def warm_up_note_cache(self):
+        """Заполнение кэша всеми нотами упражнения"""
+        for note in self.note_frequencies:
+            self.render_note_buffer(note)
+    
+    def warm_up_interval_cache(self):
+        """Заполнение кэша интервалами включенных режимов от корней первой октавы
+        
+        Синтез идет пакетами в простоях главного цикла, поэтому смена режима
+        не задерживает интерфейс. Во всем диапазоне корней банк не прогревается;
+        тогда буфер готовится в начале раунда.
+        """
+        if self.extended_roots:
+            self._warm_up_token += 1
+            return
+        roots = set(self.root_choices(0))
+        requests = [self.interval_request(root, name, mode)
+                    for name, root, mode in self.interval_engine.bank() if root in roots]
+        # Самая длинная раскладка - мелодический интервал
+        self.schedule_warm_up(requests, 2 * INTERVAL_LAYOUT[1] + INTERVAL_LAYOUT[2])
+    
+    def schedule_warm_up(self, requests, longest_ms):
+        """Фоновый прогрев кэша пакетами; requests идут по убыванию важности
+        
+        Кэш увеличивается так, чтобы банк занимал не больше половины объема. Банки
+        упражнений во всех уровнях сложности помещаются в предельный объем кэша;
+        если банк все же больше, прогревается его начало.
+        """
+        self._warm_up_token += 1
+        buffer_bytes = 2 * self.synth.ms_to_samples(longest_ms)
+        capacity = self.waveform_cache.reserve(2 * buffer_bytes * len(requests))
+        requests = requests[:capacity // 2 // buffer_bytes]
+        self._warm_up_step(self._warm_up_token, requests, 0, {})
+    
+    def _warm_up_step(self, token, requests, start, voices):
+        """Один пакет фонового прогрева; устаревший прогрев прекращается"""
+        if token != self._warm_up_token or start >= len(requests):
+            return
+        end = start + self.WARM_UP_BATCH
+        self._cached_render_batch(requests[start:end], voices)
+        self.root.after(1, self._warm_up_step, token, requests, end, voices)
+    
+    def warm_up_chord_cache(self):
+        """Заполнение кэша аккордами текущего уровня сложности в выбранном режиме (в фоне)
+        
+        Оба режима продвинутого уровня вместе не помещаются в кэш, поэтому при смене
+        режима кэш прогревается заново.
+        """
+        if self.extended_roots:
+            self._warm_up_token += 1
+            return
+        roots = set(self.root_choices(0))
+        arpeggio = not self.chord_harmonic.get()
+        requests = [self.chord_request(root, name, arpeggio, inversion, voicing)
+                    for name, root, inversion, voicing in self.chord_engine.bank() if root in roots]
+        longest_ms = 4 * sum(ARPEGGIO_LAYOUT[1:]) if arpeggio else BLOCK_CHORD_LAYOUT[1]
+        self.schedule_warm_up(requests, longest_ms)
+    
+    def change_chord_playback(self):
+        """Смена режима звучания аккордов: прогрев кэша под новый режим"""
+        if self.chord_engine.active:
+            self.warm_up_chord_cache()
+    
+    def change_tuning(self):
+        """Применение настроек A4, строя и диапазона корней из тренажера слуха"""
+        try:
+            a4 = float(self.a4_var.get())
+        except ValueError:
+            a4 = self.pitch_table.a4
+        title = self.temperament_var.get()
+        temperament = next(key for key, info in TEMPERAMENTS.items() if info["title"] == title)
+        self.set_tuning(a4, temperament)
+        self.extended_roots = self.extended_roots_var.get()
+    
+    def change_timbre(self):
+        """Смена тембра; буферы других тембров остаются в кэше под своими ключами"""
+        self.synth.timbre = self.timbre_var.get()
+    
+    def play_note_sound(self, note_name, duration=1000):
+        """Воспроизведение звука ноты"""
+        if note_name in self.note_frequencies:
+            self.play_buffer(self.render_note_buffer(note_name, duration))
+    
+    def play_interval_sound(self, base_note, interval_name, mode="up"):
+        """Воспроизведение интервала (мелодически или гармонически)"""
+        if interval_name in self.intervals:
+            self.play_buffer(self.render_interval_buffer(base_note, interval_name, mode))
+    
+    def play_current_note(self):
+        """Нота текущего раунда"""
+        if self.note_engine.current is not None:
+            self.play_question(self.note_engine, self.render_note_buffer(self.note_engine.current))
+    
+    def play_current_interval(self):
+        """Интервал текущего раунда"""
+        if self.interval_engine.current is not None:
+            interval_name, root, mode = self.interval_engine.current
+            self.play_question(self.interval_engine,
+                               self.render_interval_buffer(root, interval_name, mode))
+    
+    def play_current_chord(self):
+        """Аккорд текущего раунда в выбранном режиме (арпеджио или одновременно)"""
+        if self.chord_engine.current is not None:
+            chord_name, root, inversion, voicing = self.chord_engine.current
+            self.play_question(self.chord_engine, self.render_chord_buffer(
+                root, chord_name, not self.chord_harmonic.get(), inversion, voicing))
+    
+    def play_chord_sound(self, base_note, chord_name, arpeggio=True):
+        """Воспроизведение аккорда"""
+        if chord_name in self.chords:
+            self.play_buffer(self.render_chord_buffer(base_note, chord_name, arpeggio))
+    
+    def show_note_reference(self):
+        """Показать справочную информацию по нотам"""
+        ref_window = tk.Toplevel(self.root)
+        ref_window.title("Справка: Ноты и частоты")
+        ref_window.geometry("500x400")
+        ref_window.configure(bg=self.colors['light_bg'])
         
-        # Контейнер для кнопок
-        buttons_container = tk.Frame(main_container, bg=self.colors['bg'])
-        buttons_container.pack(pady=20, fill=tk.BOTH, expand=True)
+        # Заголовок
+        header = tk.Frame(ref_window, bg=self.colors['accent'])
+        header.pack(fill=tk.X)
+        tk.Label(header, text="Частоты нот (первая октава)", 
+                font=self.fonts['subheading'], bg=self.colors['accent'], 
+                fg='white', padx=20, pady=10).pack()
         
-        # Стиль для кнопок меню
-        menu_buttons_style = {
-            'font': self.fonts['subheading'],
-            'width': 25,
-            'height': 2,
-            'bg': self.colors['accent'],
-            'fg': self.colors['light_bg'],
-            'activebackground': '#2980b9',
-            'activeforeground': 'white',
-            'relief': tk.RAISED,
-            'bd': 0,
-            'cursor': 'hand2'
-        }
+        # Содержимое
+        content = tk.Frame(ref_window, bg=self.colors['light_bg'])
+        content.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
-        # Кнопки для выбора раздела
-        theory_btn = tk.Button(buttons_container, text="📚 Музыкальная теория", 
-                              command=self.show_theory, **menu_buttons_style)
-        theory_btn.pack(pady=15)
+        # Таблица частот
+        table_frame = tk.Frame(content, bg='white', relief=tk.SUNKEN, bd=1)
+        table_frame.pack(fill=tk.BOTH, expand=True)
         
-        ear_trainer_btn = tk.Button(buttons_container, text="🎧 Тренажер слуха", 
-                                   command=self.show_ear_trainer, **menu_buttons_style)
-        ear_trainer_btn.pack(pady=15)
+        # Заголовки таблицы
+        headers = ["Нота (рус.)", "Нота (лат.)", "Частота (Гц)"]
+        for col, header in enumerate(headers):
+            tk.Label(table_frame, text=header, font=self.fonts['normal'], 
+                    bg=self.colors['card'], fg='white', 
+                    padx=10, pady=5).grid(row=0, column=col, sticky="ew", padx=1, pady=1)
         
-        # Нижняя панель
-        bottom_frame = tk.Frame(main_container, bg=self.colors['bg'])
-        bottom_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=20)
+        # Данные таблицы
+        for row, (note_ru, freq) in enumerate(self.note_frequencies.items(), start=1):
+            note_lat = self.notes_dict[note_ru]
+            
+            # Чередование цветов строк
+            bg_color = '#f8f9fa' if row % 2 == 0 else 'white'
+            
+            tk.Label(table_frame, text=note_ru, font=self.fonts['normal'], 
+                    bg=bg_color, padx=10, pady=5).grid(row=row, column=0, sticky="ew", padx=1, pady=1)
+            tk.Label(table_frame, text=note_lat, font=self.fonts['normal'], 
+                    bg=bg_color, padx=10, pady=5).grid(row=row, column=1, sticky="ew", padx=1, pady=1)
+            tk.Label(table_frame, text=f"{freq:.2f}", font=self.fonts['normal'], 
+                    bg=bg_color, padx=10, pady=5).grid(row=row, column=2, sticky="ew", padx=1, pady=1)
         
-        # Кнопка "О программе"
-        about_btn = tk.Button(bottom_frame, text="ℹ️ О программе", 
-                             font=self.fonts['small'], bg=self.colors['card'], 
-                             fg=self.colors['fg'], padx=15, pady=5,
-                             command=self.show_about, cursor='hand2',
-                             activebackground='#3d566e', activeforeground='white',
-                             relief=tk.RAISED, bd=0)
-        about_btn.pack(side=tk.LEFT)
+        # Настройка веса колонок
+        for i in range(3):
+            table_frame.columnconfigure(i, weight=1)
         
-        # Версия
-        version_label = tk.Label(bottom_frame, text="v1.0", 
-                                font=self.fonts['small'], bg=self.colors['bg'], 
-                                fg=self.colors['accent'])
-        version_label.pack(side=tk.RIGHT)
+        # Прослушивание гаммы
+        tk.Button(content, text="▶ Проиграть гамму", 
+                 font=self.fonts['small'], bg=self.colors['card'],
+                 fg=self.colors['fg'], command=self.play_scale,
+                 cursor='hand2', relief=tk.RAISED, bd=0, padx=15, pady=5,
+                 activebackground='#3d566e', activeforeground='white').pack(pady=10)
     
-    def show_about(self):
-        """Окно 'О программе'"""
-        about_window = tk.Toplevel(self.root)
-        about_window.title("О программе")
-        about_window.geometry("500x600")
-        about_window.configure(bg=self.colors['light_bg'])
-        about_window.resizable(False, False)
-        about_window.transient(self.root)
-        about_window.grab_set()
+    def show_response_times(self, engine, title):
+        """Перцентили времени реакции (от конца звучания до правильного ответа) по каждому ответу"""
+        times_window = tk.Toplevel(self.root)
+        times_window.title("Время реакции")
+        times_window.geometry("600x450")
+        times_window.configure(bg=self.colors['light_bg'])
         
-        # Центрирование окна
-        about_window.update_idletasks()
-        x = (about_window.winfo_screenwidth() // 2) - (about_window.winfo_width() // 2)
-        y = (about_window.winfo_screenheight() // 2) - (about_window.winfo_height() // 2)
-        about_window.geometry(f"+{x}+{y}")
+        # Заголовок
+        header = tk.Frame(times_window, bg=self.colors['accent'])
+        header.pack(fill=tk.X)
+        tk.Label(header, text=f"Время реакции: определение {title}", 
+                font=self.fonts['subheading'], bg=self.colors['accent'], 
+                fg='white', padx=20, pady=10).pack()
         
-        # Содержание окна "О программе"
-        content_frame = tk.Frame(about_window, bg=self.colors['light_bg'])
-        content_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        # Содержимое
+        content = tk.Frame(times_window, bg=self.colors['light_bg'])
+        content.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
-        # Иконка и заголовок
-        header_frame = tk.Frame(content_frame, bg=self.colors['light_bg'])
-        header_frame.pack(pady=(0, 20))
+        percentiles = engine.response_percentiles()
+        if not percentiles:
+            tk.Label(content, text="Пока нет правильных ответов в этом сеансе", font=self.fonts['normal'],
+                    bg=self.colors['light_bg']).pack(pady=20)
+            return
         
-        tk.Label(header_frame, text="🎵", font=("Arial", 40), 
-                bg=self.colors['light_bg']).pack()
+        table_frame = tk.Frame(content, bg='white', relief=tk.SUNKEN, bd=1)
+        table_frame.pack(fill=tk.BOTH, expand=True)
         
-        tk.Label(header_frame, text="Сольфеджио-Про", 
-                font=self.fonts['heading'], bg=self.colors['light_bg']).pack()
+        headers = ["Ответ", "Ответов", "p50, с", "p90, с", "p99, с"]
+        for col, text in enumerate(headers):
+            tk.Label(table_frame, text=text, font=self.fonts['normal'], 
+                    bg=self.colors['card'], fg='white', 
+                    padx=10, pady=5).grid(row=0, column=col, sticky="ew", padx=1, pady=1)
         
-        tk.Label(header_frame, text="Версия: 1.0 (build t10e4i1)", 
-                font=self.fonts['small'], bg=self.colors['light_bg'], 
-                fg='#7f8c8d').pack()
+        # Сначала самые медленные: долгий ответ чаще означает угадывание, а не узнавание
+        rows = sorted(percentiles.items(), key=lambda entry: entry[1][1][0], reverse=True)
+        for row, (answer, (count, values)) in enumerate(rows, start=1):
+            bg_color = '#f8f9fa' if row % 2 == 0 else 'white'
+            cells = [answer, str(count)] + [f"{value / 1000:.2f}" for value in values]
+            for col, text in enumerate(cells):
+                tk.Label(table_frame, text=text, font=self.fonts['small'], 
+                        bg=bg_color, padx=10, pady=3).grid(row=row, column=col, sticky="ew", padx=1, pady=1)
         
-        # Информация о программе
-        info_frame = tk.Frame(content_frame, bg=self.colors['light_bg'])
-        info_frame.pack(fill=tk.BOTH, expand=True)
+        for i in range(len(headers)):
+            table_frame.columnconfigure(i, weight=1)
+    
+    def show_interval_reference(self):
+        """Показать справочную информацию по интервалам"""
+        ref_window = tk.Toplevel(self.root)
+        ref_window.title("Справка: Интервалы")
+        ref_window.geometry("700x500")
+        ref_window.configure(bg=self.colors['light_bg'])
         
-        info_text = """Программа для обучения основам музыкальной грамоты 
-и развития музыкального слуха.
-Функции:
-• Теория музыки (10 тем).
-• Тренажер слуха (4 типа упражнений).
-• Справочная информация.
-• Статистика прогресса."""
+        # Заголовок
+        header = tk.Frame(ref_window, bg=self.colors['accent'])
+        header.pack(fill=tk.X)
+        tk.Label(header, text="Характеристики интервалов", 
+                font=self.fonts['subheading'], bg=self.colors['accent'], 
+                fg='white', padx=20, pady=10).pack()
         
-        info_label = tk.Label(info_frame, text=info_text, 
-                             font=self.fonts['normal'], bg=self.colors['light_bg'],
-                             justify=tk.LEFT)
-        info_label.pack(pady=10)
+        # Содержимое
+        content = tk.Frame(ref_window, bg=self.colors['light_bg'])
+        content.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # Автор
-        author_frame = tk.Frame(content_frame, bg=self.colors['light_bg'])
-        author_frame.pack(pady=10)
+        # Создаем Treeview для таблицы
+        tree_frame = tk.Frame(content, bg=self.colors['light_bg'])
+        tree_frame.pack(fill=tk.BOTH, expand=True)
         
-        tk.Label(author_frame, text="Разработчик: ", 
-                font=self.fonts['normal'], bg=self.colors['light_bg']).pack(side=tk.LEFT)
+        tree_scroll = tk.Scrollbar(tree_frame)
+        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         
-        author_link = tk.Label(author_frame, text="OdusseusGVK", 
-                              font=self.fonts['normal'], bg=self.colors['light_bg'],
-                              fg=self.colors['accent'], cursor="hand2")
-        author_link.pack(side=tk.LEFT)
-        author_link.bind("<Button-1>", lambda e: self.open_author_link())
+        tree = ttk.Treeview(tree_frame, yscrollcommand=tree_scroll.set, 
+                           selectmode="extended", height=15)
+        tree.pack(fill=tk.BOTH, expand=True)
+        tree_scroll.config(command=tree.yview)
         
-        # Кнопка закрытия
-        close_btn = tk.Button(content_frame, text="Закрыть", 
-                             font=self.fonts['normal'], bg=self.colors['accent'],
-                             fg='white', padx=30, pady=8,
-                             command=about_window.destroy,
-                             cursor='hand2', relief=tk.RAISED, bd=0,
-                             activebackground='#2980b9', activeforeground='white')
-        close_btn.pack(pady=15)
-    
-    def open_author_link(self):
-        """Открытие ссылки на автора"""
-        webbrowser.open("https://github.com/OdusseusGVK")
-    
-    def show_theory(self):
-        """Раздел музыкальной теории с кнопками тем"""
-        self.clear_window()
+        # Определяем колонки
+        tree['columns'] = ("interval", "semitones", "example", "character")
+        tree.column("#0", width=0, stretch=tk.NO)
+        tree.column("interval", anchor=tk.W, width=200)
+        tree.column("semitones", anchor=tk.CENTER, width=100)
+        tree.column("example", anchor=tk.W, width=150)
+        tree.column("character", anchor=tk.W, width=250)
         
-        # Заголовок
-        title_frame = tk.Frame(self.root, bg=self.colors['bg'])
-        title_frame.pack(pady=(20, 10), fill=tk.X)
+        # Заголовки
+        tree.heading("#0", text="", anchor=tk.W)
+        tree.heading("interval", text="Интервал", anchor=tk.W)
+        tree.heading("semitones", text="Полутоны", anchor=tk.CENTER)
+        tree.heading("example", text="Пример от До", anchor=tk.W)
+        tree.heading("character", text="Характер звучания", anchor=tk.W)
         
-        tk.Label(title_frame, text="📚 Музыкальная теория", 
-                font=self.fonts['title'], bg=self.colors['bg'], 
-                fg=self.colors['fg']).pack()
+        # Добавляем данные
+        for interval_name, info in self.intervals.items():
+            tree.insert("", tk.END, values=(
+                interval_name,
+                info["semitones"],
+                info["example"],
+                info["character"]
+            ))
         
-        tk.Label(title_frame, text="Выберите тему для изучения:", 
-                font=self.fonts['normal'], bg=self.colors['bg'], 
-                fg=self.colors['accent']).pack()
+        # Стиль для четных/нечетных строк
+        style = ttk.Style()
+        style.configure("Treeview", 
+                       background=self.colors['light_bg'],
+                       foreground='black',
+                       rowheight=25,
+                       fieldbackground=self.colors['light_bg'])
+        style.map('Treeview', background=[('selected', self.colors['accent'])])
+    
+    def show_chord_reference(self):
+        """Показать справочную информацию по аккордам"""
+        ref_window = tk.Toplevel(self.root)
+        ref_window.title("Справка: Аккорды")
+        ref_window.geometry("800x500")
+        ref_window.configure(bg=self.colors['light_bg'])
         
-        # Контейнер для кнопок тем
-        topics_container = tk.Frame(self.root, bg=self.colors['bg'])
-        topics_container.pack(fill=tk.BOTH, expand=True, padx=40, pady=20)
+        # Заголовок
+        header = tk.Frame(ref_window, bg=self.colors['accent'])
+        header.pack(fill=tk.X)
+        tk.Label(header, text="Характеристики аккордов", 
+                font=self.fonts['subheading'], bg=self.colors['accent'], 
+                fg='white', padx=20, pady=10).pack()
         
-        # Темы из учебника
-        topics = [
-            ("🎵 Основы звука", self.get_sound_basics_text),
-            ("🎼 Ноты и нотный стан", self.get_notes_text),
-            ("⏱️ Ритм и длительности", self.get_rhythm_text),
-            ("📐 Интервалы", self.get_intervals_text),
-            ("🎹 Аккорды", self.get_chords_text),
-            ("🎶 Лад и тональность", self.get_modes_text),
-            ("📝 Музыкальная форма", self.get_musical_form_text),
-            ("🎻 Гармония", self.get_harmony_text),
-            ("✍️ Музыкальный диктант", self.get_dictation_text),
-            ("🎤 Сольфеджио", self.get_solfeggio_text)
-        ]
+        # Содержимое
+        content = tk.Frame(ref_window, bg=self.colors['light_bg'])
+        content.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # Создаем кнопки для каждой темы
-        for i, (topic_name, content_func) in enumerate(topics):
-            btn_frame = tk.Frame(topics_container, bg=self.colors['bg'])
-            btn_frame.grid(row=i//3, column=i%3, padx=10, pady=10, sticky="nsew")
-            
-            btn = tk.Button(btn_frame, text=topic_name, 
-                          font=self.fonts['normal'], bg=self.colors['card'],
-                          fg=self.colors['fg'], width=20, height=3,
-                          command=lambda t=topic_name, c=content_func: self.show_topic(t, c),
-                          cursor='hand2', relief=tk.RAISED, bd=0,
-                          activebackground='#3d566e', activeforeground='white')
-            btn.pack(fill=tk.BOTH, expand=True)
+        # Создаем Treeview для таблицы
+        tree_frame = tk.Frame(content, bg=self.colors['light_bg'])
+        tree_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Настройка равномерного распределения колонок
-        for i in range(3):
-            topics_container.columnconfigure(i, weight=1)
-        topics_container.rowconfigure(0, weight=1)
-        topics_container.rowconfigure(1, weight=1)
-        topics_container.rowconfigure(2, weight=1)
-        topics_container.rowconfigure(3, weight=1)
+        tree_scroll = tk.Scrollbar(tree_frame)
+        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         
-        # Кнопка возврата
-        back_frame = tk.Frame(self.root, bg=self.colors['bg'])
-        back_frame.pack(pady=20)
+        tree = ttk.Treeview(tree_frame, yscrollcommand=tree_scroll.set, 
+                           selectmode="extended", height=15)
+        tree.pack(fill=tk.BOTH, expand=True)
+        tree_scroll.config(command=tree.yview)
         
-        back_btn = tk.Button(back_frame, text="← Назад в главное меню", 
-                            font=self.fonts['normal'], bg=self.colors['card'],
-                            fg=self.colors['fg'], padx=20, pady=8,
-                            command=self.create_main_menu, cursor='hand2',
-                            relief=tk.RAISED, bd=0,
-                            activebackground='#3d566e', activeforeground='white')
-        back_btn.pack()
-    
-    def show_topic(self, topic_name, content_func):
-        """Показать отдельную тему в новом окне"""
-        topic_window = tk.Toplevel(self.root)
-        topic_window.title(f"Музыкальная теория - {topic_name}")
-        topic_window.geometry("900x700")
-        topic_window.configure(bg=self.colors['light_bg'])
-        topic_window.minsize(800, 600)
+        # Определяем колонки
+        tree['columns'] = ("chord", "structure", "example", "character")
+        tree.column("#0", width=0, stretch=tk.NO)
+        tree.column("chord", anchor=tk.W, width=250)
+        tree.column("structure", anchor=tk.W, width=150)
+        tree.column("example", anchor=tk.W, width=200)
+        tree.column("character", anchor=tk.W, width=200)
         
-        # Заголовок темы
-        header_frame = tk.Frame(topic_window, bg=self.colors['accent'])
-        header_frame.pack(fill=tk.X, padx=0, pady=0)
+        # Заголовки
+        tree.heading("#0", text="", anchor=tk.W)
+        tree.heading("chord", text="Аккорд", anchor=tk.W)
+        tree.heading("structure", text="Структура", anchor=tk.W)
+        tree.heading("example", text="Пример от До", anchor=tk.W)
+        tree.heading("character", text="Характер звучания", anchor=tk.W)
         
-        tk.Label(header_frame, text=topic_name, 
-                font=self.fonts['heading'], bg=self.colors['accent'], 
-                fg='white', padx=20, pady=15).pack()
+        # Добавляем данные
+        for chord_name, info in self.chords.items():
+            tree.insert("", tk.END, values=(
+                chord_name,
+                info["structure"],
+                info["example"],
+                info["character"]
+            ))
         
-        # Текст темы с прокруткой
-        text_frame = tk.Frame(topic_window, bg=self.colors['light_bg'])
-        text_frame.pack(fill=tk.BOTH, expand=True, padx=0, pady=0)
+        # Стиль
+        style = ttk.Style()
+        style.configure("Treeview", 
+                       background=self.colors['light_bg'],
+                       foreground='black',
+                       rowheight=25,
+                       fieldbackground=self.colors['light_bg'])
+        style.map('Treeview', background=[('selected', self.colors['accent'])])
+    
+    def note_recognition_exercise(self):
+        """Упражнение на распознавание нот"""
+        self.screens.show("notes", self.build_note_screen, self.enter_note_screen)
+    
+    def build_note_screen(self, screen):
+        """Экран упражнения на ноты: строится один раз"""
         
-        # Панель инструментов
-        toolbar = tk.Frame(text_frame, bg=self.colors['light_bg'])
-        toolbar.pack(fill=tk.X, padx=10, pady=10)
+        # Главный контейнер
+        main_container = tk.Frame(screen, bg=self.colors['bg'])
+        main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
-        # Кнопка копирования
-        copy_btn = tk.Button(toolbar, text="📋 Копировать", 
-                           font=self.fonts['small'], bg=self.colors['card'],
-                           fg=self.colors['fg'], command=lambda: self.copy_to_clipboard(content_func()),
-                           cursor='hand2', relief=tk.RAISED, bd=0, padx=10, pady=5,
-                           activebackground='#3d566e', activeforeground='white')
-        copy_btn.pack(side=tk.LEFT)
+        # Заголовок
+        header_frame = tk.Frame(main_container, bg=self.colors['bg'])
+        header_frame.pack(fill=tk.X, pady=(0, 20))
         
-        # Кнопка печати
-        print_btn = tk.Button(toolbar, text="🖨️ Печать", 
-                            font=self.fonts['small'], bg=self.colors['card'],
-                            fg=self.colors['fg'], command=lambda: self.print_content(topic_name, content_func()),
-                            cursor='hand2', relief=tk.RAISED, bd=0, padx=10, pady=5,
-                            activebackground='#3d566e', activeforeground='white')
-        print_btn.pack(side=tk.LEFT, padx=5)
+        tk.Label(header_frame, text="🎵 Определение нот", 
+                font=self.fonts['title'], bg=self.colors['bg'], 
+                fg=self.colors['fg']).pack()
         
-        # Текстовое поле
-        text_container = tk.Frame(text_frame, bg=self.colors['light_bg'])
-        text_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        # Описание
+        desc_frame = tk.Frame(main_container, bg=self.colors['card'], 
+                             relief=tk.RAISED, bd=1)
+        desc_frame.pack(fill=tk.X, pady=(0, 20), padx=10)
         
-        text_widget = tk.Text(text_container, wrap=tk.WORD, font=("Segoe UI", 11), 
-                             bg='white', fg='#2c3e50', padx=15, pady=15, 
-                             spacing2=3, spacing3=5, relief=tk.FLAT, bd=2)
+        desc_text = """Слушайте звучащую ноту и выбирайте соответствующую ноту из списка.
+        Ноты представлены в диапазоне первой октавы."""
         
-        scrollbar = tk.Scrollbar(text_container, command=text_widget.yview,
-                                bg=self.colors['light_bg'])
-        text_widget.config(yscrollcommand=scrollbar.set)
+        tk.Label(desc_frame, text=desc_text, font=self.fonts['normal'], 
+                bg=self.colors['card'], fg=self.colors['fg'], 
+                wraplength=600, justify=tk.LEFT, padx=15, pady=10).pack()
         
-        # Вставляем текст
-        content = content_func()
-        text_widget.insert(tk.END, content)
-        text_widget.config(state=tk.DISABLED)
+        # Панель управления
+        control_frame = tk.Frame(main_container, bg=self.colors['bg'])
+        control_frame.pack(fill=tk.X, pady=20)
         
-        text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Кнопка справки
+        help_btn = tk.Button(control_frame, text="📖 Справка по нотам", 
+                           font=self.fonts['small'], bg=self.colors['card'],
+                           fg=self.colors['fg'], command=self.show_note_reference,
+                           cursor='hand2', relief=tk.RAISED, bd=0, padx=15, pady=8,
+                           activebackground='#3d566e', activeforeground='white')
+        help_btn.pack(side=tk.LEFT, padx=5)
         
-        # Кнопка закрытия
-        close_frame = tk.Frame(topic_window, bg=self.colors['light_bg'])
-        close_frame.pack(pady=10)
+        # Кнопка для проигрывания ноты
+        self.play_button = tk.Button(control_frame, text="🎵 Проиграть ноту", 
+                                    font=self.fonts['normal'], bg=self.colors['accent'],
+                                    fg='white', width=15, height=1,
+                                    command=self.play_current_note,
+                                    cursor='hand2', relief=tk.RAISED, bd=0,
+                                    activebackground='#2980b9', activeforeground='white')
+        self.play_button.pack(side=tk.LEFT, padx=5)
+        self.play_button.config(state=tk.DISABLED)
         
-        close_btn = tk.Button(close_frame, text="Закрыть", 
-                             font=self.fonts['normal'], bg=self.colors['accent'],
-                             fg='white', padx=30, pady=8,
-                             command=topic_window.destroy, cursor='hand2',
+        # Кнопки управления
+        start_btn = tk.Button(control_frame, text="▶ Начать упражнение", 
+                             font=self.fonts['normal'], bg=self.colors['success'],
+                             fg='white', width=15, height=1,
+                             command=self.start_exercise, cursor='hand2',
                              relief=tk.RAISED, bd=0,
-                             activebackground='#2980b9', activeforeground='white')
-        close_btn.pack()
+                             activebackground='#27ae60', activeforeground='white')
+        start_btn.pack(side=tk.LEFT, padx=5)
         
-        # Центрирование окна
-        topic_window.update_idletasks()
-        x = (topic_window.winfo_screenwidth() // 2) - (topic_window.winfo_width() // 2)
-        y = (topic_window.winfo_screenheight() // 2) - (topic_window.winfo_height() // 2)
-        topic_window.geometry(f"+{x}+{y}")
-    
-    def copy_to_clipboard(self, text):
-        """Копирование текста в буфер обмена"""
-        self.root.clipboard_clear()
-        self.root.clipboard_append(text)
-        messagebox.showinfo("Копирование", "Текст скопирован в буфер обмена!")
-    
-    def print_content(self, title, content):
-        """Имитация печати"""
-        response = messagebox.askyesno("Печать", "Хотите сохранить текст в файл?")
-        if response:
-            filename = f"{title}.txt"
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(content)
-            messagebox.showinfo("Сохранение", f"Текст сохранен в файл: {filename}")
-    
-    def show_ear_trainer(self):
-        """Тренажер слуха"""
-        self.clear_window()
+        stop_btn = tk.Button(control_frame, text="■ Остановить", 
+                            font=self.fonts['normal'], bg=self.colors['danger'],
+                            fg='white', width=15, height=1,
+                            command=self.stop_exercise, cursor='hand2',
+                            relief=tk.RAISED, bd=0,
+                            activebackground='#c0392b', activeforeground='white')
+        stop_btn.pack(side=tk.LEFT, padx=5)
         
-        # Заголовок
-        title_frame = tk.Frame(self.root, bg=self.colors['bg'])
-        title_frame.pack(pady=(20, 10), fill=tk.X)
+        # Адаптивный режим: ноты с ошибками звучат чаще
+        self.adaptive_modes["notes"] = tk.BooleanVar(value=False)
+        self.create_option_checkbutton(control_frame, "Чаще ошибочные", self.adaptive_modes["notes"])
         
-        tk.Label(title_frame, text="🎧 Тренажер слуха", 
-                font=self.fonts['title'], bg=self.colors['bg'], 
-                fg=self.colors['fg']).pack()
+        # Результат
+        self.result_label = tk.Label(main_container, text="Нажмите 'Начать упражнение'", 
+                                    font=self.fonts['subheading'], bg=self.colors['bg'], 
+                                    fg=self.colors['accent'], pady=10)
+        self.result_label.pack()
         
-        tk.Label(title_frame, text="Выберите тип упражнения:", 
-                font=self.fonts['normal'], bg=self.colors['bg'], 
-                fg=self.colors['accent']).pack()
+        # Статистика
+        stats_frame = tk.Frame(main_container, bg=self.colors['card'], 
+                              relief=tk.SUNKEN, bd=1)
+        stats_frame.pack(pady=10, padx=50, fill=tk.X)
         
-        # Контейнер для упражнений
-        exercises_container = tk.Frame(self.root, bg=self.colors['bg'])
-        exercises_container.pack(fill=tk.BOTH, expand=True, padx=50, pady=30)
+        self.stats_label = tk.Label(stats_frame, text="Правильно: 0/0 (0%)", 
+                                   font=self.fonts['normal'], bg=self.colors['card'], 
+                                   fg=self.colors['fg'], padx=20, pady=10)
+        self.stats_label.pack()
         
-        # Упражнения
-        exercises = [
-            ("🎵 Определение нот", self.note_recognition_exercise),
-            ("📐 Определение интервалов", self.interval_recognition_exercise),
-            ("🎹 Определение аккордов", self.chord_recognition_exercise),
-            ("⏱️ Ритмические упражнения", self.rhythm_exercise)
-        ]
+        # Кнопки с нотами
+        notes_frame = tk.Frame(main_container, bg=self.colors['bg'])
+        notes_frame.pack(fill=tk.BOTH, expand=True, pady=20)
         
-        for text, command in exercises:
-            btn_frame = tk.Frame(exercises_container, bg=self.colors['bg'])
-            btn_frame.pack(pady=10)
+        notes = list(self.note_frequencies.keys())
+        
+        # Создаем кнопки в сетке 2x4
+        for i, note in enumerate(notes):
+            row = i // 4
+            col = i % 4
             
-            btn = tk.Button(btn_frame, text=text, font=self.fonts['subheading'],
-                          bg=self.colors['accent'], fg='white', width=30, height=2,
-                          command=command, cursor='hand2', relief=tk.RAISED, bd=0,
-                          activebackground='#2980b9', activeforeground='white')
+            btn_frame = tk.Frame(notes_frame, bg=self.colors['bg'])
+            btn_frame.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
+            
+            btn_text = f"{note}\n({self.notes_dict[note]})"
+            btn = tk.Button(btn_frame, text=btn_text, 
+                          font=self.fonts['heading'], bg=self.colors['card'],
+                          fg=self.colors['fg'], width=8, height=3,
+                          command=lambda n=note: self.check_note_answer(n),
+                          cursor='hand2', relief=tk.RAISED, bd=0,
+                          activebackground='#3d566e', activeforeground='white')
             btn.pack(fill=tk.BOTH, expand=True)
         
-        # Кнопка возврата
-        back_frame = tk.Frame(self.root, bg=self.colors['bg'])
-        back_frame.pack(pady=20)
+        # Настройка сетки
+        for i in range(2):
+            notes_frame.rowconfigure(i, weight=1)
+        for i in range(4):
+            notes_frame.columnconfigure(i, weight=1)
         
-        back_btn = tk.Button(back_frame, text="← Назад в главное меню", 
+        # Панель навигации
+        nav_frame = tk.Frame(main_container, bg=self.colors['bg'])
+        nav_frame.pack(fill=tk.X, pady=20)
+        
+        back_btn = tk.Button(nav_frame, text="← Назад к выбору", 
                             font=self.fonts['normal'], bg=self.colors['card'],
                             fg=self.colors['fg'], padx=20, pady=8,
-                            command=self.create_main_menu, cursor='hand2',
+                            command=self.show_ear_trainer, cursor='hand2',
                             relief=tk.RAISED, bd=0,
                             activebackground='#3d566e', activeforeground='white')
-        back_btn.pack()
+        back_btn.pack(side=tk.LEFT, padx=5)
+        
+        home_btn = tk.Button(nav_frame, text="🏠 Главное меню", 
+                           font=self.fonts['normal'], bg=self.colors['card'],
+                           fg=self.colors['fg'], padx=20, pady=8,
+                           command=self.create_main_menu, cursor='hand2',
+                           relief=tk.RAISED, bd=0,
+                           activebackground='#3d566e', activeforeground='white')
+        home_btn.pack(side=tk.LEFT, padx=5)
     
-    def play_note_sound(self, note_name, duration=1000):
-        """Воспроизведение звука ноты"""
-        if note_name in self.note_frequencies:
-            frequency = int(self.note_frequencies[note_name])
-            
-            # Создаем отдельный поток для воспроизведения звука
-            sound_thread = threading.Thread(
-                target=lambda: winsound.Beep(frequency, duration)
+    def enter_note_screen(self):
+        """Вход на экран: упражнение остановлено до нажатия 'Начать'"""
+        self.note_engine.stop()
+        self.result_label.config(text="Нажмите 'Начать упражнение'", fg=self.colors['accent'])
+        self.play_button.config(state=tk.DISABLED)
+    
+    def check_note_answer(self, selected_note):
+        """Проверка ответа в упражнении по определению нот"""
+        result = self.note_engine.submit_answer(selected_note)
+        if result is None:
+            return
+        self.record_answer(self.note_engine, selected_note, result)
+        
+        if result["correct"]:
+            self.result_label.config(text="✓ Правильно!", fg=self.colors['success'])
+            self.play_feedback_sound(True)
+        else:
+            note = result["expected"]
+            self.result_label.config(
+                text=f"✗ Неправильно! Правильный ответ: {note} ({self.notes_dict[note]})", 
+                fg=self.colors['danger']
             )
-            sound_thread.daemon = True
-            sound_thread.start()
+            self.play_feedback_sound(False)
+        
+        self.update_statistics()
+        self.root.after(1500, self.next_round)
     
-    def play_interval_sound(self, base_note, interval_name):
-        """Воспроизведение интервала (две ноты последовательно)"""
-        if interval_name in self.intervals:
-            semitones = self.intervals[interval_name]["semitones"]
-            
-            base_freq = self.note_frequencies[base_note]
-            second_freq = base_freq * (2 ** (semitones / 12))
-            
-            def play_sequence():
-                winsound.Beep(int(base_freq), 1000)
-                time.sleep(0.2)
-                winsound.Beep(int(second_freq), 1000)
-            
-            sound_thread = threading.Thread(target=play_sequence)
-            sound_thread.daemon = True
-            sound_thread.start()
+    def next_round(self):
+        """Начало следующего раунда"""
+        if self.note_engine.active:
+            self.audio_worker.cancel()
+            self.note_engine.next_item()
+            self.result_label.config(text="Слушайте ноту...", fg=self.colors['accent'])
+            self.play_button.config(state=tk.NORMAL)
     
-    def play_chord_sound(self, base_note, chord_name, arpeggio=True):
-        """Воспроизведение аккорда"""
-        if chord_name in self.chords:
-            base_freq = self.note_frequencies[base_note]
-            semitones = self.chords[chord_name]["semitones"]
-            
-            frequencies = []
-            for semitone in semitones:
-                freq = base_freq * (2 ** (semitone / 12))
-                frequencies.append(int(freq))
-            
-            def play_chord():
-                if arpeggio:
-                    for i, freq in enumerate(frequencies):
-                        duration = 500
-                        winsound.Beep(freq, duration)
-                        time.sleep(0.1)
-                else:
-                    duration = 1500
-                    interval = 50
-                    cycles = duration // (interval * len(frequencies))
-                    for _ in range(cycles):
-                        for freq in frequencies:
-                            winsound.Beep(freq, interval)
-                            time.sleep(0.01)
-            
-            sound_thread = threading.Thread(target=play_chord)
-            sound_thread.daemon = True
-            sound_thread.start()
+    def update_statistics(self):
+        """Обновление статистики"""
+        text = self.format_statistics(self.note_engine)
+        if text:
+            self.stats_label.config(text=text)
     
-    def show_note_reference(self):
-        """Показать справочную информацию по нотам"""
-        ref_window = tk.Toplevel(self.root)
-        ref_window.title("Справка: Ноты и частоты")
-        ref_window.geometry("500x400")
-        ref_window.configure(bg=self.colors['light_bg'])
+    def format_statistics(self, engine):
+        """Текст статистики упражнения: текущий сеанс и итог за все время"""
+        lines = []
+        stats = engine.stats()
+        if stats["attempts"] > 0:
+            lines.append(f"Правильно: {stats['score']}/{stats['attempts']} ({stats['accuracy'] * 100:.1f}%)")
+        if self.history is not None:
+            total = self.history.totals(engine.name)
+            if total["attempts"] > 0:
+                lines.append(f"За все время: {total['score']}/{total['attempts']} "
+                             f"({total['accuracy'] * 100:.1f}%)")
+        return "\n".join(lines)
+    
+    def record_answer(self, engine, answer, result):
+        """Запись ответа в журнал истории (в фоне)"""
+        if self.history is not None:
+            self.history.append(engine.name, result["item"], answer, result["correct"],
+                                result["response_ms"])
+    
+    def open_history(self):
+        """Журнал ответов в папке пользователя; без него программа работает как раньше"""
+        try:
+            return HistoryStore(user_data_path("history.sqlite3"))
+        except (OSError, sqlite3.Error):
+            traceback.print_exc()
+            return None
+    
+    def on_close(self):
+        """Закрытие окна: сохранение расписания и дозапись журнала"""
+        self.stop_metronome()
+        self.stop_listening()
+        self.rhythm_scorer.shutdown(wait=False)
+        self.save_interval_scheduler()
+        if self.history is not None:
+            self.history.close()
+        self.root.destroy()
+    
+    def create_option_checkbutton(self, parent, text, variable):
+        """Флажок настройки упражнения в общем стиле"""
+        checkbutton = tk.Checkbutton(parent, text=text, variable=variable, font=self.fonts['small'],
+                                     bg=self.colors['bg'], fg=self.colors['fg'],
+                                     selectcolor=self.colors['accent'],
+                                     activebackground=self.colors['bg'],
+                                     activeforeground=self.colors['fg'])
+        checkbutton.pack(side=tk.LEFT, padx=15)
+        return checkbutton
+    
+    def attach_adaptive_sampler(self, engine):
+        """Включение или выключение адаптивного выбора вопросов по флажку"""
+        if self.adaptive_modes[engine.name].get():
+            engine.sampler = AdaptiveSampler(engine.bank(), counts=self.adaptive_counts[engine.name])
+        else:
+            engine.sampler = None
+    
+    def start_exercise(self):
+        """Начало упражнения"""
+        self.attach_adaptive_sampler(self.note_engine)
+        self.note_engine.start()
+        self.update_statistics()
+        self.warm_up_note_cache()
+        self.next_round()
+    
+    def stop_exercise(self):
+        """Остановка упражнения"""
+        self.note_engine.stop()
+        self.result_label.config(text="Упражнение остановлено", fg=self.colors['warning'])
+        self.play_button.config(state=tk.DISABLED)
+    
+    def interval_recognition_exercise(self):
+        """Упражнение на распознавание интервалов"""
+        self.screens.show("intervals", self.build_interval_screen, self.enter_interval_screen)
+    
+    def build_interval_screen(self, screen):
+        """Экран упражнения на интервалы: строится один раз"""
+        
+        # Главный контейнер
+        main_container = tk.Frame(screen, bg=self.colors['bg'])
+        main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
         # Заголовок
-        header = tk.Frame(ref_window, bg=self.colors['accent'])
-        header.pack(fill=tk.X)
-        tk.Label(header, text="Частоты нот (первая октава)", 
-                font=self.fonts['subheading'], bg=self.colors['accent'], 
-                fg='white', padx=20, pady=10).pack()
+        header_frame = tk.Frame(main_container, bg=self.colors['bg'])
+        header_frame.pack(fill=tk.X, pady=(0, 20))
         
-        # Содержимое
-        content = tk.Frame(ref_window, bg=self.colors['light_bg'])
-        content.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        tk.Label(header_frame, text="📐 Определение интервалов", 
+                font=self.fonts['title'], bg=self.colors['bg'], 
+                fg=self.colors['fg']).pack()
+        
+        # Описание
+        desc_frame = tk.Frame(main_container, bg=self.colors['card'], 
+                             relief=tk.RAISED, bd=1)
+        desc_frame.pack(fill=tk.X, pady=(0, 20), padx=10)
         
-        # Таблица частот
-        table_frame = tk.Frame(content, bg='white', relief=tk.SUNKEN, bd=1)
-        table_frame.pack(fill=tk.BOTH, expand=True)
+        desc_text = """Слушайте звучащий интервал и выбирайте соответствующий интервал из списка.
+        Интервалы представлены от примы до октавы, в режиме составных - до квинтдецимы.
+        Интервал может звучать вверх, вниз или одновременно - в зависимости от выбранных режимов."""
         
-        # Заголовки таблицы
-        headers = ["Нота (рус.)", "Нота (лат.)", "Частота (Гц)"]
-        for col, header in enumerate(headers):
-            tk.Label(table_frame, text=header, font=self.fonts['normal'], 
-                    bg=self.colors['card'], fg='white', 
-                    padx=10, pady=5).grid(row=0, column=col, sticky="ew", padx=1, pady=1)
+        tk.Label(desc_frame, text=desc_text, font=self.fonts['normal'], 
+                bg=self.colors['card'], fg=self.colors['fg'], 
+                wraplength=600, justify=tk.LEFT, padx=15, pady=10).pack()
         
-        # Данные таблицы
-        for row, (note_ru, freq) in enumerate(self.note_frequencies.items(), start=1):
-            note_lat = self.notes_dict[note_ru]
-            
-            # Чередование цветов строк
-            bg_color = '#f8f9fa' if row % 2 == 0 else 'white'
-            
-            tk.Label(table_frame, text=note_ru, font=self.fonts['normal'], 
-                    bg=bg_color, padx=10, pady=5).grid(row=row, column=0, sticky="ew", padx=1, pady=1)
-            tk.Label(table_frame, text=note_lat, font=self.fonts['normal'], 
-                    bg=bg_color, padx=10, pady=5).grid(row=row, column=1, sticky="ew", padx=1, pady=1)
-            tk.Label(table_frame, text=f"{freq:.2f}", font=self.fonts['normal'], 
-                    bg=bg_color, padx=10, pady=5).grid(row=row, column=2, sticky="ew", padx=1, pady=1)
+        # Панель управления
+        control_frame = tk.Frame(main_container, bg=self.colors['bg'])
+        control_frame.pack(fill=tk.X, pady=20)
         
-        # Настройка веса колонок
-        for i in range(3):
-            table_frame.columnconfigure(i, weight=1)
-    
-    def show_interval_reference(self):
-        """Показать справочную информацию по интервалам"""
-        ref_window = tk.Toplevel(self.root)
-        ref_window.title("Справка: Интервалы")
-        ref_window.geometry("700x500")
-        ref_window.configure(bg=self.colors['light_bg'])
+        # Кнопка справки
+        help_btn = tk.Button(control_frame, text="📖 Справка по интервалам", 
+                           font=self.fonts['small'], bg=self.colors['card'],
+                           fg=self.colors['fg'], command=self.show_interval_reference,
+                           cursor='hand2', relief=tk.RAISED, bd=0, padx=15, pady=8,
+                           activebackground='#3d566e', activeforeground='white')
+        help_btn.pack(side=tk.LEFT, padx=5)
         
-        # Заголовок
-        header = tk.Frame(ref_window, bg=self.colors['accent'])
-        header.pack(fill=tk.X)
-        tk.Label(header, text="Характеристики интервалов", 
-                font=self.fonts['subheading'], bg=self.colors['accent'], 
-                fg='white', padx=20, pady=10).pack()
+        # Кнопка для проигрывания интервала
+        self.interval_play_button = tk.Button(control_frame, text="🎵 Проиграть интервал", 
+                                             font=self.fonts['normal'], bg=self.colors['accent'],
+                                             fg='white', width=18, height=1,
+                                             command=self.play_current_interval,
+                                             cursor='hand2', relief=tk.RAISED, bd=0,
+                                             activebackground='#2980b9', activeforeground='white')
+        self.interval_play_button.pack(side=tk.LEFT, padx=5)
+        self.interval_play_button.config(state=tk.DISABLED)
         
-        # Содержимое
-        content = tk.Frame(ref_window, bg=self.colors['light_bg'])
-        content.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        # Кнопки управления
+        start_btn = tk.Button(control_frame, text="▶ Начать упражнение", 
+                             font=self.fonts['normal'], bg=self.colors['success'],
+                             fg='white', width=18, height=1,
+                             command=self.start_interval_exercise, cursor='hand2',
+                             relief=tk.RAISED, bd=0,
+                             activebackground='#27ae60', activeforeground='white')
+        start_btn.pack(side=tk.LEFT, padx=5)
         
-        # Создаем Treeview для таблицы
-        tree_frame = tk.Frame(content, bg=self.colors['light_bg'])
-        tree_frame.pack(fill=tk.BOTH, expand=True)
+        stop_btn = tk.Button(control_frame, text="■ Остановить", 
+                            font=self.fonts['normal'], bg=self.colors['danger'],
+                            fg='white', width=18, height=1,
+                            command=self.stop_interval_exercise, cursor='hand2',
+                            relief=tk.RAISED, bd=0,
+                            activebackground='#c0392b', activeforeground='white')
+        stop_btn.pack(side=tk.LEFT, padx=5)
         
-        tree_scroll = tk.Scrollbar(tree_frame)
-        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        # Режим интервального повторения: вопросы по расписанию SM-2 вместо случайных
+        self.spaced_repetition = tk.BooleanVar(value=False)
+        self.create_option_checkbutton(control_frame, "Интервальное повторение", self.spaced_repetition)
+        self.adaptive_modes["intervals"] = tk.BooleanVar(value=False)
+        self.create_option_checkbutton(control_frame, "Чаще ошибочные", self.adaptive_modes["intervals"])
+        
+        # Режимы: способы звучания и составные интервалы; меняются и во время упражнения
+        modes_frame = tk.Frame(main_container, bg=self.colors['bg'])
+        modes_frame.pack(fill=tk.X)
+        self.interval_mode_vars = {}
+        for mode, title in self.interval_mode_titles.items():
+            variable = tk.BooleanVar(value=mode in self.interval_engine.modes)
+            self.interval_mode_vars[mode] = variable
+            self.create_option_checkbutton(modes_frame, title, variable).config(
+                command=self.update_interval_modes)
+        self.compound_intervals_var = tk.BooleanVar(value=self.interval_engine.compound)
+        self.create_option_checkbutton(modes_frame, "Составные (9–15)", self.compound_intervals_var).config(
+            command=self.update_interval_modes)
         
-        tree = ttk.Treeview(tree_frame, yscrollcommand=tree_scroll.set, 
-                           selectmode="extended", height=15)
-        tree.pack(fill=tk.BOTH, expand=True)
-        tree_scroll.config(command=tree.yview)
+        # Результат
+        self.interval_result_label = tk.Label(main_container, 
+                                             text="Нажмите 'Начать упражнение'", 
+                                             font=self.fonts['subheading'], bg=self.colors['bg'], 
+                                             fg=self.colors['accent'], pady=10)
+        self.interval_result_label.pack()
         
-        # Определяем колонки
-        tree['columns'] = ("interval", "semitones", "example", "character")
-        tree.column("#0", width=0, stretch=tk.NO)
-        tree.column("interval", anchor=tk.W, width=200)
-        tree.column("semitones", anchor=tk.CENTER, width=100)
-        tree.column("example", anchor=tk.W, width=150)
-        tree.column("character", anchor=tk.W, width=250)
+        # Статистика
+        stats_frame = tk.Frame(main_container, bg=self.colors['card'], 
+                              relief=tk.SUNKEN, bd=1)
+        stats_frame.pack(pady=10, padx=50, fill=tk.X)
         
-        # Заголовки
-        tree.heading("#0", text="", anchor=tk.W)
-        tree.heading("interval", text="Интервал", anchor=tk.W)
-        tree.heading("semitones", text="Полутоны", anchor=tk.CENTER)
-        tree.heading("example", text="Пример от До", anchor=tk.W)
-        tree.heading("character", text="Характер звучания", anchor=tk.W)
+        self.interval_stats_label = tk.Label(stats_frame, text="Правильно: 0/0 (0%)", 
+                                            font=self.fonts['normal'], bg=self.colors['card'], 
+                                            fg=self.colors['fg'], padx=20, pady=10)
+        self.interval_stats_label.pack()
         
-        # Добавляем данные
-        for interval_name, info in self.intervals.items():
-            tree.insert("", tk.END, values=(
-                interval_name,
-                info["semitones"],
-                info["example"],
-                info["character"]
-            ))
+        # Кнопки с интервалами
+        intervals_frame = tk.Frame(main_container, bg=self.colors['bg'])
+        intervals_frame.pack(fill=tk.BOTH, expand=True, pady=20)
         
-        # Стиль для четных/нечетных строк
-        style = ttk.Style()
-        style.configure("Treeview", 
-                       background=self.colors['light_bg'],
-                       foreground='black',
-                       rowheight=25,
-                       fieldbackground=self.colors['light_bg'])
-        style.map('Treeview', background=[('selected', self.colors['accent'])])
-    
-    def show_chord_reference(self):
-        """Показать справочную информацию по аккордам"""
-        ref_window = tk.Toplevel(self.root)
-        ref_window.title("Справка: Аккорды")
-        ref_window.geometry("800x500")
-        ref_window.configure(bg=self.colors['light_bg'])
+        simple_names = [name for name, info in self.intervals.items() if info["semitones"] <= 12]
+        compound_names = [name for name, info in self.intervals.items() if info["semitones"] > 12]
+        simple_rows = (len(simple_names) + 3) // 4
+        
+        # Кнопки в сетке по 4 в ряд; составные интервалы - ниже простых, скрыты без их режима
+        self.compound_interval_buttons = []
+        for i, interval in enumerate(simple_names + compound_names):
+            compound = i >= len(simple_names)
+            if compound:
+                row = simple_rows + (i - len(simple_names)) // 4
+                col = (i - len(simple_names)) % 4
+            else:
+                row = i // 4
+                col = i % 4
+            
+            btn_frame = tk.Frame(intervals_frame, bg=self.colors['bg'])
+            btn_frame.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
+            if compound:
+                self.compound_interval_buttons.append(btn_frame)
+                if not self.interval_engine.compound:
+                    btn_frame.grid_remove()
+            
+            btn = tk.Button(btn_frame, text=interval, 
+                          font=self.fonts['normal'], bg=self.colors['card'],
+                          fg=self.colors['fg'], width=15, height=2,
+                          command=lambda i=interval: self.check_interval_answer(i),
+                          cursor='hand2', relief=tk.RAISED, bd=0,
+                          activebackground='#3d566e', activeforeground='white',
+                          wraplength=150)
+            btn.pack(fill=tk.BOTH, expand=True)
         
-        # Заголовок
-        header = tk.Frame(ref_window, bg=self.colors['accent'])
-        header.pack(fill=tk.X)
-        tk.Label(header, text="Характеристики аккордов", 
-                font=self.fonts['subheading'], bg=self.colors['accent'], 
-                fg='white', padx=20, pady=10).pack()
+        # Настройка сетки
+        for i in range(simple_rows + (len(compound_names) + 3) // 4):
+            intervals_frame.rowconfigure(i, weight=1)
+        for i in range(4):
+            intervals_frame.columnconfigure(i, weight=1)
         
-        # Содержимое
-        content = tk.Frame(ref_window, bg=self.colors['light_bg'])
-        content.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        # Панель навигации
+        nav_frame = tk.Frame(main_container, bg=self.colors['bg'])
+        nav_frame.pack(fill=tk.X, pady=20)
         
-        # Создаем Treeview для таблицы
-        tree_frame = tk.Frame(content, bg=self.colors['light_bg'])
-        tree_frame.pack(fill=tk.BOTH, expand=True)
+        back_btn = tk.Button(nav_frame, text="← Назад к выбору", 
+                            font=self.fonts['normal'], bg=self.colors['card'],
+                            fg=self.colors['fg'], padx=20, pady=8,
+                            command=self.show_ear_trainer, cursor='hand2',
+                            relief=tk.RAISED, bd=0,
+                            activebackground='#3d566e', activeforeground='white')
+        back_btn.pack(side=tk.LEFT, padx=5)
         
-        tree_scroll = tk.Scrollbar(tree_frame)
-        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        home_btn = tk.Button(nav_frame, text="🏠 Главное меню", 
+                           font=self.fonts['normal'], bg=self.colors['card'],
+                           fg=self.colors['fg'], padx=20, pady=8,
+                           command=self.create_main_menu, cursor='hand2',
+                           relief=tk.RAISED, bd=0,
+                           activebackground='#3d566e', activeforeground='white')
+        home_btn.pack(side=tk.LEFT, padx=5)
         
-        tree = ttk.Treeview(tree_frame, yscrollcommand=tree_scroll.set, 
-                           selectmode="extended", height=15)
-        tree.pack(fill=tk.BOTH, expand=True)
-        tree_scroll.config(command=tree.yview)
+        times_btn = tk.Button(nav_frame, text="⏱ Время реакции", 
+                            font=self.fonts['normal'], bg=self.colors['card'],
+                            fg=self.colors['fg'], padx=20, pady=8,
+                            command=lambda: self.show_response_times(self.interval_engine, "интервалов"),
+                            cursor='hand2', relief=tk.RAISED, bd=0,
+                            activebackground='#3d566e', activeforeground='white')
+        times_btn.pack(side=tk.RIGHT, padx=5)
+    
+    def enter_interval_screen(self):
+        """Вход на экран: упражнение остановлено до нажатия 'Начать'"""
+        self.interval_engine.stop()
+        self.interval_result_label.config(text="Нажмите 'Начать упражнение'", fg=self.colors['accent'])
+        self.interval_play_button.config(state=tk.DISABLED)
+    
+    def check_interval_answer(self, selected_interval):
+        """Проверка ответа в упражнении по определению интервалов"""
+        result = self.interval_engine.submit_answer(selected_interval)
+        if result is None:
+            return
+        self.record_answer(self.interval_engine, selected_interval, result)
         
-        # Определяем колонки
-        tree['columns'] = ("chord", "structure", "example", "character")
-        tree.column("#0", width=0, stretch=tk.NO)
-        tree.column("chord", anchor=tk.W, width=250)
-        tree.column("structure", anchor=tk.W, width=150)
-        tree.column("example", anchor=tk.W, width=200)
-        tree.column("character", anchor=tk.W, width=200)
+        if result["correct"]:
+            self.interval_result_label.config(text="✓ Правильно!", fg=self.colors['success'])
+            self.play_feedback_sound(True)
+        else:
+            interval_info = self.intervals[result["expected"]]
+            self.interval_result_label.config(
+                text=f"✗ Неправильно! Правильный ответ: {result['expected']}\n"
+                     f"Пример: {interval_info['example']}\n"
+                     f"Характер: {interval_info['character']}", 
+                fg=self.colors['danger']
+            )
+            self.play_feedback_sound(False)
         
-        # Заголовки
-        tree.heading("#0", text="", anchor=tk.W)
-        tree.heading("chord", text="Аккорд", anchor=tk.W)
-        tree.heading("structure", text="Структура", anchor=tk.W)
-        tree.heading("example", text="Пример от До", anchor=tk.W)
-        tree.heading("character", text="Характер звучания", anchor=tk.W)
+        self.update_interval_statistics()
+        self.root.after(2000, self.next_interval_round)
+    
+    def next_interval_round(self):
+        """Начало следующего раунда в упражнении с интервалами"""
+        if self.interval_engine.active:
+            self.audio_worker.cancel()
+            interval_name, root, mode = self.interval_engine.next_item()
+            self.render_interval_buffer(root, interval_name, mode)
+            prompt = {"down": "Слушайте нисходящий интервал...",
+                      "harmonic": "Слушайте гармонический интервал..."}.get(mode, "Слушайте интервал...")
+            self.interval_result_label.config(text=prompt, fg=self.colors['accent'])
+            self.interval_play_button.config(state=tk.NORMAL)
+    
+    def update_interval_statistics(self):
+        """Обновление статистики для упражнения с интервалами"""
+        text = self.format_statistics(self.interval_engine)
+        if isinstance(self.interval_engine.sampler, SpacedRepetitionScheduler):
+            schedule = self.interval_engine.sampler.stats()
+            text += f"\nНовых: {schedule['new']}, изучено: {schedule['learned']}, к повторению: {schedule['due']}"
+        if text:
+            self.interval_stats_label.config(text=text.strip())
+    
+    def get_interval_scheduler(self):
+        """Расписание повторения интервалов включенных режимов
+        
+        Загружается с диска при первом обращении и при смене режимов; карточки
+        выключенных режимов хранятся в файле и возвращаются вместе с режимом.
+        """
+        engine = self.interval_engine
+        intervals = [name for name in self.intervals
+                     if engine.compound or self.intervals[name]["semitones"] <= 12]
+        bank_key = (tuple(intervals), engine.modes)
+        if self.interval_scheduler is None or self.interval_scheduler_key != bank_key:
+            self.save_interval_scheduler()
+            self.interval_scheduler = SpacedRepetitionScheduler.load(
+                user_data_path("interval_schedule.json"),
+                build_interval_bank(intervals, modes=engine.modes))
+            self.interval_scheduler_key = bank_key
+        return self.interval_scheduler
+    
+    def save_interval_scheduler(self):
+        """Сохранение расписания повторения интервалов, если оно загружено"""
+        if self.interval_scheduler is None:
+            return
+        try:
+            self.interval_scheduler.save(user_data_path("interval_schedule.json"))
+        except OSError:
+            traceback.print_exc()
+    
+    def update_interval_modes(self):
+        """Смена режимов интервалов без перестройки экрана
+        
+        Меняется только выборка вопросов движка и видимость кнопок составных
+        интервалов; буферы новых режимов синтезируются в фоне.
+        """
+        modes = [mode for mode, variable in self.interval_mode_vars.items() if variable.get()]
+        if not modes:
+            self.interval_mode_vars["up"].set(True)
+            modes = ["up"]
+        compound = self.compound_intervals_var.get()
+        self.interval_engine.configure(modes=modes, compound=compound)
+        
+        for btn_frame in self.compound_interval_buttons:
+            if compound:
+                btn_frame.grid()
+            else:
+                btn_frame.grid_remove()
+        
+        if self.interval_engine.active:
+            self.attach_interval_sampler()
+        self.warm_up_interval_cache()
+    
+    def attach_interval_sampler(self):
+        """Выбор вопросов для интервалов: расписание SM-2, адаптивный или случайный"""
+        if self.spaced_repetition.get():
+            self.interval_engine.sampler = self.get_interval_scheduler()
+        else:
+            self.attach_adaptive_sampler(self.interval_engine)
+    
+    def start_interval_exercise(self):
+        """Начало упражнения с интервалами"""
+        max_semitones = max(info["semitones"] for info in self.intervals.values())
+        self.interval_engine.roots = self.root_choices(max_semitones)
+        self.attach_interval_sampler()
+        self.interval_engine.start()
+        self.update_interval_statistics()
+        self.warm_up_interval_cache()
+        self.next_interval_round()
+    
+    def stop_interval_exercise(self):
+        """Остановка упражнения с интервалами"""
+        self.interval_engine.stop()
+        self.save_interval_scheduler()
+        self.interval_result_label.config(text="Упражнение остановлено", fg=self.colors['warning'])
+        self.interval_play_button.config(state=tk.DISABLED)
+    
+    def check_chord_answer(self, selected_chord):
+        """Проверка ответа в упражнении по определению аккордов"""
+        result = self.chord_engine.submit_answer(selected_chord)
+        if result is None:
+            return
+        self.record_answer(self.chord_engine, selected_chord, result)
+        
+        if result["correct"]:
+            self.chord_result_label.config(text="✓ Правильно!", fg=self.colors['success'])
+            self.play_feedback_sound(True)
+        else:
+            chord_info = self.chords[result["expected"]]
+            _, _, inversion, voicing = result["item"]
+            inversion_name = INVERSION_NAMES[len(chord_info["semitones"])][inversion]
+            self.chord_result_label.config(
+                text=f"✗ Неправильно! Правильный ответ: {result['expected']}\n"
+                     f"Структура: {chord_info['structure']}\n"
+                     f"Звучал: {inversion_name}, расположение {VOICING_TITLES[voicing]}\n"
+                     f"Характер: {chord_info['character']}", 
+                fg=self.colors['danger']
+            )
+            self.play_feedback_sound(False)
         
-        # Добавляем данные
-        for chord_name, info in self.chords.items():
-            tree.insert("", tk.END, values=(
-                chord_name,
-                info["structure"],
-                info["example"],
-                info["character"]
-            ))
+        self.update_chord_statistics()
+        self.root.after(2000, self.next_chord_round)
+    
+    def next_chord_round(self):
+        """Начало следующего раунда в упражнении с аккордами"""
+        if self.chord_engine.active:
+            self.audio_worker.cancel()
+            chord_name, root, inversion, voicing = self.chord_engine.next_item()
+            self.render_chord_buffer(root, chord_name, True, inversion, voicing)
+            self.render_chord_buffer(root, chord_name, False, inversion, voicing)
+            self.chord_result_label.config(text="Слушайте аккорд...", fg=self.colors['accent'])
+            self.chord_play_button.config(state=tk.NORMAL)
+    
+    def update_chord_statistics(self):
+        """Обновление статистики для упражнения с аккордами"""
+        text = self.format_statistics(self.chord_engine)
+        if text:
+            self.chord_stats_label.config(text=text)
+    
+    def start_chord_exercise(self):
+        """Начало упражнения с аккордами"""
+        max_semitones = max(max(info["semitones"]) for info in self.chords.values())
+        self.chord_engine.roots = self.root_choices(max_semitones)
+        self.attach_adaptive_sampler(self.chord_engine)
+        self.chord_engine.start()
+        self.update_chord_statistics()
+        self.warm_up_chord_cache()
+        self.next_chord_round()
+    
+    def stop_chord_exercise(self):
+        """Остановка упражнения с аккордами"""
+        self.chord_engine.stop()
+        self.chord_result_label.config(text="Упражнение остановлено", fg=self.colors['warning'])
+        self.chord_play_button.config(state=tk.DISABLED)
+    
+    def difficulty_text(self, difficulty):
+        """Подпись уровня сложности: обращения и расположения аккордов"""
+        level = CHORD_VOICING_LEVELS[difficulty]
+        inversions = "с обращениями" if level["inversions"] > 1 else "основной вид"
+        voicings = ", ".join(VOICING_TITLES[voicing] for voicing in level["voicings"])
+        return f"Текущий уровень: {difficulty} ({inversions}; расположение: {voicings})"
+    
+    def set_difficulty(self, difficulty):
+        """Установка уровня сложности"""
+        self.current_difficulty = difficulty
+        self.chord_engine.difficulty = difficulty
+        self.difficulty_label.config(text=self.difficulty_text(difficulty))
         
-        # Стиль
-        style = ttk.Style()
-        style.configure("Treeview", 
-                       background=self.colors['light_bg'],
-                       foreground='black',
-                       rowheight=25,
-                       fieldbackground=self.colors['light_bg'])
-        style.map('Treeview', background=[('selected', self.colors['accent'])])
+        if self.chord_engine.active:
+            if self.chord_engine.sampler is not None:
+                self.attach_adaptive_sampler(self.chord_engine)
+            self.warm_up_chord_cache()
+            self.next_chord_round()
     
-    def note_recognition_exercise(self):
-        """Упражнение на распознавание нот"""
-        self.clear_window()
+    def chord_recognition_exercise(self):
+        """Упражнение на распознавание аккордов"""
+        self.screens.show("chords", self.build_chord_screen, self.enter_chord_screen)
+    
+    def build_chord_screen(self, screen):
+        """Экран упражнения на аккорды: строится один раз"""
         
         # Главный контейнер
-        main_container = tk.Frame(self.root, bg=self.colors['bg'])
+        main_container = tk.Frame(screen, bg=self.colors['bg'])
         main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
         # Заголовок
         header_frame = tk.Frame(main_container, bg=self.colors['bg'])
         header_frame.pack(fill=tk.X, pady=(0, 20))
         
-        tk.Label(header_frame, text="🎵 Определение нот", 
+        tk.Label(header_frame, text="🎹 Определение аккордов", 
                 font=self.fonts['title'], bg=self.colors['bg'], 
                 fg=self.colors['fg']).pack()
         
@@ -795,96 +4577,130 @@ class SolfeggioApp:
                              relief=tk.RAISED, bd=1)
         desc_frame.pack(fill=tk.X, pady=(0, 20), padx=10)
         
-        desc_text = """Слушайте звучащую ноту и выбирайте соответствующую ноту из списка.
-        Ноты представлены в диапазоне первой октавы."""
+        desc_text = """Слушайте звучащий аккорд и определяйте его тип.
+        Аккорды звучат от различных базовых нот. Уровень сложности определяет типы аккордов
+        и их вид: на начальном - основной вид в тесном расположении, на среднем добавляются
+        обращения, на продвинутом - еще широкое и разнесенное расположение."""
         
         tk.Label(desc_frame, text=desc_text, font=self.fonts['normal'], 
                 bg=self.colors['card'], fg=self.colors['fg'], 
                 wraplength=600, justify=tk.LEFT, padx=15, pady=10).pack()
         
+        # Уровень сложности
+        difficulty_frame = tk.Frame(main_container, bg=self.colors['bg'])
+        difficulty_frame.pack(fill=tk.X, pady=10)
+        
+        tk.Label(difficulty_frame, text="Уровень сложности:", 
+                font=self.fonts['normal'], bg=self.colors['bg'], 
+                fg=self.colors['fg']).pack(side=tk.LEFT, padx=5)
+        
+        difficulties = ["Начальный", "Средний", "Продвинутый"]
+        for diff in difficulties:
+            btn = tk.Button(difficulty_frame, text=diff, font=self.fonts['small'],
+                          command=lambda d=diff: self.set_difficulty(d),
+                          bg=self.colors['card'], fg=self.colors['fg'],
+                          cursor='hand2', relief=tk.RAISED, bd=0, padx=10, pady=5,
+                          activebackground='#3d566e', activeforeground='white')
+            btn.pack(side=tk.LEFT, padx=2)
+        
+        # Способ звучания аккорда: арпеджио или одновременно
+        self.chord_harmonic = tk.BooleanVar(value=False)
+        self.create_option_checkbutton(difficulty_frame, "Гармонически (одновременно)",
+                                       self.chord_harmonic).config(command=self.change_chord_playback)
+        # Адаптивный режим: аккорды с ошибками звучат чаще
+        self.adaptive_modes["chords"] = tk.BooleanVar(value=False)
+        self.create_option_checkbutton(difficulty_frame, "Чаще ошибочные", self.adaptive_modes["chords"])
+        
+        # Метка текущего уровня сложности
+        self.difficulty_label = tk.Label(main_container, 
+                                        text=self.difficulty_text(self.current_difficulty),
+                                        font=self.fonts['normal'], bg=self.colors['bg'], 
+                                        fg=self.colors['accent'])
+        self.difficulty_label.pack(pady=5)
+        
         # Панель управления
         control_frame = tk.Frame(main_container, bg=self.colors['bg'])
         control_frame.pack(fill=tk.X, pady=20)
         
         # Кнопка справки
-        help_btn = tk.Button(control_frame, text="📖 Справка по нотам", 
+        help_btn = tk.Button(control_frame, text="📖 Справка по аккордам", 
                            font=self.fonts['small'], bg=self.colors['card'],
-                           fg=self.colors['fg'], command=self.show_note_reference,
+                           fg=self.colors['fg'], command=self.show_chord_reference,
                            cursor='hand2', relief=tk.RAISED, bd=0, padx=15, pady=8,
                            activebackground='#3d566e', activeforeground='white')
         help_btn.pack(side=tk.LEFT, padx=5)
         
-        # Кнопка для проигрывания ноты
-        self.play_button = tk.Button(control_frame, text="🎵 Проиграть ноту", 
-                                    font=self.fonts['normal'], bg=self.colors['accent'],
-                                    fg='white', width=15, height=1,
-                                    command=lambda: self.play_note_sound(self.current_note),
-                                    cursor='hand2', relief=tk.RAISED, bd=0,
-                                    activebackground='#2980b9', activeforeground='white')
-        self.play_button.pack(side=tk.LEFT, padx=5)
-        self.play_button.config(state=tk.DISABLED)
+        # Кнопка для проигрывания аккорда
+        self.chord_play_button = tk.Button(control_frame, text="🎵 Проиграть аккорд", 
+                                          font=self.fonts['normal'], bg=self.colors['accent'],
+                                          fg='white', width=18, height=1,
+                                          command=self.play_current_chord,
+                                          cursor='hand2', relief=tk.RAISED, bd=0,
+                                          activebackground='#2980b9', activeforeground='white')
+        self.chord_play_button.pack(side=tk.LEFT, padx=5)
+        self.chord_play_button.config(state=tk.DISABLED)
         
         # Кнопки управления
         start_btn = tk.Button(control_frame, text="▶ Начать упражнение", 
                              font=self.fonts['normal'], bg=self.colors['success'],
-                             fg='white', width=15, height=1,
-                             command=self.start_exercise, cursor='hand2',
+                             fg='white', width=18, height=1,
+                             command=self.start_chord_exercise, cursor='hand2',
                              relief=tk.RAISED, bd=0,
                              activebackground='#27ae60', activeforeground='white')
         start_btn.pack(side=tk.LEFT, padx=5)
         
         stop_btn = tk.Button(control_frame, text="■ Остановить", 
                             font=self.fonts['normal'], bg=self.colors['danger'],
-                            fg='white', width=15, height=1,
-                            command=self.stop_exercise, cursor='hand2',
+                            fg='white', width=18, height=1,
+                            command=self.stop_chord_exercise, cursor='hand2',
                             relief=tk.RAISED, bd=0,
                             activebackground='#c0392b', activeforeground='white')
         stop_btn.pack(side=tk.LEFT, padx=5)
         
         # Результат
-        self.result_label = tk.Label(main_container, text="Нажмите 'Начать упражнение'", 
-                                    font=self.fonts['subheading'], bg=self.colors['bg'], 
-                                    fg=self.colors['accent'], pady=10)
-        self.result_label.pack()
+        self.chord_result_label = tk.Label(main_container, text="Нажмите 'Начать упражнение'", 
+                                          font=self.fonts['subheading'], bg=self.colors['bg'], 
+                                          fg=self.colors['accent'], pady=10)
+        self.chord_result_label.pack()
         
         # Статистика
         stats_frame = tk.Frame(main_container, bg=self.colors['card'], 
                               relief=tk.SUNKEN, bd=1)
         stats_frame.pack(pady=10, padx=50, fill=tk.X)
         
-        self.stats_label = tk.Label(stats_frame, text="Правильно: 0/0 (0%)", 
-                                   font=self.fonts['normal'], bg=self.colors['card'], 
-                                   fg=self.colors['fg'], padx=20, pady=10)
-        self.stats_label.pack()
+        self.chord_stats_label = tk.Label(stats_frame, text="Правильно: 0/0 (0%)", 
+                                         font=self.fonts['normal'], bg=self.colors['card'], 
+                                         fg=self.colors['fg'], padx=20, pady=10)
+        self.chord_stats_label.pack()
         
-        # Кнопки с нотами
-        notes_frame = tk.Frame(main_container, bg=self.colors['bg'])
-        notes_frame.pack(fill=tk.BOTH, expand=True, pady=20)
+        # Кнопки с аккордами
+        chords_frame = tk.Frame(main_container, bg=self.colors['bg'])
+        chords_frame.pack(fill=tk.BOTH, expand=True, pady=20)
         
-        notes = list(self.note_frequencies.keys())
+        chord_names = list(self.chords.keys())
         
-        # Создаем кнопки в сетке 2x4
-        for i, note in enumerate(notes):
-            row = i // 4
-            col = i % 4
+        # Создаем кнопки в сетке 4x2
+        for i, chord in enumerate(chord_names):
+            row = i // 2
+            col = i % 2
             
-            btn_frame = tk.Frame(notes_frame, bg=self.colors['bg'])
+            btn_frame = tk.Frame(chords_frame, bg=self.colors['bg'])
             btn_frame.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
             
-            btn_text = f"{note}\n({self.notes_dict[note]})"
-            btn = tk.Button(btn_frame, text=btn_text, 
-                          font=self.fonts['heading'], bg=self.colors['card'],
-                          fg=self.colors['fg'], width=8, height=3,
-                          command=lambda n=note: self.check_note_answer(n),
+            btn = tk.Button(btn_frame, text=chord, 
+                          font=self.fonts['normal'], bg=self.colors['card'],
+                          fg=self.colors['fg'], width=25, height=2,
+                          command=lambda c=chord: self.check_chord_answer(c),
                           cursor='hand2', relief=tk.RAISED, bd=0,
-                          activebackground='#3d566e', activeforeground='white')
+                          activebackground='#3d566e', activeforeground='white',
+                          wraplength=200)
             btn.pack(fill=tk.BOTH, expand=True)
         
         # Настройка сетки
-        for i in range(2):
-            notes_frame.rowconfigure(i, weight=1)
         for i in range(4):
-            notes_frame.columnconfigure(i, weight=1)
+            chords_frame.rowconfigure(i, weight=1)
+        for i in range(2):
+            chords_frame.columnconfigure(i, weight=1)
         
         # Панель навигации
         nav_frame = tk.Frame(main_container, bg=self.colors['bg'])
@@ -902,86 +4718,41 @@ class SolfeggioApp:
                            font=self.fonts['normal'], bg=self.colors['card'],
                            fg=self.colors['fg'], padx=20, pady=8,
                            command=self.create_main_menu, cursor='hand2',
-                           relief=tk.RAISED, bd=0,
-                           activebackground='#3d566e', activeforeground='white')
+                            relief=tk.RAISED, bd=0,
+                            activebackground='#3d566e', activeforeground='white')
         home_btn.pack(side=tk.LEFT, padx=5)
         
-        # Инициализация состояния упражнения
-        self.game_active = False
-        self.current_note = None
-    
-    def generate_random_note(self):
-        """Генерация случайной ноты"""
-        notes = list(self.note_frequencies.keys())
-        return random.choice(notes)
-    
-    def check_note_answer(self, selected_note):
-        """Проверка ответа в упражнении по определению нот"""
-        if not self.game_active or self.current_note is None:
-            return
-        
-        self.total_attempts += 1
-        
-        if selected_note == self.current_note:
-            self.score += 1
-            self.result_label.config(text="✓ Правильно!", fg=self.colors['success'])
-            threading.Thread(
-                target=lambda: winsound.Beep(800, 300)
-            ).start()
-        else:
-            self.result_label.config(
-                text=f"✗ Неправильно! Правильный ответ: {self.current_note} ({self.notes_dict[self.current_note]})", 
-                fg=self.colors['danger']
-            )
-            threading.Thread(
-                target=lambda: winsound.Beep(400, 500)
-            ).start()
-        
-        self.update_statistics()
-        self.root.after(1500, self.next_round)
-    
-    def next_round(self):
-        """Начало следующего раунда"""
-        if self.game_active:
-            self.current_note = self.generate_random_note()
-            self.result_label.config(text="Слушайте ноту...", fg=self.colors['accent'])
-            self.play_button.config(state=tk.NORMAL)
-    
-    def update_statistics(self):
-        """Обновление статистики"""
-        if self.total_attempts > 0:
-            accuracy = (self.score / self.total_attempts) * 100
-            self.stats_label.config(
-                text=f"Правильно: {self.score}/{self.total_attempts} ({accuracy:.1f}%)"
-            )
+        times_btn = tk.Button(nav_frame, text="⏱ Время реакции", 
+                            font=self.fonts['normal'], bg=self.colors['card'],
+                            fg=self.colors['fg'], padx=20, pady=8,
+                            command=lambda: self.show_response_times(self.chord_engine, "аккордов"),
+                            cursor='hand2', relief=tk.RAISED, bd=0,
+                            activebackground='#3d566e', activeforeground='white')
+        times_btn.pack(side=tk.RIGHT, padx=5)
     
-    def start_exercise(self):
-        """Начало упражнения"""
-        self.game_active = True
-        self.score = 0
-        self.total_attempts = 0
-        self.update_statistics()
-        self.next_round()
+    def enter_chord_screen(self):
+        """Вход на экран: упражнение остановлено до нажатия 'Начать'"""
+        self.chord_engine.stop()
+        self.chord_result_label.config(text="Нажмите 'Начать упражнение'", fg=self.colors['accent'])
+        self.chord_play_button.config(state=tk.DISABLED)
+        self.difficulty_label.config(text=self.difficulty_text(self.current_difficulty))
     
-    def stop_exercise(self):
-        """Остановка упражнения"""
-        self.game_active = False
-        self.result_label.config(text="Упражнение остановлено", fg=self.colors['warning'])
-        self.play_button.config(state=tk.DISABLED)
+    def dictation_exercise(self):
+        """Мелодический диктант"""
+        self.screens.show("dictation", self.build_dictation_screen, self.enter_dictation_screen)
     
-    def interval_recognition_exercise(self):
-        """Упражнение на распознавание интервалов"""
-        self.clear_window()
+    def build_dictation_screen(self, screen):
+        """Экран диктанта: строится один раз"""
         
         # Главный контейнер
-        main_container = tk.Frame(self.root, bg=self.colors['bg'])
+        main_container = tk.Frame(screen, bg=self.colors['bg'])
         main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
         # Заголовок
         header_frame = tk.Frame(main_container, bg=self.colors['bg'])
         header_frame.pack(fill=tk.X, pady=(0, 20))
         
-        tk.Label(header_frame, text="📐 Определение интервалов", 
+        tk.Label(header_frame, text="✍️ Мелодический диктант", 
                 font=self.fonts['title'], bg=self.colors['bg'], 
                 fg=self.colors['fg']).pack()
         
@@ -990,8 +4761,9 @@ class SolfeggioApp:
                              relief=tk.RAISED, bd=1)
         desc_frame.pack(fill=tk.X, pady=(0, 20), padx=10)
         
-        desc_text = """Слушайте звучащий интервал и выбирайте соответствующий интервал из списка.
-        Интервалы представлены от примы до октавы."""
+        desc_text = """Прослушайте мелодию в до мажоре и запишите ее кнопками нот.
+        Мелодия начинается с тоники или ее трезвучия и заканчивается тоникой.
+        После проверки видно, какие ноты записаны верно, а какие пропущены или лишние."""
         
         tk.Label(desc_frame, text=desc_text, font=self.fonts['normal'], 
                 bg=self.colors['card'], fg=self.colors['fg'], 
@@ -1001,30 +4773,19 @@ class SolfeggioApp:
         control_frame = tk.Frame(main_container, bg=self.colors['bg'])
         control_frame.pack(fill=tk.X, pady=20)
         
-        # Кнопка справки
-        help_btn = tk.Button(control_frame, text="📖 Справка по интервалам", 
-                           font=self.fonts['small'], bg=self.colors['card'],
-                           fg=self.colors['fg'], command=self.show_interval_reference,
-                           cursor='hand2', relief=tk.RAISED, bd=0, padx=15, pady=8,
-                           activebackground='#3d566e', activeforeground='white')
-        help_btn.pack(side=tk.LEFT, padx=5)
-        
-        # Кнопка для проигрывания интервала
-        self.interval_play_button = tk.Button(control_frame, text="🎵 Проиграть интервал", 
-                                             font=self.fonts['normal'], bg=self.colors['accent'],
-                                             fg='white', width=18, height=1,
-                                             command=lambda: self.play_interval_sound(
-                                                 self.current_base_note_interval, self.current_interval),
-                                             cursor='hand2', relief=tk.RAISED, bd=0,
-                                             activebackground='#2980b9', activeforeground='white')
-        self.interval_play_button.pack(side=tk.LEFT, padx=5)
-        self.interval_play_button.config(state=tk.DISABLED)
+        self.dictation_play_button = tk.Button(control_frame, text="🎵 Проиграть мелодию", 
+                                              font=self.fonts['normal'], bg=self.colors['accent'],
+                                              fg='white', width=18, height=1,
+                                              command=self.play_current_dictation,
+                                              cursor='hand2', relief=tk.RAISED, bd=0,
+                                              activebackground='#2980b9', activeforeground='white')
+        self.dictation_play_button.pack(side=tk.LEFT, padx=5)
+        self.dictation_play_button.config(state=tk.DISABLED)
         
-        # Кнопки управления
         start_btn = tk.Button(control_frame, text="▶ Начать упражнение", 
                              font=self.fonts['normal'], bg=self.colors['success'],
                              fg='white', width=18, height=1,
-                             command=self.start_interval_exercise, cursor='hand2',
+                             command=self.start_dictation_exercise, cursor='hand2',
                              relief=tk.RAISED, bd=0,
                              activebackground='#27ae60', activeforeground='white')
         start_btn.pack(side=tk.LEFT, padx=5)
@@ -1032,56 +4793,68 @@ class SolfeggioApp:
         stop_btn = tk.Button(control_frame, text="■ Остановить", 
                             font=self.fonts['normal'], bg=self.colors['danger'],
                             fg='white', width=18, height=1,
-                            command=self.stop_interval_exercise, cursor='hand2',
+                            command=self.stop_dictation_exercise, cursor='hand2',
                             relief=tk.RAISED, bd=0,
                             activebackground='#c0392b', activeforeground='white')
         stop_btn.pack(side=tk.LEFT, padx=5)
         
+        tk.Label(control_frame, text="Нот:", font=self.fonts['normal'], 
+                bg=self.colors['bg'], fg=self.colors['fg']).pack(side=tk.LEFT, padx=(15, 5))
+        self.dictation_length_var = tk.StringVar(value=str(self.dictation_engine.length))
+        tk.Spinbox(control_frame, from_=4, to=16, width=4, textvariable=self.dictation_length_var,
+                  font=self.fonts['normal'], command=self.change_dictation_length).pack(side=tk.LEFT)
+        
         # Результат
-        self.interval_result_label = tk.Label(main_container, 
-                                             text="Нажмите 'Начать упражнение'", 
-                                             font=self.fonts['subheading'], bg=self.colors['bg'], 
-                                             fg=self.colors['accent'], pady=10)
-        self.interval_result_label.pack()
+        self.dictation_result_label = tk.Label(main_container, 
+                                              text="Нажмите 'Начать упражнение'", 
+                                              font=self.fonts['subheading'], bg=self.colors['bg'], 
+                                              fg=self.colors['accent'], pady=10, wraplength=800)
+        self.dictation_result_label.pack()
+        
+        # Записанные ноты
+        entry_frame = tk.Frame(main_container, bg='white', relief=tk.SUNKEN, bd=2)
+        entry_frame.pack(pady=10, padx=50, fill=tk.X)
+        self.dictation_entry_label = tk.Label(entry_frame, text="", font=self.fonts['subheading'],
+                                             bg='white', fg='black', pady=10)
+        self.dictation_entry_label.pack()
         
         # Статистика
         stats_frame = tk.Frame(main_container, bg=self.colors['card'], 
-                              relief=tk.SUNKEN, bd=1)
-        stats_frame.pack(pady=10, padx=50, fill=tk.X)
-        
-        self.interval_stats_label = tk.Label(stats_frame, text="Правильно: 0/0 (0%)", 
-                                            font=self.fonts['normal'], bg=self.colors['card'], 
-                                            fg=self.colors['fg'], padx=20, pady=10)
-        self.interval_stats_label.pack()
-        
-        # Кнопки с интервалами
-        intervals_frame = tk.Frame(main_container, bg=self.colors['bg'])
-        intervals_frame.pack(fill=tk.BOTH, expand=True, pady=20)
-        
-        interval_names = list(self.intervals.keys())
-        
-        # Создаем кнопки в сетке 4x4
-        for i, interval in enumerate(interval_names):
-            row = i // 4
-            col = i % 4
-            
-            btn_frame = tk.Frame(intervals_frame, bg=self.colors['bg'])
-            btn_frame.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
-            
-            btn = tk.Button(btn_frame, text=interval, 
-                          font=self.fonts['normal'], bg=self.colors['card'],
-                          fg=self.colors['fg'], width=15, height=2,
-                          command=lambda i=interval: self.check_interval_answer(i),
-                          cursor='hand2', relief=tk.RAISED, bd=0,
-                          activebackground='#3d566e', activeforeground='white',
-                          wraplength=150)
-            btn.pack(fill=tk.BOTH, expand=True)
+                              relief=tk.SUNKEN, bd=1)
+        stats_frame.pack(pady=10, padx=50, fill=tk.X)
         
-        # Настройка сетки
-        for i in range(4):
-            intervals_frame.rowconfigure(i, weight=1)
-        for i in range(4):
-            intervals_frame.columnconfigure(i, weight=1)
+        self.dictation_stats_label = tk.Label(stats_frame, text="Правильно: 0/0 (0%)", 
+                                             font=self.fonts['normal'], bg=self.colors['card'], 
+                                             fg=self.colors['fg'], padx=20, pady=10)
+        self.dictation_stats_label.pack()
+        
+        # Кнопки нот: ступени до мажора от тоники до тоники октавой выше
+        notes_frame = tk.Frame(main_container, bg=self.colors['bg'])
+        notes_frame.pack(fill=tk.X, pady=10)
+        
+        tonic = self.dictation_engine.tonic
+        for step in MAJOR_SCALE_STEPS:
+            midi = tonic + step
+            tk.Button(notes_frame, text=PitchTable.name(midi), 
+                     font=self.fonts['normal'], bg=self.colors['card'],
+                     fg=self.colors['fg'], width=7, height=2,
+                     command=lambda m=midi: self.add_dictation_note(m),
+                     cursor='hand2', relief=tk.RAISED, bd=0,
+                     activebackground='#3d566e', activeforeground='white').pack(side=tk.LEFT, padx=3)
+        
+        tk.Button(notes_frame, text="⌫", 
+                 font=self.fonts['normal'], bg=self.colors['card'],
+                 fg=self.colors['fg'], width=4, height=2,
+                 command=self.remove_dictation_note,
+                 cursor='hand2', relief=tk.RAISED, bd=0,
+                 activebackground='#3d566e', activeforeground='white').pack(side=tk.LEFT, padx=3)
+        
+        tk.Button(notes_frame, text="✓ Проверить", 
+                 font=self.fonts['normal'], bg=self.colors['success'],
+                 fg='white', width=12, height=2,
+                 command=self.check_dictation_answer,
+                 cursor='hand2', relief=tk.RAISED, bd=0,
+                 activebackground='#27ae60', activeforeground='white').pack(side=tk.LEFT, padx=10)
         
         # Панель навигации
         nav_frame = tk.Frame(main_container, bg=self.colors['bg'])
@@ -1102,165 +4875,134 @@ class SolfeggioApp:
                            relief=tk.RAISED, bd=0,
                            activebackground='#3d566e', activeforeground='white')
         home_btn.pack(side=tk.LEFT, padx=5)
-        
-        # Инициализация состояния упражнения
-        self.interval_game_active = False
-        self.current_interval = None
-        self.current_base_note_interval = None
-        
-    def generate_random_interval(self):
-        """Генерация случайного интервала"""
-        intervals = list(self.intervals.keys())
-        base_note = random.choice(list(self.note_frequencies.keys()))
-        return random.choice(intervals), base_note
     
-    def check_interval_answer(self, selected_interval):
-        """Проверка ответа в упражнении по определению интервалов"""
-        if not self.interval_game_active or self.current_interval is None:
+    def enter_dictation_screen(self):
+        """Вход на экран: упражнение остановлено до нажатия 'Начать'"""
+        self.dictation_engine.stop()
+        self.dictation_input = []
+        self.update_dictation_entry()
+        self.dictation_result_label.config(text="Нажмите 'Начать упражнение'", fg=self.colors['accent'])
+        self.dictation_play_button.config(state=tk.DISABLED)
+    
+    def play_current_dictation(self):
+        """Мелодия текущего диктанта потоком: звук начинается, не дожидаясь синтеза всей мелодии"""
+        melody = self.dictation_engine.current
+        if melody is None:
             return
-        
-        self.interval_attempts += 1
-        
-        if selected_interval == self.current_interval:
-            self.interval_score += 1
-            self.interval_result_label.config(text="✓ Правильно!", fg=self.colors['success'])
-            threading.Thread(
-                target=lambda: winsound.Beep(800, 300)
-            ).start()
-        else:
-            interval_info = self.intervals[self.current_interval]
-            self.interval_result_label.config(
-                text=f"✗ Неправильно! Правильный ответ: {self.current_interval}\n"
-                     f"Пример: {interval_info['example']}\n"
-                     f"Характер: {interval_info['character']}", 
-                fg=self.colors['danger']
-            )
-            threading.Thread(
-                target=lambda: winsound.Beep(400, 500)
-            ).start()
-        
-        self.update_interval_statistics()
-        self.root.after(2000, self.next_interval_round)
+        step = self.DICTATION_NOTE_MS + self.DICTATION_GAP_MS
+        frequencies = self.pitch_table.lookup(melody).tolist()
+        round_id = self.dictation_engine.round
+        self.play_stream(((frequency, i * step, self.DICTATION_NOTE_MS)
+                          for i, frequency in enumerate(frequencies)),
+                         on_done=lambda finished_ns: self.dictation_engine.mark_presented(round_id, finished_ns))
     
-    def next_interval_round(self):
-        """Начало следующего раунда в упражнении с интервалами"""
-        if self.interval_game_active:
-            self.current_interval, self.current_base_note_interval = self.generate_random_interval()
-            self.interval_result_label.config(text="Слушайте интервал...", fg=self.colors['accent'])
-            self.interval_play_button.config(state=tk.NORMAL)
+    def change_dictation_length(self):
+        """Длина мелодии; действует со следующего диктанта"""
+        try:
+            self.dictation_engine.length = min(16, max(4, int(self.dictation_length_var.get())))
+        except ValueError:
+            pass
     
-    def update_interval_statistics(self):
-        """Обновление статистики для упражнения с интервалами"""
-        if self.interval_attempts > 0:
-            accuracy = (self.interval_score / self.interval_attempts) * 100
-            self.interval_stats_label.config(
-                text=f"Правильно: {self.interval_score}/{self.interval_attempts} ({accuracy:.1f}%)"
-            )
+    def add_dictation_note(self, midi):
+        """Запись ноты в ответ"""
+        if self.dictation_engine.pending:
+            self.dictation_input.append(midi)
+            self.update_dictation_entry()
     
-    def start_interval_exercise(self):
-        """Начало упражнения с интервалами"""
-        self.interval_game_active = True
-        self.interval_score = 0
-        self.interval_attempts = 0
-        self.update_interval_statistics()
-        self.next_interval_round()
+    def remove_dictation_note(self):
+        """Удаление последней записанной ноты"""
+        if self.dictation_input:
+            self.dictation_input.pop()
+            self.update_dictation_entry()
     
-    def stop_interval_exercise(self):
-        """Остановка упражнения с интервалами"""
-        self.interval_game_active = False
-        self.interval_result_label.config(text="Упражнение остановлено", fg=self.colors['warning'])
-        self.interval_play_button.config(state=tk.DISABLED)
+    def update_dictation_entry(self):
+        self.dictation_entry_label.config(
+            text=" ".join(PitchTable.name(midi) for midi in self.dictation_input) or "—")
     
-    def generate_random_chord(self, difficulty=None):
-        """Генерация случайного аккорда"""
-        if difficulty is None:
-            difficulty = self.current_difficulty
-        
-        available_chords = self.difficulty_levels[difficulty]
-        chord_name = random.choice(available_chords)
-        base_note = random.choice(list(self.note_frequencies.keys()))
-        
-        return chord_name, base_note
+    @staticmethod
+    def format_alignment(operations):
+        """Разбор диктанта: верные ноты, замены [было→записано], пропуски [-нота] и лишние [+нота]"""
+        parts = []
+        for operation, expected, answer in operations:
+            if operation == "match":
+                parts.append(PitchTable.name(expected))
+            elif operation == "substitute":
+                parts.append(f"[{PitchTable.name(expected)}→{PitchTable.name(answer)}]")
+            elif operation == "delete":
+                parts.append(f"[-{PitchTable.name(expected)}]")
+            else:
+                parts.append(f"[+{PitchTable.name(answer)}]")
+        return " ".join(parts)
     
-    def check_chord_answer(self, selected_chord):
-        """Проверка ответа в упражнении по определению аккордов"""
-        if not self.chord_game_active or self.current_chord is None:
+    def check_dictation_answer(self):
+        """Проверка записанного диктанта выравниванием с мелодией"""
+        answer = tuple(self.dictation_input)
+        result = self.dictation_engine.submit_answer(answer)
+        if result is None:
             return
+        self.record_answer(self.dictation_engine, answer, result)
         
-        self.chord_attempts += 1
-        
-        if selected_chord == self.current_chord:
-            self.chord_score += 1
-            self.chord_result_label.config(text="✓ Правильно!", fg=self.colors['success'])
-            threading.Thread(
-                target=lambda: winsound.Beep(800, 300)
-            ).start()
+        if result["correct"]:
+            self.dictation_result_label.config(text="✓ Правильно! Диктант записан без ошибок", 
+                                               fg=self.colors['success'])
+            self.play_feedback_sound(True)
         else:
-            chord_info = self.chords[self.current_chord]
-            self.chord_result_label.config(
-                text=f"✗ Неправильно! Правильный ответ: {self.current_chord}\n"
-                     f"Структура: {chord_info['structure']}\n"
-                     f"Характер: {chord_info['character']}", 
+            self.dictation_result_label.config(
+                text=f"✗ Ошибок: {result['distance']}, верных нот: {result['note_accuracy'] * 100:.0f}%\n"
+                     f"{self.format_alignment(result['operations'])}", 
                 fg=self.colors['danger']
             )
-            threading.Thread(
-                target=lambda: winsound.Beep(400, 500)
-            ).start()
+            self.play_feedback_sound(False)
         
-        self.update_chord_statistics()
-        self.root.after(2000, self.next_chord_round)
+        self.update_dictation_statistics()
+        self.root.after(3000, self.next_dictation_round)
     
-    def next_chord_round(self):
-        """Начало следующего раунда в упражнении с аккордами"""
-        if self.chord_game_active:
-            self.current_chord, self.current_base_note = self.generate_random_chord()
-            self.chord_result_label.config(text="Слушайте аккорд...", fg=self.colors['accent'])
-            self.chord_play_button.config(state=tk.NORMAL)
+    def next_dictation_round(self):
+        """Новая мелодия диктанта"""
+        if self.dictation_engine.active:
+            self.audio_worker.cancel()
+            self.dictation_engine.next_item()
+            self.dictation_input = []
+            self.update_dictation_entry()
+            self.dictation_result_label.config(text="Слушайте мелодию и записывайте...", 
+                                               fg=self.colors['accent'])
+            self.dictation_play_button.config(state=tk.NORMAL)
     
-    def update_chord_statistics(self):
-        """Обновление статистики для упражнения с аккордами"""
-        if self.chord_attempts > 0:
-            accuracy = (self.chord_score / self.chord_attempts) * 100
-            self.chord_stats_label.config(
-                text=f"Правильно: {self.chord_score}/{self.chord_attempts} ({accuracy:.1f}%)"
-            )
+    def update_dictation_statistics(self):
+        """Обновление статистики диктанта"""
+        text = self.format_statistics(self.dictation_engine)
+        if text:
+            self.dictation_stats_label.config(text=text)
     
-    def start_chord_exercise(self):
-        """Начало упражнения с аккордами"""
-        self.chord_game_active = True
-        self.chord_score = 0
-        self.chord_attempts = 0
-        self.update_chord_statistics()
-        self.next_chord_round()
+    def start_dictation_exercise(self):
+        """Начало диктанта"""
+        self.change_dictation_length()
+        self.dictation_engine.start()
+        self.update_dictation_statistics()
+        self.next_dictation_round()
     
-    def stop_chord_exercise(self):
-        """Остановка упражнения с аккордами"""
-        self.chord_game_active = False
-        self.chord_result_label.config(text="Упражнение остановлено", fg=self.colors['warning'])
-        self.chord_play_button.config(state=tk.DISABLED)
+    def stop_dictation_exercise(self):
+        """Остановка диктанта"""
+        self.dictation_engine.stop()
+        self.dictation_result_label.config(text="Упражнение остановлено", fg=self.colors['warning'])
+        self.dictation_play_button.config(state=tk.DISABLED)
     
-    def set_difficulty(self, difficulty):
-        """Установка уровня сложности"""
-        self.current_difficulty = difficulty
-        difficulty_text = f"Текущий уровень: {difficulty}"
-        self.difficulty_label.config(text=difficulty_text)
-        
-        if self.chord_game_active:
-            self.next_chord_round()
+    def singing_exercise(self):
+        """Пение нот с проверкой высоты по микрофону"""
+        self.screens.show("singing", self.build_singing_screen, self.enter_singing_screen)
     
-    def chord_recognition_exercise(self):
-        """Упражнение на распознавание аккордов"""
-        self.clear_window()
+    def build_singing_screen(self, screen):
+        """Экран пения нот: строится один раз"""
         
         # Главный контейнер
-        main_container = tk.Frame(self.root, bg=self.colors['bg'])
+        main_container = tk.Frame(screen, bg=self.colors['bg'])
         main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
         # Заголовок
         header_frame = tk.Frame(main_container, bg=self.colors['bg'])
         header_frame.pack(fill=tk.X, pady=(0, 20))
         
-        tk.Label(header_frame, text="🎹 Определение аккордов", 
+        tk.Label(header_frame, text="🎤 Пение нот", 
                 font=self.fonts['title'], bg=self.colors['bg'], 
                 fg=self.colors['fg']).pack()
         
@@ -1269,66 +5011,31 @@ class SolfeggioApp:
                              relief=tk.RAISED, bd=1)
         desc_frame.pack(fill=tk.X, pady=(0, 20), padx=10)
         
-        desc_text = """Слушайте звучащий аккорд и определяйте его тип.
-        Аккорды представлены в основном виде от различных базовых нот.
-        Уровень сложности определяет, какие типы аккордов будут использоваться."""
+        desc_text = """Прослушайте ноту и спойте ее на слог (например, "ля") в удобной октаве.
+        Программа слушает микрофон и показывает, какую ноту вы поете и на сколько центов
+        она выше или ниже точной. Нота засчитывается, когда вы удерживаете ее полсекунды."""
         
         tk.Label(desc_frame, text=desc_text, font=self.fonts['normal'], 
                 bg=self.colors['card'], fg=self.colors['fg'], 
                 wraplength=600, justify=tk.LEFT, padx=15, pady=10).pack()
         
-        # Уровень сложности
-        difficulty_frame = tk.Frame(main_container, bg=self.colors['bg'])
-        difficulty_frame.pack(fill=tk.X, pady=10)
-        
-        tk.Label(difficulty_frame, text="Уровень сложности:", 
-                font=self.fonts['normal'], bg=self.colors['bg'], 
-                fg=self.colors['fg']).pack(side=tk.LEFT, padx=5)
-        
-        difficulties = ["Начальный", "Средний", "Продвинутый"]
-        for diff in difficulties:
-            btn = tk.Button(difficulty_frame, text=diff, font=self.fonts['small'],
-                          command=lambda d=diff: self.set_difficulty(d),
-                          bg=self.colors['card'], fg=self.colors['fg'],
-                          cursor='hand2', relief=tk.RAISED, bd=0, padx=10, pady=5,
-                          activebackground='#3d566e', activeforeground='white')
-            btn.pack(side=tk.LEFT, padx=2)
-        
-        # Метка текущего уровня сложности
-        self.difficulty_label = tk.Label(main_container, 
-                                        text=f"Текущий уровень: {self.current_difficulty}",
-                                        font=self.fonts['normal'], bg=self.colors['bg'], 
-                                        fg=self.colors['accent'])
-        self.difficulty_label.pack(pady=5)
-        
         # Панель управления
         control_frame = tk.Frame(main_container, bg=self.colors['bg'])
         control_frame.pack(fill=tk.X, pady=20)
         
-        # Кнопка справки
-        help_btn = tk.Button(control_frame, text="📖 Справка по аккордам", 
-                           font=self.fonts['small'], bg=self.colors['card'],
-                           fg=self.colors['fg'], command=self.show_chord_reference,
-                           cursor='hand2', relief=tk.RAISED, bd=0, padx=15, pady=8,
-                           activebackground='#3d566e', activeforeground='white')
-        help_btn.pack(side=tk.LEFT, padx=5)
-        
-        # Кнопка для проигрывания аккорда
-        self.chord_play_button = tk.Button(control_frame, text="🎵 Проиграть аккорд", 
-                                          font=self.fonts['normal'], bg=self.colors['accent'],
-                                          fg='white', width=18, height=1,
-                                          command=lambda: self.play_chord_sound(
-                                              self.current_base_note, self.current_chord),
-                                          cursor='hand2', relief=tk.RAISED, bd=0,
-                                          activebackground='#2980b9', activeforeground='white')
-        self.chord_play_button.pack(side=tk.LEFT, padx=5)
-        self.chord_play_button.config(state=tk.DISABLED)
+        self.singing_play_button = tk.Button(control_frame, text="🎵 Прослушать ноту", 
+                                            font=self.fonts['normal'], bg=self.colors['accent'],
+                                            fg='white', width=18, height=1,
+                                            command=self.play_current_singing_note,
+                                            cursor='hand2', relief=tk.RAISED, bd=0,
+                                            activebackground='#2980b9', activeforeground='white')
+        self.singing_play_button.pack(side=tk.LEFT, padx=5)
+        self.singing_play_button.config(state=tk.DISABLED)
         
-        # Кнопки управления
         start_btn = tk.Button(control_frame, text="▶ Начать упражнение", 
                              font=self.fonts['normal'], bg=self.colors['success'],
                              fg='white', width=18, height=1,
-                             command=self.start_chord_exercise, cursor='hand2',
+                             command=self.start_singing_exercise, cursor='hand2',
                              relief=tk.RAISED, bd=0,
                              activebackground='#27ae60', activeforeground='white')
         start_btn.pack(side=tk.LEFT, padx=5)
@@ -1336,55 +5043,34 @@ class SolfeggioApp:
         stop_btn = tk.Button(control_frame, text="■ Остановить", 
                             font=self.fonts['normal'], bg=self.colors['danger'],
                             fg='white', width=18, height=1,
-                            command=self.stop_chord_exercise, cursor='hand2',
+                            command=self.stop_singing_exercise, cursor='hand2',
                             relief=tk.RAISED, bd=0,
                             activebackground='#c0392b', activeforeground='white')
         stop_btn.pack(side=tk.LEFT, padx=5)
         
         # Результат
-        self.chord_result_label = tk.Label(main_container, text="Нажмите 'Начать упражнение'", 
-                                          font=self.fonts['subheading'], bg=self.colors['bg'], 
-                                          fg=self.colors['accent'], pady=10)
-        self.chord_result_label.pack()
+        self.singing_result_label = tk.Label(main_container, 
+                                            text="Нажмите 'Начать упражнение'", 
+                                            font=self.fonts['subheading'], bg=self.colors['bg'], 
+                                            fg=self.colors['accent'], pady=10)
+        self.singing_result_label.pack()
+        
+        # Что сейчас слышит программа
+        pitch_frame = tk.Frame(main_container, bg='white', relief=tk.SUNKEN, bd=2)
+        pitch_frame.pack(pady=10, padx=50, fill=tk.X)
+        self.singing_pitch_label = tk.Label(pitch_frame, text="—", font=self.fonts['title'],
+                                           bg='white', fg='black', pady=10)
+        self.singing_pitch_label.pack()
         
         # Статистика
         stats_frame = tk.Frame(main_container, bg=self.colors['card'], 
                               relief=tk.SUNKEN, bd=1)
         stats_frame.pack(pady=10, padx=50, fill=tk.X)
         
-        self.chord_stats_label = tk.Label(stats_frame, text="Правильно: 0/0 (0%)", 
-                                         font=self.fonts['normal'], bg=self.colors['card'], 
-                                         fg=self.colors['fg'], padx=20, pady=10)
-        self.chord_stats_label.pack()
-        
-        # Кнопки с аккордами
-        chords_frame = tk.Frame(main_container, bg=self.colors['bg'])
-        chords_frame.pack(fill=tk.BOTH, expand=True, pady=20)
-        
-        chord_names = list(self.chords.keys())
-        
-        # Создаем кнопки в сетке 4x2
-        for i, chord in enumerate(chord_names):
-            row = i // 2
-            col = i % 2
-            
-            btn_frame = tk.Frame(chords_frame, bg=self.colors['bg'])
-            btn_frame.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
-            
-            btn = tk.Button(btn_frame, text=chord, 
-                          font=self.fonts['normal'], bg=self.colors['card'],
-                          fg=self.colors['fg'], width=25, height=2,
-                          command=lambda c=chord: self.check_chord_answer(c),
-                          cursor='hand2', relief=tk.RAISED, bd=0,
-                          activebackground='#3d566e', activeforeground='white',
-                          wraplength=200)
-            btn.pack(fill=tk.BOTH, expand=True)
-        
-        # Настройка сетки
-        for i in range(4):
-            chords_frame.rowconfigure(i, weight=1)
-        for i in range(2):
-            chords_frame.columnconfigure(i, weight=1)
+        self.singing_stats_label = tk.Label(stats_frame, text="Правильно: 0/0 (0%)", 
+                                           font=self.fonts['normal'], bg=self.colors['card'], 
+                                           fg=self.colors['fg'], padx=20, pady=10)
+        self.singing_stats_label.pack()
         
         # Панель навигации
         nav_frame = tk.Frame(main_container, bg=self.colors['bg'])
@@ -1402,22 +5088,171 @@ class SolfeggioApp:
                            font=self.fonts['normal'], bg=self.colors['card'],
                            fg=self.colors['fg'], padx=20, pady=8,
                            command=self.create_main_menu, cursor='hand2',
-                            relief=tk.RAISED, bd=0,
-                            activebackground='#3d566e', activeforeground='white')
+                           relief=tk.RAISED, bd=0,
+                           activebackground='#3d566e', activeforeground='white')
         home_btn.pack(side=tk.LEFT, padx=5)
+    
+    def enter_singing_screen(self):
+        """Вход на экран: упражнение остановлено до нажатия 'Начать'"""
+        self.singing_engine.stop()
+        self.singing_result_label.config(text="Нажмите 'Начать упражнение'", fg=self.colors['accent'])
+        self.singing_pitch_label.config(text="—", fg='black')
+        self.singing_play_button.config(state=tk.DISABLED)
+        if not microphone_available():
+            self.singing_result_label.config(
+                text="Для записи с микрофона установите библиотеку sounddevice", 
+                fg=self.colors['warning'])
+    
+    def play_current_singing_note(self):
+        """Нота, которую нужно спеть"""
+        midi = self.singing_engine.current
+        if midi is not None:
+            # Пока звучит образец, микрофон слышит динамик: кадры не учитываются до конца звучания
+            self.singing_reference_playing = True
+            self.singing_hold = (0, 0)
+            round_id = self.singing_engine.round
+            self.play_question(self.singing_engine,
+                               self._cached_render([self.pitch_table.frequency(midi)], NOTE_LAYOUT),
+                               on_done=lambda finished_ns: self.root.after(
+                                   0, self.singing_reference_done, round_id))
+    
+    def singing_reference_done(self, round_id):
+        """Образец доиграл: запись с микрофона включается (в потоке интерфейса)"""
+        if not self.singing_engine.active or self.singing_engine.round != round_id:
+            return
+        self.singing_reference_playing = False
+        self.start_listening()
+    
+    def start_listening(self):
+        """Запуск фонового потока записи с микрофона"""
+        if self.listen_stop is not None:
+            return
+        if not microphone_available():
+            self.singing_result_label.config(
+                text="Для записи с микрофона установите библиотеку sounddevice", 
+                fg=self.colors['warning'])
+            return
+        self.listen_stop = threading.Event()
+        tracker = PitchTracker(PitchDetector(pitch_table=self.pitch_table))
+        threading.Thread(target=self._listen_worker, args=(tracker, self.listen_stop),
+                         name="pitch-listener", daemon=True).start()
+        self.poll_pitch_queue()
+    
+    def _listen_worker(self, tracker, stop_event):
+        """Поток записи: кадры высоты тона складываются в очередь для интерфейса"""
+        try:
+            listen_microphone(tracker, self.pitch_queue.put, stop_event)
+        except Exception:
+            traceback.print_exc()
+            self.pitch_queue.put(None)
+    
+    def stop_listening(self):
+        """Остановка записи с микрофона"""
+        if self.listen_stop is not None:
+            self.listen_stop.set()
+            self.listen_stop = None
+        self.singing_hold = (0, 0)
+    
+    def poll_pitch_queue(self):
+        """Разбор накопленных кадров в потоке интерфейса"""
+        if self.listen_stop is None:
+            return
+        while True:
+            try:
+                frames = self.pitch_queue.get_nowait()
+            except queue.Empty:
+                break
+            if frames is None:
+                self.stop_listening()
+                self.singing_result_label.config(text="Микрофон недоступен", fg=self.colors['danger'])
+                return
+            if self.singing_reference_playing:
+                continue
+            for frame in frames:
+                if self.track_sung_frame(frame):
+                    return
+        self.root.after(PITCH_HOP_MS, self.poll_pitch_queue)
+    
+    def track_sung_frame(self, frame):
+        """Учет одного кадра; True, если нота удержана и ответ отправлен"""
+        midi = int(frame["midi"]) if frame["confidence"] >= self.SINGING_MIN_CONFIDENCE else 0
+        if not midi:
+            self.singing_pitch_label.config(text="—", fg='black')
+            self.singing_hold = (0, 0)
+            return False
+        cents = float(frame["cents"])
+        in_tune = abs(cents) <= 25
+        self.singing_pitch_label.config(text=f"{PitchTable.name(midi)}  {cents:+.0f} ц",
+                                        fg=self.colors['success'] if in_tune else self.colors['warning'])
+        held_midi, count = self.singing_hold
+        self.singing_hold = (midi, count + 1 if midi == held_midi else 1)
+        if self.singing_hold[1] >= self.SINGING_HOLD_FRAMES:
+            self.check_singing_answer(midi, cents)
+            return True
+        return False
+    
+    def check_singing_answer(self, midi, cents):
+        """Проверка спетой ноты"""
+        self.stop_listening()
+        result = self.singing_engine.submit_answer(midi)
+        if result is None:
+            return
+        self.record_answer(self.singing_engine, midi, result)
         
-        # Инициализация состояния упражнения
-        self.chord_game_active = False
-        self.current_chord = None
-        self.current_base_note = None
-        self.difficulty_label.config(text=f"Текущий уровень: {self.current_difficulty}")
+        if result["correct"]:
+            self.singing_result_label.config(
+                text=f"✓ Правильно! {PitchTable.name(midi)}, отклонение {cents:+.0f} центов", 
+                fg=self.colors['success'])
+            self.play_feedback_sound(True)
+        else:
+            self.singing_result_label.config(
+                text=f"✗ Спета {PitchTable.name(midi)}, нужна {PITCH_CLASS_NAMES[result['expected'] % 12]}", 
+                fg=self.colors['danger'])
+            self.play_feedback_sound(False)
+        
+        self.update_singing_statistics()
+        self.root.after(2000, self.next_singing_round)
+    
+    def next_singing_round(self):
+        """Новая нота для пения"""
+        if self.singing_engine.active:
+            self.audio_worker.cancel()
+            midi = self.singing_engine.next_item()
+            self.singing_result_label.config(
+                text=f"Спойте: {PITCH_CLASS_NAMES[midi % 12]} ({self.notes_dict.get(PITCH_CLASS_NAMES[midi % 12], '')})", 
+                fg=self.colors['accent'])
+            self.singing_play_button.config(state=tk.NORMAL)
+            # Запись включится, когда доиграет образец
+            self.play_current_singing_note()
+    
+    def update_singing_statistics(self):
+        """Обновление статистики пения"""
+        text = self.format_statistics(self.singing_engine)
+        if text:
+            self.singing_stats_label.config(text=text)
+    
+    def start_singing_exercise(self):
+        """Начало упражнения на пение"""
+        self.singing_engine.start()
+        self.update_singing_statistics()
+        self.next_singing_round()
+    
+    def stop_singing_exercise(self):
+        """Остановка упражнения на пение"""
+        self.stop_listening()
+        self.singing_engine.stop()
+        self.singing_result_label.config(text="Упражнение остановлено", fg=self.colors['warning'])
+        self.singing_play_button.config(state=tk.DISABLED)
     
     def rhythm_exercise(self):
         """Ритмические упражнения"""
-        self.clear_window()
+        self.screens.show("rhythm", self.build_rhythm_screen, self.enter_rhythm_screen)
+    
+    def build_rhythm_screen(self, screen):
+        """Экран ритмических упражнений: строится один раз"""
         
         # Главный контейнер
-        main_container = tk.Frame(self.root, bg=self.colors['bg'])
+        main_container = tk.Frame(screen, bg=self.colors['bg'])
         main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
         # Заголовок
@@ -1433,9 +5268,10 @@ class SolfeggioApp:
                              relief=tk.RAISED, bd=1)
         desc_frame.pack(fill=tk.X, pady=(0, 20), padx=10)
         
-        desc_text = """Простучите ритмический рисунок, показанный на экране.
-        Начните с простых ритмов и постепенно переходите к более сложным.
-        Вы можете использовать метроном для поддержания темпа."""
+        desc_text = """Простучите ритмический рисунок, показанный на экране, пробелом или щелчком по рисунку -
+        вместе с проигрыванием ритма или под метроном с любой сильной доли.
+        После попытки видно, насколько раньше (минус) или позже (плюс) прозвучал каждый удар.
+        Начните с простых ритмов и постепенно переходите к более сложным."""
         
         tk.Label(desc_frame, text=desc_text, font=self.fonts['normal'], 
                 bg=self.colors['card'], fg=self.colors['fg'], 
@@ -1472,12 +5308,22 @@ class SolfeggioApp:
                                        bg='white', fg='black')
         self.rhythm_display.pack(expand=True)
         
+        # Удары: щелчок по рисунку или пробел (привязывается при входе на экран)
+        rhythm_display_frame.bind('<Button-1>', self.on_rhythm_tap)
+        self.rhythm_display.bind('<Button-1>', self.on_rhythm_tap)
+        
         # Пояснение ритма
         self.rhythm_explanation = tk.Label(main_container, text="", 
                                           font=self.fonts['normal'], bg=self.colors['bg'], 
                                           fg=self.colors['accent'])
         self.rhythm_explanation.pack(pady=5)
         
+        # Оценка простукивания
+        self.rhythm_tap_label = tk.Label(main_container, text="", 
+                                        font=self.fonts['normal'], bg=self.colors['bg'], 
+                                        fg=self.colors['fg'], wraplength=800)
+        self.rhythm_tap_label.pack(pady=5)
+        
         # Панель управления
         control_frame = tk.Frame(main_container, bg=self.colors['bg'])
         control_frame.pack(fill=tk.X, pady=20)
@@ -1505,10 +5351,30 @@ class SolfeggioApp:
                                  command=self.toggle_metronome, cursor='hand2',
                                  relief=tk.RAISED, bd=0,
                                  activebackground='#3d566e', activeforeground='white')
-        self.metronome_active = False
         self.metronome_btn = metronome_btn
         metronome_btn.pack(side=tk.LEFT, padx=5)
         
+        # Темп метронома
+        tempo_frame = tk.Frame(main_container, bg=self.colors['bg'])
+        tempo_frame.pack(fill=tk.X)
+        
+        tk.Label(tempo_frame, text="Темп (BPM):", 
+                font=self.fonts['normal'], bg=self.colors['bg'], 
+                fg=self.colors['fg']).pack(side=tk.LEFT, padx=5)
+        
+        tempo_scale = tk.Scale(tempo_frame, from_=40, to=208, orient=tk.HORIZONTAL,
+                              length=250, font=self.fonts['small'],
+                              bg=self.colors['bg'], fg=self.colors['fg'],
+                              highlightthickness=0, troughcolor=self.colors['card'],
+                              command=self.change_metronome_tempo)
+        tempo_scale.set(self.metronome_tempo)
+        tempo_scale.pack(side=tk.LEFT, padx=5)
+        
+        self.metronome_jitter_label = tk.Label(tempo_frame, text="", 
+                                              font=self.fonts['small'], bg=self.colors['bg'], 
+                                              fg=self.colors['accent'])
+        self.metronome_jitter_label.pack(side=tk.LEFT, padx=10)
+        
         # Панель навигации
         nav_frame = tk.Frame(main_container, bg=self.colors['bg'])
         nav_frame.pack(fill=tk.X, pady=20)
@@ -1528,11 +5394,16 @@ class SolfeggioApp:
                            relief=tk.RAISED, bd=0,
                            activebackground='#3d566e', activeforeground='white')
         home_btn.pack(side=tk.LEFT, padx=5)
-        
-        # Инициализация упражнения
-        self.current_rhythm_level = "Начальный"
+    
+    def enter_rhythm_screen(self):
+        """Вход на экран: новый ритм выбранного уровня, метроном выключен"""
+        self.current_rhythm_level = self.rhythm_difficulty.get()
+        self.metronome_btn.config(text="⏱️ Метроном", bg=self.colors['card'], fg=self.colors['fg'])
+        self.metronome_jitter_label.config(text="")
+        # Пробел - удар по ритму, пока открыт этот экран
+        self.root.bind('<KeyPress-space>', self.on_rhythm_tap)
         self.generate_new_rhythm()
-        
+    
     def change_rhythm_difficulty(self):
         """Изменение уровня сложности ритмических упражнений"""
         self.current_rhythm_level = self.rhythm_difficulty.get()
@@ -1554,38 +5425,128 @@ class SolfeggioApp:
         
         self.current_rhythm = rhythm_pattern
         self.current_rhythm_explanation = explanation
-        
+        self.rhythm_take = None
+        self.rhythm_take_id = None
+        self.rhythm_tap_label.config(text="")
+        
+    def render_rhythm_buffer(self, pattern, tempo):
+        """Буфер ритмического рисунка в заданном темпе"""
+        frequency = self.note_frequencies["До"]
+        return self._cached_render([frequency], ("rhythm", pattern, tempo))
+    
     def play_rhythm_pattern(self):
         """Воспроизведение ритмического рисунка"""
-        if not hasattr(self, 'current_rhythm'):
+        if not self.current_rhythm:
             return
-            
-        frequency = int(self.note_frequencies["До"])
-        duration_map = {
-            "𝅝": 1600,  # Целая нота
-            "𝅗𝅥": 800,   # Половинная
-            "♩": 400,   # Четвертная
-            "♪": 200,   # Восьмая
-            "♬": 100,   # Шестнадцатая
-            ".": 0,     # Точка (пауза)
-        }
-        
-        def play_rhythm():
-            if self.metronome_active:
-                for i in range(4):
-                    winsound.Beep(800, 100)
-                    time.sleep(60 / self.metronome_tempo - 0.1)
-            
-            for char in self.current_rhythm:
-                if char in duration_map and duration_map[char] > 0:
-                    winsound.Beep(frequency, duration_map[char])
-                    time.sleep(0.05)
-                elif char == " ":
-                    time.sleep(0.1)
         
-        sound_thread = threading.Thread(target=play_rhythm)
-        sound_thread.daemon = True
-        sound_thread.start()
+        buffer = self.render_rhythm_buffer(self.current_rhythm, self.metronome_tempo)
+        if self.metronome_active:
+            # Такт метронома служит отсчетом, ритм вступает с его сильной доли. Щелчки долей,
+            # попадающих на сам рисунок, вмешиваются в его буфер: поток воспроизведения
+            # играет задания по одному, и отдельные щелчки ждали бы конца рисунка
+            start_at = self.metronome.downbeat_after(bars=1)
+            end = start_at + len(buffer) / self.synth.sample_rate
+            buffer = self.mix_metronome_clicks(buffer, start_at, self.metronome.beats_between(start_at, end))
+            self.metronome.mute(start_at, end)
+        else:
+            start_at = time.perf_counter() + self.RHYTHM_LEAD_IN
+        # Прерываем только еще звучащий рисунок, чтобы не сбросить щелчок отсчета из очереди
+        if time.perf_counter() < self.rhythm_playing_until:
+            self.audio_worker.cancel()
+        self.audio_worker.submit(buffer, start_at=start_at)
+        self.rhythm_playing_until = start_at + len(buffer) / self.synth.sample_rate
+        self.open_rhythm_take(start_at)
+    
+    def mix_metronome_clicks(self, buffer, start, beats):
+        """Буфер рисунка со щелчками долей; beats - (момент, сильная ли доля), start - начало буфера"""
+        rate = self.synth.sample_rate
+        clicks = [(round((moment - start) * rate), self.render_metronome_click(accent))
+                  for moment, accent in beats]
+        length = max([len(buffer)] + [offset + len(click) for offset, click in clicks])
+        mixed = np.zeros(length, dtype=np.int32)
+        mixed[:len(buffer)] += buffer
+        for offset, click in clicks:
+            mixed[offset:offset + len(click)] += click
+        return np.clip(mixed, -32768, 32767).astype(np.int16)
+    
+    def open_rhythm_take(self, start=None):
+        """Новая попытка простукивания; start - момент первой ноты (None - по первому удару)"""
+        self.rhythm_take = {"id": next(self.rhythm_takes), "recorder": TapRecorder(), "start": None}
+        self.rhythm_take_id = self.rhythm_take["id"]
+        self.rhythm_tap_label.config(text="Стучите вместе с ритмом...", fg=self.colors['accent'])
+        if start is not None:
+            self.anchor_rhythm_take(start)
+    
+    def anchor_rhythm_take(self, start):
+        """Привязка сетки начал нот к моменту первой ноты и планирование конца попытки"""
+        take = self.rhythm_take
+        onsets, durations = compile_rhythm(self.current_rhythm)
+        beat = 60.0 / self.metronome_tempo
+        take["start"] = start
+        take["onsets"] = start + onsets * beat
+        # Попытка длится до конца рисунка и еще одну долю на запоздалые удары
+        end = start + (onsets[-1] + durations[-1] + 1) * beat
+        delay_ms = max(0, int((end - time.perf_counter()) * 1000))
+        self.root.after(delay_ms, lambda: self.close_rhythm_take(take["id"]))
+    
+    def on_rhythm_tap(self, event):
+        """Удар: только метка времени события, вся оценка - после попытки в фоне"""
+        take = self.rhythm_take
+        if take is None:
+            if not self.metronome_active or not self.current_rhythm:
+                self.rhythm_tap_label.config(text="Проиграйте ритм или включите метроном и стучите с сильной доли",
+                                             fg=self.colors['warning'])
+                return
+            self.open_rhythm_take()
+            take = self.rhythm_take
+        recorder = take["recorder"]
+        recorder.tap(getattr(event, "time", None) or None)
+        if take["start"] is None:
+            # Под метроном рисунок начинается с сильной доли, ближайшей к первому удару
+            self.anchor_rhythm_take(self.metronome.nearest_downbeat(recorder.times()[0]))
+    
+    def close_rhythm_take(self, take_id):
+        """Конец попытки: оценка ударов уходит в фоновый поток"""
+        take = self.rhythm_take
+        if take is None or take["id"] != take_id:
+            return
+        self.rhythm_take = None
+        future = self.rhythm_scorer.submit(score_rhythm_taps, take["onsets"], take["recorder"].times())
+        future.add_done_callback(lambda done: self.rhythm_results.put((take_id, done.result())))
+        self.root.after(10, self.poll_rhythm_results, take_id)
+    
+    def poll_rhythm_results(self, take_id):
+        """Вывод готовой оценки простукивания в потоке интерфейса
+        
+        Выводится только оценка последней попытки; запоздавшие оценки прежних
+        попыток отбрасываются. Опрос прекращается, когда попытка оценена или устарела.
+        """
+        while True:
+            try:
+                result_take_id, result = self.rhythm_results.get_nowait()
+            except queue.Empty:
+                break
+            if result_take_id != self.rhythm_take_id:
+                continue
+            self.rhythm_take_id = None
+            self.rhythm_tap_label.config(text=self.format_rhythm_score(result),
+                                         fg=self.colors['success'] if result['score'] >= 80 else self.colors['warning'])
+        if take_id == self.rhythm_take_id:
+            self.root.after(10, self.poll_rhythm_results, take_id)
+    
+    @staticmethod
+    def format_rhythm_score(result):
+        """Текст оценки: ошибка каждой ноты, пропуски, лишние удары и общий счет"""
+        notes = "  ".join(f"{number}: пропуск" if error is None else f"{number}: {error:+.0f}"
+                          for number, error in enumerate(result["errors_ms"], 1))
+        lines = [f"Ноты (мс): {notes}",
+                 f"Точность: {result['score']:.0f}%, попаданий {result['hits']}, "
+                 f"пропущено {result['missed']}, лишних ударов {result['extra']}"]
+        if result["hits"]:
+            tendency = "позже" if result["mean_ms"] > 0 else "раньше"
+            lines.append(f"В среднем {tendency} на {abs(result['mean_ms']):.0f} мс, "
+                         f"разброс {result['std_ms']:.0f} мс")
+        return "\n".join(lines)
         
     def toggle_metronome(self):
         """Включение/выключение метронома"""
@@ -1597,1146 +5558,173 @@ class SolfeggioApp:
         else:
             self.metronome_btn.config(text="⏱️ Метроном", bg=self.colors['card'], fg=self.colors['fg'])
             self.stop_metronome()
-            
+    
+    def render_metronome_click(self, accent):
+        """Буфер щелчка метронома: сильная доля выше остальных"""
+        return self._cached_render([1000 if accent else 800], ("note", 50))
+    
+    def play_metronome_click(self, accent, deadline, on_start):
+        """Щелчок метронома через общий поток воспроизведения, точно в момент доли"""
+        self.audio_worker.submit(self.render_metronome_click(accent), start_at=deadline, on_start=on_start)
+    
+    def change_metronome_tempo(self, value):
+        """Смена темпа без перезапуска метронома"""
+        self.metronome_tempo = int(float(value))
+        self.metronome.set_tempo(self.metronome_tempo)
+    
     def start_metronome(self):
-        """Запуск метронома"""
-        def metronome_loop():
-            while self.metronome_active:
-                winsound.Beep(1000, 50)
-                time.sleep(60 / self.metronome_tempo - 0.05)
-                
-                for _ in range(3):
-                    winsound.Beep(800, 50)
-                    time.sleep(60 / self.metronome_tempo - 0.05)
-        
-        if self.metronome_thread is None or not self.metronome_thread.is_alive():
-            self.metronome_thread = threading.Thread(target=metronome_loop)
-            self.metronome_thread.daemon = True
-            self.metronome_thread.start()
-            
+        """Запуск метронома; звучащий рисунок прерывается, иначе щелчки ждали бы его конца"""
+        self.audio_worker.cancel()
+        self.rhythm_playing_until = 0.0
+        self.metronome.set_tempo(self.metronome_tempo)
+        self.metronome.start()
+        self.update_metronome_jitter()
+    
+    def update_metronome_jitter(self):
+        """Периодический вывод точности метронома"""
+        if not self.metronome_active:
+            return
+        stats = self.metronome.jitter_stats()
+        self.metronome_jitter_label.config(
+            text=f"Точность расписания щелчков (без задержки звуковой карты): ср. {stats['mean_ms']:.2f} мс, "
+                 f"разброс {stats['std_ms']:.2f} мс, макс. {stats['max_ms']:.2f} мс"
+        )
+        self.root.after(1000, self.update_metronome_jitter)
+    
     def stop_metronome(self):
         """Остановка метронома"""
         self.metronome_active = False
+        self.metronome.stop()
     
-    def clear_window(self):
-        """Очистка окна"""
-        for widget in self.root.winfo_children():
-            widget.destroy()
+    def leave_screen(self, name):
+        """Уход с экрана: фоновая работа экрана останавливается, виджеты остаются"""
+        self.stop_metronome()
+        self.stop_listening()
+        self.rhythm_take = None
+        self.rhythm_take_id = None
+        self.root.unbind('<KeyPress-space>')
+        # Расписание пишется на диск только при уходе с идущего упражнения на интервалы
+        # (остановка упражнения и закрытие окна сохраняют его сами), а не при каждом переключении
+        if name == "intervals" and self.interval_engine.active:
+            self.save_interval_scheduler()
+        # Отложенные переходы к следующему вопросу не должны сработать на скрытом экране
+        for engine in (self.note_engine, self.interval_engine, self.chord_engine,
+                       self.dictation_engine, self.singing_engine):
+            engine.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сольфеджио-Про")
+    parser.add_argument("--export", metavar="DIR",
+                        help="выгрузить все ноты, интервалы и аккорды в WAV и выйти")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="число процессов для выгрузки (по умолчанию - число ядер)")
+    parser.add_argument("--scaling", action="store_true",
+                        help="замерить скорость выгрузки при разном числе процессов")
+    parser.add_argument("--timbre", choices=list(TIMBRE_PRESETS), default="sine",
+                        help="тембр для выгрузки")
+    parser.add_argument("--bench", action="store_true",
+                        help="проверить, что синтез всех тембров укладывается в бюджет процессора")
+    parser.add_argument("--simulate", type=int, metavar="N",
+                        help="прогнать N раундов каждого упражнения без интерфейса")
+    parser.add_argument("--pitch", metavar="WAV",
+                        help="определить высоту тона в записи и вывести спетые ноты")
+    parser.add_argument("--search", metavar="ЗАПРОС",
+                        help="найти строки в темах теории")
+    parser.add_argument("--history", action="store_true",
+                        help="показать итоги и самые трудные вопросы из журнала ответов")
+    args = parser.parse_args(argv)
+    try:
+        check_audio_backend_name(os.environ.get("SOLFEGGIO_AUDIO"))
+    except ValueError as error:
+        parser.error(f"SOLFEGGIO_AUDIO: {error}")
+    
+    if args.history:
+        history = HistoryStore(user_data_path("history.sqlite3"))
+        for exercise in ("notes", "intervals", "chords", "dictation", "singing"):
+            total = history.totals(exercise)
+            started = time.perf_counter()
+            accuracy = history.item_accuracy(exercise)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"{exercise}: {total['score']}/{total['attempts']} ({total['accuracy'] * 100:.1f}%), "
+                  f"{len(accuracy)} вопросов, запрос {elapsed_ms:.1f} мс")
+            hardest = sorted(accuracy.items(), key=lambda entry: entry[1][0] / entry[1][1])[:5]
+            for item, (correct, attempts) in hardest:
+                print(f"    {item}: {correct}/{attempts}")
+        history.close()
+        return
+    
+    if args.search:
+        started = time.perf_counter()
+        index = load_theory_index()
+        loaded = time.perf_counter()
+        hits = index.search(args.search)
+        finished = time.perf_counter()
+        titles = dict(THEORY_TOPICS)
+        for hit in hits:
+            print(f"{titles[hit['key']]}, строка {hit['line']}: {hit['text'].strip()}")
+        print(f"Найдено: {len(hits)}, индекс {(loaded - started) * 1000:.1f} мс, "
+              f"запрос {(finished - loaded) * 1000:.3f} мс")
+        return
+    
+    if args.pitch:
+        samples, sample_rate = read_wav(args.pitch)
+        detector = PitchDetector(sample_rate)
+        started = time.thread_time()
+        frames = detector.process(samples)
+        elapsed = time.thread_time() - started
+        for segment in pitch_segments(frames):
+            print(f"{segment['start']:7.2f}-{segment['end']:6.2f} с  {PitchTable.name(segment['midi']):>7}  "
+                  f"{segment['cents']:+5.0f} ц")
+        voiced = np.count_nonzero(frames["frequency"])
+        print(f"Кадров: {len(frames)}, с тоном: {voiced}, анализ {elapsed * 1000:.1f} мс "
+              f"({elapsed / max(len(frames), 1) * 1000:.3f} мс на кадр, бюджет {PITCH_CPU_BUDGET * 1000:.0f} мс)")
+        return
+    
+    if args.simulate:
+        spaced = IntervalExercise()
+        spaced.sampler = SpacedRepetitionScheduler(build_interval_bank(octaves=range(-2, 3)))
+        adaptive = ChordExercise("Продвинутый", roots=range(PitchTable.LOWEST, PitchTable.HIGHEST - 11))
+        adaptive.sampler = AdaptiveSampler(adaptive.bank())
+        engines = [("notes", NoteExercise()), ("intervals", IntervalExercise()),
+                   ("chords", ChordExercise("Продвинутый")),
+                   (f"SM-2 ({len(spaced.sampler)})", spaced),
+                   (f"alias ({len(adaptive.sampler.items)})", adaptive),
+                   ("dictation", DictationExercise(length=16)), ("singing", SingingExercise())]
+        for label, engine in engines:
+            stats = simulate_exercise(engine, args.simulate)
+            print(f"{label:>11}: {stats['score']}/{stats['attempts']} "
+                  f"({stats['accuracy'] * 100:.1f}%), {stats['rounds_per_minute'] / 1e6:.1f} млн раундов/мин")
+        return
+    
+    if args.bench:
+        results = benchmark_synthesis()
+        for timbre, result in results.items():
+            status = "OK" if result["within_budget"] else "ПРЕВЫШЕН"
+            print(f"{timbre:>6}: {result['cost'] * 1000:.3f} мс на секунду звука "
+                  f"(бюджет {SYNTH_CPU_BUDGET * 1000:.1f} мс) - {status}")
+        pitch = benchmark_pitch_detection()
+        status = "OK" if pitch["within_budget"] else "ПРЕВЫШЕН"
+        print(f" pitch: {pitch['p50_ms']:.3f} мс на кадр (p99 {pitch['p99_ms']:.3f} мс, "
+              f"бюджет {PITCH_CPU_BUDGET * 1000:.0f} мс на {PITCH_HOP_MS} мс) - {status}")
+        if not all(result["within_budget"] for result in results.values()) or not pitch["within_budget"]:
+            sys.exit(1)
+        return
+    
+    if args.scaling:
+        print("Процессов  Элементов/с  Ускорение")
+        for row in export_scaling_report(args.workers):
+            print(f"{row['workers']:>9}  {row['items_per_second']:>11.1f}  {row['speedup']:>8.2f}x")
+        return
+    
+    if args.export:
+        result = export_exercise_bank(args.export, workers=args.workers,
+                                      synth=SynthEngine(timbre=args.timbre))
+        print(f"Всего: {result['total']}, синтезировано: {result['rendered']}, "
+              f"без изменений: {result['skipped']}, процессов: {result['workers']}, "
+              f"{result['seconds']:.2f} с ({result['items_per_second']:.1f} элементов/с)")
+        return
     
-    # Методы для получения текста теории из учебника (остаются без изменений)
-    def get_sound_basics_text(self):
-        return """ОСНОВЫ МУЗЫКАЛЬНОГО ЗВУКА
-
-Введение в мир музыкальных звуков
-Добро пожаловать в удивительный мир музыки! Сегодня мы начнем наше путешествие с самого фундамента - с понимания того, что такое музыкальный звук и чем он отличается от обычного шума.
-
-1. Что такое звук?
-Звук - это физическое явление, которое возникает в результате колебаний какого-либо упругого тела. Представьте себе гитарную струну - когда вы ее дергаете, она начинает вибрировать, создавая звуковые волны, которые достигают наших ушей.
-
-Все звуки делятся на две большие категории:
-
-Музыкальные звуки:
-Имеют определенную высоту
-Обладают ясным тембром
-Могут быть точно воспроизведены
-Примеры: звук фортепиано, скрипки, человеческого голоса
-
-Шумовые звуки:
-Не имеют определенной высоты
-Характеризуются нерегулярными колебаниями
-Примеры: стук молотко, шум дождя, шелест листьев
-
-2. Четыре главных свойства музыкального звука
-У каждого музыкального звука есть четыре основных характеристики, которые делают его уникальным:
-
-🎯 ВЫСОТА ЗВУКА
-Что это? Свойство, которое позволяет нам различать высокие и низкие звуки.
-
-От чего зависит? От частоты колебаний:
-Высокие звуки = высокая частота (быстрые колебания)
-Низкие звуки = низкая частота (медленные колебания)
-
-Практический пример:
-Женский голос обычно выше мужского
-Писк мыши - высокий звук, рычание льва - низкий
-
-Диапазон человеческого слуха: от 16 до 20 000 колебаний в секунду (Герц)
-
-⏱️ ДЛИТЕЛЬНОСТЬ
-Что это? Продолжительность звучания во времени.
-
-Как измеряется? В музыкальных долях:
-Целые ноты
-Половинные
-Четвертные
-Восьмые и т.д.
-
-Практическое значение: Длительности создают ритм - сердцебиение музыки.
-
-🔊 ГРОМКОСТЬ
-Что это? Сила звучания, интенсивность звука.
-
-От чего зависит? От амплитуды колебаний:
-Большая амплитуда = громкий звук
-Малая амплитуда = тихий звук
-
-Музыкальные обозначения:
-p (piano) - тихо
-f (forte) - громко
-mp (mezzo piano) - умеренно тихо
-mf (mezzo forte) - умеренно громко
-
-🎨 ТЕМБР
-Что это? Окраска звука, его "оттенок".
-
-Почему важен? Позволяет отличать звучание разных инструментов, даже когда они играют одну и ту же ноту.
-
-Пример: Нота "До" на фортепиано и на скрипке звучит по-разному именно из-за тембра.
-
-3. Звукоряд и октавы
-Что такое звукоряд?
-Это последовательность музыкальных звуков, расположенных по высоте - от низких к высоким.
-
-Октава - основная единица
-Октава - это интервал между двумя звуками, частота второго из которых в два раза больше частоты первого.
-
-На фортепиано октава включает 12 звуков (7 основных и 5 производных)
-
-Система октав:
-Субконтроктава (самые низкие звуки)
-Контроктава
-Большая октава
-Малая октава
-Первая октава
-Вторая октава
-Третья октава
-Четвертая октава
-Пятая октава (самые высокие звуки)
-
-4. Полутон и целый тон
-Полутон
-Самое маленькое расстояние между звуками в европейской музыке
-На фортепиано: расстояние между двумя соседними клавишами
-Пример: от "До" до "До-диез"
-
-Целый тон
-Состоит из двух полутонов
-Пример: от "До" до "Ре"
-
-5. Знаки альтерации - изменяем высоту звуков
-Знаки альтерации - это специальные символы, которые изменяют высоту нот:
-
-# ДИЕЗ
-Повышает звук на полтона
-Пример: "До" → "До-диез"
-
-b БЕМОЛЬ
-Понижает звук на полтона
-Пример: "Ре" → "Ре-бемоль"
-
-× ДУБЛЬ-ДИЕЗ
-Повышает звук на целый тон
-Пример: "До" → "До-дубль-диез" (звучит как "Ре")
-
-bb ДУБЛЬ+БЕМОЛЬ
-Понижает звук на целый тон
-Пример: "Ре" → "Ре-дубль-бемоль" (звучит как "До")
-
-♮ БЕКАР
-Отменяет действие любого знака альтерации
-Возвращает звук к его основной высоте
-
-Заключение
-Понимание основ музыкального звука - это первый и самый важный шаг в изучении музыки. Помните:
-
-Музыкальный звук имеет четыре свойства: высоту, длительность, громкость и тембр
-Звукоряд организует звуки по высоте
-Октава - основная единица измерения
-Полутон - минимальное расстояние между звуками
-Знаки альтерации помогают создавать разнообразие в музыке
-
-На следующей лекции мы познакомимся с нотами и нотным станом - языком, на котором говорят музыканты!"""
-
-    def get_notes_text(self):
-        return """НОТЫ И СИСТЕМА НОТНОЙ ЗАПИСИ
-
-Введение в музыкальную грамоту
-Сегодня мы познакомимся с удивительным изобретением человечества - нотной грамотой! Это универсальный язык, который позволяет записывать, хранить и передавать музыку через века и континенты.
-
-1. Что такое ноты и зачем они нужны?
-Нота - это графический знак для записи музыкального звука. Представьте, что ноты - это буквы в музыкальном алфавите!
-
-Зачем нужны ноты?
-✅ Сохранять музыку для будущих поколений
-✅ Передавать музыкальные идеи другим музыкантам
-✅ Изучать и анализировать музыкальные произведения
-✅ Исполнять музыку точно так, как задумал композитор
-
-2. Нотный стан - дом для нот
-Нотный стан (или нотоносец) - это система из пяти параллельных линий, на которых и между которыми пишутся ноты.
-
-Структура нотного стана🎼 :
-   5-я линия ────────
-   4-я линие ────────
-   3-я линия ────────  
-   2-я линия ────────
-   1-я линия ────────
-
-Линии нумеруются снизу вверх (1-я - самая нижняя)
-Промежутки между линиями тоже используются для записи нот
-Всего: 5 линий + 4 промежутка = 9 позиций для нот
-
-Добавочные линии
-Когда нот не хватает места на основных линиях, мы используем добавочные линии - короткие линии выше или ниже нотного стана.
-
-3. Строение ноты - из чего она состоит?
-Каждая нота состоит из нескольких элементов:
-
- Головка ноты
-Овал (может быть пустым или закрашенным)
-Определяет высоту звука
-
-📏 Штиль
-Вертикальная палочка
-Направление: вверх (справа) или вниз (слева)
-Обычно от 3-й линии: ноты выше - штиль вниз, ноты ниже - штиль вверх
-
-🎏 Флажок (хвост)
-Изогнутая линия от штиля
-Определяет длительность ноты
-Может быть один, два или больше флажков
-
-4. Ключи - ключ к пониманию нот
-Ключи определяют, каким нотам соответствуют линии и промежутки нотного стана.
-
-Скрипичный ключ (Ключ Соль) 𝄞
-- Определяет положение ноты Соль первой октавы
-- Записывается на второй линии
-- Используется для высоких голосов и инструментов
-- Самый распространенный ключ
-
-Басовый ключ (Ключ Фа) 𝄢
-- Определяет положение ноты Фа малой октавы
-- Записывается на четвертой линии
-- Используется для низких голосов и инструментов
-
-5. Система названий нот
-Основные 7 нот: До - Ре - Ми - Фа - Соль - Ля - Си
-Латинские обозначения: C - D - E - F - G - A - B (или H в некоторых странах)
-
-6. Расположение нот на нотном стане
-В скрипичном ключе:
-До - на 1-й добавочной
-Ре - под 1-й линией
-Ми - на 1-й линии
-Фа - в 1-м промежутке
-Соль - на 2-й линии  ← ключевая нота!
-Ля - во 2-м промежутке  
-Си - на 3-й линии
-
-В басовом ключе:
-Соль - на 1-й линии
-Ля - в 1-м промежутке
-Си - на 2-й линии
-До - во 2-м промежутке
-Ре - на 3-й линии
-Ми - в 3-м промежутке
-Фа - на 4-й линии  ← ключевая нота!
-
-7. Длительности нот - ритмическая азбука
-Основные длительности:
-Целая нота ○
-Самый долгий звук
-Пустая головка без штиля
-
-Половинная нота [○ со штилем]
-Вдвое короче целой
-Пустая головка со штилем
-
-Четвертная нота ♩
-В 4 раза короче целой
-Закрашенная головка со штилем
-
-Восьмая нота ♪
-В 8 раз короче целой
-Закрашенная головка с флажком
-
-Шестнадцатая нота [♩ с двумя флажками]
-В 16 раз короче целой
-Закрашенная головка с двумя флажками
-
-8. Паузы - музыкальное молчание
-Паузы - это знаки перерывов в звучании. У каждой длительности ноты есть соответствующая пауза:
-
-Целая пауза  - висит под четвертой линией
-Половинная пауза  - сидит на третьей линии
-Четвертная пауза  - зигзагообразный знак
-Восьмая пауза  - похожа на цифру 7
-Шестнадцатая пауза  - с двумя флажками
-
-Советы для начинающих
-Запоминайте постепенно - не пытайтесь выучить все сразу
-Практикуйтесь регулярно - лучше по 10 минут каждый день, чем 2 часа раз в неделю
-Используйте ассоциации - придумайте образы для запоминания нот
-Слушайте и читайте одновременно - это поможет связать зрительный образ со звуком
-Не бойтесь ошибок - они естественная часть обучения!
-
-Заключение
-Поздравляю! Вы сделали важный шаг в изучении музыкального языка. Теперь вы знаете:
-
-📝 Что такое ноты и нотный стан
-🎼 Как устроены скрипичный и басовый ключи
-🎵 Основные длительности нот и пауз
-🎹 Расположение нот на нотном стане
-"""
-
-    def get_rhythm_text(self):
-        return """РИТМ, МЕТР И ДЛИТЕЛЬНОСТИ
-
-Введение в музыкальное время
-Добро пожаловать в мир ритма - сердцебиения музыки! Сегодня мы изучим, как организовано время в музыке, и научимся понимать её внутренний пульс.
-
-1. Основные понятия: что такое ритм, метр и такт?
-🎵 РИТМ
-Ритм - это душа музыки! Это организация звуков во времени, последовательность различных длительностей.
-
-Простая аналогия: Представьте, что вы идете:
-Равномерные шаги: "ТАК-ТАК-ТАК-ТАК" - это ровный ритм
-Переменные шаги: "ТАК-та-та-ТАК-та" - это сложный ритм
-
-⏰ МЕТР
-Метр - это равномерное чередование сильных и слабых долей, своеобразный "скелет" ритма.
-
-Примеры метра:
-Марш: "РАЗ-два, РАЗ-два" (сильная-слабая)
-Вальс: "РАЗ-два-три" (сильная-слабая1-слабая2)
-
-📦 ТАКТ
-Такт - это отрезок музыки между двумя сильными долями. Представьте, что такты - это кирпичики, из которых строится музыкальное здание.
-
-2. Музыкальный размер - правила игры
-Размер - это цифровое обозначение метра, который записывается в начале нотного стана.
-
-Как читать размер?
-Верхняя цифра: сколько долей в такте
-Нижняя цифра: какая длительность считается одной долей
-
-Основные размеры:
-Двудольные размеры:
-2/4 - "две четверти" (марш)
-2/2 - "две половинки"
-
-Трехдольные размеры:
-3/4 - "три четверти" (вальс)
-3/8 - "три восьмые"
-
-Четверодольные размеры:
-4/4 - "четыре четверти" (самый распространенный)
-C - тоже означает 4/4
-
-3. Система длительностей - музыкальная математика
-Длительности нот связаны математическими соотношениями:
-
-СИСТЕМА ДЛИТЕЛЬНОСТЕЙ НОТ И ПАУЗ
-ЦЕЛАЯ НОТА
-Соотношение: 1 (базовая длительность)
-Внешний вид ноты: белый овал без штиля
-Пауза: черный прямоугольник под четвертой линией
-Длительность звучания: самая продолжительная
-
-ПОЛОВИННАЯ НОТА
-Соотношение: 1/2 от целой
-Внешний вид ноты: белый овал со штилем
-Пауза: черный прямоугольник на третьей линии
-Длительность звучания: в два раза короче целой
-
-ЧЕТВЕРТНАЯ НОТА
-Соотношение: 1/4 от целой
-Внешний вид ноты: черный овал со штилем
-Пауза: зигзагообразный знак
-Длительность звучания: в четыре раза короче целой
-
-ВОСЬМАЯ НОТА
-Соотношение: 1/8 от целой
-Внешний вид ноты: черный овал со штилем и одним флажком
-Пауза: знак, похожий на цифру 7 с одним флажком
-Длительность звучания: в восемь раз короче целой
-
-ШЕСТНАДЦАТАЯ НОТА
-Соотношение: 1/16 от целой
-Внешний вид ноты: черный овал со штилем и двумя флажками
-Пауза: знак с двумя флажками
-Длительность звучания: в шестнадцать раз короче целой
-
-ОТНОШЕНИЯ МЕЖДУ ДЛИТЕЛЬНОСТЯМИ:
-1 целая = 2 половинных
-1 целая = 4 четвертных  
-1 целая = 8 восьмых
-1 целая = 16 шестнадцатых
-1 половинная = 2 четвертных
-1 четвертная = 2 восьмых
-1 восьмая = 2 шестнадцатых
-
-4. Знаки для увеличения длительностей
-ТОЧКА РЯДОМ С НОТОЙ ●.
-Точка увеличивает длительность ноты наполовину:
-Четвертная с точкой = четвертная + восьмая
-Половина с точкой = половина + четверть
-Целая с точкой = целая + половина
-
-ЛИГА ⁀
-Лига - это дуга, соединяющая две ноты одинаковой высоты:
-Объединяет их длительности
-Создает непрерывное звучание
-Пример: ♪ ⁀ ♪ = ♫ (две четверти = половинная)
-
-5. Особые ритмические фигуры
-ТРИОЛЬ [3]
-Три ноты вместо двух на протяжении одной доли:
-Обозначается цифрой 3
-♪♪♪ (триоль) = ♫ (две восьмые)
-Создает ощущение плавности
-
-СИНКОПА ⤴⤵
-Синкопа - это смещение акцента с сильной доли на слабую:
-Примеры синкопы:
-Звук на слабой доле, а на сильной - пауза
-Долгий звук начинается на слабой доле и переходит на сильную
-Создает эффект неожиданности, "качания"
-
-6. Темп - скорость музыки
-Темп определяет, насколько быстро или медленно звучит музыка:
-
-Основные обозначения темпа:
-Медленные темпы:
-Largo (ларго) - очень медленно, широко
-Adagio (адажио) - спокойно, медленно
-
-Умеренные темпы:
-Andante (анданте) - спокойно, "шагом"
-Moderato (модерато) - умеренно
-
-Быстрые темпы:
-Allegro (аллегро) - быстро, весело
-Presto (престо) - очень быстро
-
-7. Динамические оттенки - громкость звучания
-Динамика показывает, насколько громко или тихо нужно играть:
-
-Основные обозначения:
-p - пиано (тихо)
-f - форте (громко)
-pp - пианиссимо (очень тихо)
-ff - фортиссимо (очень громко)
-mp - меццо-пиано (умеренно тихо)
-mf - меццо-форте (умеренно громко)
-
-Изменения громкости:
-Crescendo (крещендо) - постепенное усиление
-Decrescendo (декрещендо) - постепенное ослабление
-
-Советы для успешного освоения ритма
-✅ Слушайте внимательно - развивайте внутренний слух
-✅ Считайте вслух - это помогает держать темп
-✅ Используйте метроном - ваш лучший друг в работе с ритмом
-✅ Начинайте медленно - сначала точность, потом скорость
-✅ Хлопайте и топайте - подключайте всё тело к ощущению ритма
-
-Заключение
-Поздравляю! Теперь вы понимаете язык музыкального времени. Вы узнали:
-
-🎯 Что такое ритм, метр и такт
-🎯 Как читать музыкальные размеры
-🎯 Систему длительностей нот и пауз
-🎯 Особые ритмические фигуры
-🎯 Как темп и динамика влияют на характер музыки
-
-Помните: ритм - это не просто счёт, это живое дыхание музыки. Практикуйтесь регулярно, и скоро вы будете чувствовать ритм интуитивно!
-"""
-
-    def get_intervals_text(self):
-        return """ИНТЕРВАЛЫ
-
-Введение в мир интервалов
-Сегодня мы изучим одну из самых важных тем в музыке - интервалы! Это строительные блоки, из которых состоят все мелодии и аккорды. Представьте, что интервалы - это слова в языке музыки.
-
-1. Что такое интервал?
-Интервал - это расстояние между двумя звуками.
-
-Два типа интервалов:
-Мелодический интервал - звуки берутся последовательно (один за другим)
-До → Ре (восходящий)
-До → Си (нисходящий)
-
-Гармонический интервал - звуки берутся одновременно
-До + Ре (звучат вместе)
-
-2. Из чего состоит название интервала?
-Каждый интервал имеет две характеристики:
-
-Количественная (сколько ступеней охватывает)
-Прима (1) - одна ступень
-Секунда (2) - две ступени
-Терция (3) - три ступени
-Кварта (4) - четыре ступени
-Квинта (5) - пять ступеней
-Секста (6) - шесть ступеней
-Септима (7) - семь ступеней
-Октава (8) - восемь ступеней
-
-Качественная (точное количество тонов)
-Чистые (прима, кварта, квинта, октава)
-Малые (секунда, терция, секста, септима)
-Большие (секунда, терция, секста, септима)
-Увеличенные (любые интервалы)
-Уменьшенные (любые интервалы)
-
-3. Подробная таблица простых интервалов
-Интервал        Тонов    Пример от До   Характер звучания
-Чистая прима    0        До-До          Полное слияние
-Малая секунда   0.5      До-Ре♭         Напряженно
-Большая секунда 1        До-Ре          Уверенно
-Малая терция    1.5      До-Ми♭         Грустно
-Большая терция  2        До-Ми          Радостно
-Чистая кварта   2.5      До-Фа          Устойчиво
-Тритон          3        До-Фа♯         Драматично
-Чистая квинта   3.5      До-Соль        Благозвучно
-Малая секста    4        До-Ля♭         Лирично
-Большая секста  4.5      До-Ля          Восторженно
-Малая септима   5        До-Си♭         Напряженно
-Большая септима 5.5      До-Си          Резко
-Чистая октава   6        До-До          Полное слияние
-
-4. Тритоны - самые загадочные интервалы
-Тритон - это интервал в 3 тона, который делит октаву пополам.
-
-Два вида тритонов:
-Увеличенная кварта (3 тона) - До-Фа♯
-Уменьшенная квинта (3 тона) - До-Соль♭
-
-Особенности тритонов:
-Самые неустойчивые интервалы
-Сильно тяготеют к разрешению
-В средневековье назывались "диаболус ин музика" (дьявол в музыке)
-
-5. Обращение интервалов
-Обращение - это перенос нижнего звука на октаву вверх или верхнего звука на октаву вниз.
-
-Правила обращения:
-Количество ступеней: 9 - исходный интервал = обращенный
-Качество меняется на противоположное
-
-Таблица обращений:
-Прима (1)  ↔ Октава (8)
-Секунда (2) ↔ Септима (7)
-Терция (3)  ↔ Секста (6)
-Кварта (4)  ↔ Квинта (5)
-
-6. Консонансы и диссонансы
-Консонансы - благозвучные интервалы
-Абсолютные консонансы (полное слияние):
-Чистая прима
-Чистая октава
-Чистая квинта
-
-Относительные консонансы (приятное звучание):
-Большие и малые терции
-Большие и малые сексты
-
-Диссонансы - напряженные интервалы
-Резкие диссонансы:
-Все секунды
-Все септимы
-Все тритоны
-
-7. Разрешение диссонансов
-Диссонансы стремятся перейти в консонансы - это называется разрешением.
-
-Основные правила разрешения:
-Диссонанс → Консонанс
-Неустойчивые звуки → Устойчивые звуки
-Движение по тонам лада
-
-Примеры разрешений:
-Малая секунда До-Ре♭ → Большая терция До-Ми♭
-Тритон До-Фа♯ → Большая терция Ми-Соль
-
-Интервалы в музыке
-Характерные музыкальные примеры:
-Большая секста - начало песни "Jingle Bells"
-Чистая кварта - начало гимна "Боже, царя храни"
-Большая терция - мажорное трезвучие
-Малая терция - минорное трезвучие
-
-Эмоциональная окраска интервалов:
-Большие интервалы - светлые, радостные
-Малые интервалы - темные, грустные
-Тритоны - таинственные, напряженные
-
-Таблица для быстрого запоминания
-Простые интервалы от ноты До:
-Прима      - До-До      (0 тонов)
-Секунда    - До-Ре      (1 тон)
-Терция     - До-Ми      (2 тона)
-Кварта     - До-Фа      (2.5 тона)
-Квинта     - До-Соль    (3.5 тона)
-Секста     - До-Ля      (4.5 тона)
-Септима    - До-Си      (5.5 тонов)
-Октава     - До-До      (6 тонов)
-
-Заключение
-Поздравляю! Теперь вы понимаете язык музыкальных расстояний. Вы узнали:
-
-🎯 Что такое интервалы и их виды
-🎯 Все простые интервалы от примы до октавы
-🎯 Правила обращения интервалов
-🎯 Разницу между консонансами и диссонансами
-🎯 Как разрешать напряженные интервалы
-
-Интервалы - это фундамент всей музыки. Понимая их, вы сможете анализировать любые музыкальные произведения, сочинять собственные мелодии и развивать свой слух!"""
-
-    def get_chords_text(self):
-        return """АККОРДЫ: СТРОЕНИЕ И ВИДЫ
-
-Введение в гармонию
-Добро пожаловать в мир аккордов - магических сочетаний звуков, которые создают гармонию! Сегодня мы изучим, как из отдельных нот рождаются аккорды, и познакомимся с их удивительным разнообразием.
-
-1. Что такое аккорд?
-Аккорд - это сочетание трех или более звуков, взятых одновременно.
-
-Простая аналогия:
-Одна нота - это слово
-Интервал - это фраза
-Аккорд - это целое предложение!
-
-Основные характеристики аккорда:
-Состоит минимум из 3 звуков
-Звуки располагаются по терциям
-Создает гармоническую основу музыки
-
-2. Трезвучия - фундамент гармонии
-Трезвучие - это аккорд из трех звуков, расположенных по терциям.
-
-Строение трезвучия:
-Нижний звук - основной тон (прима)
-Средний звук - терция от основного тона
-Верхний звук - квинта от основного тона
-
-3. Четыре основных вида трезвучий
-МАЖОРНОЕ ТРЕЗВУЧИЕ (б.3 + м.3)
-Строение: большая терция + малая терция
-Звучание: светлое, радостное, устойчивое
-Обозначение: буквой (C, D, G) или словом "dur"
-Пример от До: До-Ми-Соль
-
-МИНОРНОЕ ТРЕЗВУЧИЕ (м.3 + б.3)
-Строение: малая терция + большая терция
-Звучание: темное, грустное, мечтательное
-Обозначение: буквой с "m" (Cm, Dm, Gm) или словом "moll"
-Пример от До: До-Ми-бемоль-Соль
-
-УМЕНЬШЕННОЕ ТРЕЗВУЧИЕ (м.3 + м.3)
-Строение: малая терция + малая терция
-Звучание: напряженное, тревожное, неустойчивое
-Обозначение: dim или маленьким кружком (Cdim, C°)
-Пример от До: До-Ми-бемоль-Соль-бемоль
-
-УВЕЛИЧЕННОЕ ТРЕЗВУЧИЕ (б.3 + б.3)
-Строение: большая терция + большая терция
-Звучание: фантастическое, загадочное, неустойчивое
-Обозначение: aug или плюсом (Caug, C+)
-Пример от До: До-Ми-Соль-диез
-
-4. Обращения трезвучий
-Обращение - это изменение порядка звуков в аккорде, когда нижним звуком становится не основной тон.
-
-СЕКСТАККОРД (6)
-Строение: терцовый тон в басу
-Обозначение: цифрой 6 (C6, Dm6)
-Звучание: менее устойчивое, чем основное трезвучие
-Пример от До мажора: Ми-Соль-До
-
-КВАРТСЕКСТАККОРД (6/4)
-Строение: квинтовый тон в басу
-Обозначение: цифрой 6/4 (C6/4, Dm6/4)
-Звучание: наименее устойчивое из всех обращений
-Пример от До мажора: Соль-До-Ми
-
-5. Септаккорды - аккорды с напряжением
-Септаккорд - это аккорд из четырех звуков, расположенных по терциям.
-
-МАЛЫЙ МАЖОРНЫЙ СЕПТАККОРД (ДОМИНАНТСЕПТАККОРД)
-Строение: мажорное трезвучие + малая терция
-Обозначение: цифрой 7 (C7, G7)
-Звучание: напряженное, сильно тяготеет к разрешению
-Пример от Соль: Соль-Си-Ре-Фа
-
-МАЛЫЙ МИНОРНЫЙ СЕПТАККОРД
-Строение: минорное трезвучие + малая терция
-Обозначение: m7 (Cm7, Dm7)
-Звучание: мягкое, меланхоличное
-Пример от До: До-Ми-бемоль-Соль-Си-бемоль
-
-УМЕНЬШЕННЫЙ СЕПТАККОРД
-Строение: уменьшенное трезвучие + малая терция
-Обозначение: dim7 или °7 (Cdim7, C°7)
-Звучание: очень напряженное, таинственное
-Пример от До: До-Ми-бемоль-Соль-бемоль-Си-дубль-бемоль
-
-БОЛЬШОЙ МАЖОРНЫЙ СЕПТАККОРД
-Строение: мажорное трезвучие + большая терция
-Обозначение: maj7 (Cmaj7)
-Звучание: яркое, "небесное"
-Пример от До: До-Ми-Соль-Си
-
-6. Главные трезвучия в тональности
-В каждой тональности есть три основных аккорда, которые определяют ее гармоническую структуру:
-
-ТОНИЧЕСКОЕ ТРЕЗВУЧИЕ (T/t)
-Ступень: I (первая)
-Функция: устойчивая, точка покоя
-Пример в До мажоре: До-Ми-Соль
-Пример в ля миноре: Ля-До-Ми
-
-СУБДОМИНАНТОВОЕ ТРЕЗВУЧИЕ (S/s)
-Ступень: IV (четвертая)
-Функция: предыктовая, создает движение
-Пример в До мажоре: Фа-Ля-До
-Пример в ля миноре: Ре-Фа-Ля
-
-ДОМИНАНТОВОЕ ТРЕЗВУЧИЕ (D)
-Ступень: V (пятая)
-Функция: неустойчивая, сильно тяготеет к тонике
-Пример в До мажоре: Соль-Си-Ре
-Пример в ля миноре: Ми-Соль-диез-Си
-
-7. Аккордовые последовательности
-Аккорды редко используются по отдельности - они объединяются в последовательности:
-
-Основная последовательность:
-T → S → D → T
-(тоника → субдоминанта → доминанта → тоника)
-
-Таблица для быстрого запоминания
-Основные трезвучия от ноты До:
-До мажор: До-Ми-Соль (б.3 + м.3)
-До минор: До-Ми-бемоль-Соль (м.3 + б.3)
-До уменьшенное: До-Ми-бемоль-Соль-бемоль (м.3 + м.3)
-До увеличенное: До-Ми-Соль-диез (б.3 + б.3)
-
-Главные трезвучия в До мажоре:
-Tonic (T): До-Ми-Соль
-Subdominant (S): Фа-Ля-До
-Dominant (D): Соль-Си-Ре
-
-Заключение
-Поздравляю! Теперь вы понимаете язык музыкальной гармонии. Вы узнали:
-
-🎹 Что такое аккорды и трезвучия
-🎹 Четыре основных вида трезвучий
-🎹 Обращения аккордов
-🎹 Септаккорды и их напряжение
-🎹 Главные аккорды тональности
-🎹 Основные аккордовые последовательности
-
-Аккорды - это краски, которыми композитор рисует музыкальные картины. Понимая их, вы сможете не только анализировать музыку, но и создавать свою собственную!
-"""
-
-    def get_modes_text(self):
-        return """ЛАД, ТОНАЛЬНОСТЬ И СИСТЕМА ЗВУКОВОЙ ОРГАНИЗАЦИИ
-
-Введение в ладовую систему
-Сегодня мы познакомимся с фундаментальными понятиями музыки - ладом и тональностью. Это те принципы, которые превращают набор звуков в осмысленную музыкальную речь, наполненную чувствами и эмоциями.
-
-1. Основные понятия
-ЛАД
-Лад - это система взаимоотношений между звуками, где один звук становится центральным (тоникой), а остальные находятся в определенной зависимости от него.
-
-Простая аналогия: Представьте солнечную систему:
-- Тоника - это Солнце (центр)
-- Остальные звуки - это планеты, которые вращаются вокруг него
-
-ТОНАЛЬНОСТЬ
-Тональность - это конкретное высотное положение лада. Она определяется:
-- Тоникой - главным, центральным звуком
-- Ладовым наклонением - мажором или минором
-
-2. Ступени лада и их функции
-В каждом ладе 7 основных ступеней, каждая из которых имеет свое функциональное значение:
-
-I ступень - ТОНИКА (T/t)
-- Центр тяготения, точка покоя
-- Наиболее устойчивый звук
-- Определяет название тональности
-
-IV ступень - СУБДОМИНАНТА (S/s)
-- Нижняя опора, "предыктовая" функция
-- Создает движение от тоники
-- Подготавливает появление доминанты
-
-V ступень - ДОМИНАНТА (D)
-- Верхняя опора, главная неустойчивая функция
-- Сильнее всего тяготеет к тонике
-- Создает наибольшее напряжение
-
-II и VII ступени - ВВОДНЫЕ ЗВУКИ
-- Наиболее неустойчивые звуки
-- Сильно тяготеют к тонике
-- VII ступень называется "восходящий вводный звук"
-- II ступень называется "нисходящий вводный звук"
-
-III и VI ступени - МЕДИАНТЫ
-- Заполняют пространство между главными функциями
-- III ступень определяет мажор/минор
-- Создают плавность голосоведения
-
-3. Основные лады: мажор и минор
-МАЖОР (Dur)
-- Звучание: светлое, радостное, торжественное
-- Эмоциональная окраска: уверенность, оптимизм, ясность
-- Строение: Тон-Тон-Полутон-Тон-Тон-Тон-Полутон
-
-МИНОР (moll)
-- Звучание: темное, грустное, меланхоличное
-- Эмоциональная окраска: печаль, размышление, глубина
-- Строение: Тон-Полутон-Тон-Тон-Полутон-Тон-Тон
-
-4. Виды мажора и минор
-НАТУРАЛЬНЫЙ МАЖОР
-- Естественное строение без изменений
-- Устойчивое, ясное звучание
-- Пример: До-Ре-Ми-Фа-Соль-Ля-Си-До
-
-ГАРМОНИЧЕСКИЙ МАЖОР
-- Пониженная VI ступень
-- Усиленное тяготение к доминанте
-- Появляется восточный, драматический оттенок
-- Пример: До-Ре-Ми-Фа-Соль-Ля-бемоль-Си-До
-
-МЕЛОДИЧЕСКИЙ МАЖОР
-- При движении вверх - натуральный
-- При движении вниз - пониженные VI и VII ступени
-- Плавное, певучее звучание
-
-НАТУРАЛЬНЫЙ МИНОР
-- Естественное строение
-- Строгое, сдержанное звучание
-- Пример: Ля-Си-До-Ре-Ми-Фа-Соль-Ля
-
-ГАРМОНИЧЕСКИЙ МИНОР
-- Повышенная VII ступень
-- Усиленное тяготение к тонике
-- Более напряженное, драматичное звучание
-- Пример: Ля-Си-До-Ре-Ми-Фа-Соль-диез-Ля
-
-МЕЛОДИЧЕСКИЙ МИНОР
-- При движении вверх - повышенные VI и VII ступени
-- При движении вниз - натуральный
-- Более светлое, лирическое звучание
-
-5. Система тональностей
-ПАРАЛЛЕЛЬНЫЕ ТОНАЛЬНОСТИ
-- Мажор и минор, имеющие одинаковые ключевые знаки
-- Тоники находятся на расстоянии малой терции
-- Общие звуки, общие аккорды
-- Пример: До мажор (0 знаков) и Ля минор (0 знаков)
-
-ОДНОИМЕННЫЕ ТОНАЛЬНОСТИ
-- Мажор и минор с общей тоникой
-- Различаются тремя ступенями: III, VI, VII
-- Пример: До мажор (0 знаков) и До минор (3 бемоля)
-
-6. Квинтовый круг тональностей
-Квинтовый круг - это схематическое представление всех мажорных и параллельных им минорных тональностей, показывающее степень их родства.
-
-ДИЕЗНЫЕ ТОНАЛЬНОСТИ:
-До мажор (0#) 
-→ Соль мажор (1#) 
-→ Ре мажор (2#) 
-→ Ля мажор (3#) 
-→ Ми мажор (4#) 
-→ Си мажор (5#) 
-→ Фа-диез мажор (6#) 
-→ До-диез мажор (7#)
-
-БЕМОЛЬНЫЕ ТОНАЛЬНОСТИ:
-До мажор (0♭) 
-→ Фа мажор (1♭) 
-→ Си-бемоль мажор (2♭) 
-→ Ми-бемоль мажор (3♭) 
-→ Ля-бемоль мажор (4♭) 
-→ Ре-бемоль мажор (5♭) 
-→ Соль-бемоль мажор (6♭) 
-→ До-бемоль мажор (7♭)
-
-ПОРЯДОК ДИЕЗОВ:
-Фа-До-Соль-Ре-Ля-Ми-Си
-
-ПОРЯДОК БЕМОЛЕЙ:
-Си-Ми-Ля-Ре-Соль-До-Фа
-
-Заключение
-Лад и тональность - это фундаментальные принципы, которые организуют музыкальное пространство и время. Они превращают хаотичный набор звуков в осмысленную, эмоционально насыщенную речь.
-
-Понимание ладовой системы позволяет:
-- Анализировать музыкальные произведения
-- Предсказывать развитие музыкальной мысли
-- Создавать собственные композиции
-- Глубоко понимать эмоциональное содержание музыки
-
-От простых народных напевов до сложных симфонических полотен - всю музыку объединяет единый принцип ладовой организации, который делает ее универсальным языком человеческих чувств."""
-
-    def get_musical_form_text(self):
-        return """МУЗЫКАЛЬНАЯ ФОРМА И АНАЛИЗ
-
-Введение в музыкальную форму
-Музыкальная форма - это структура музыкального произведения, способ организации его частей во времени. Понимание формы помогает нам анализировать музыку, исполнять ее осознанно и создавать собственные композиции.
-
-1. Период и предложение
-Период
-- Это законченная музыкальная мысль, которая представляет собой целостное построение
-- Обычно состоит из 8-16 тактов
-- Делится на два предложения
-- Имеет четкую тональную структуру
-- Завершается полной каденцией
-
-Предложение
-- Это часть периода, обладающая относительной самостоятельностью
-- Первое предложение заканчивается на половинной каденции (часто на доминанте)
-- Второе предложение заканчивается на полной каденции (на тонике)
-- Каждое предложение обычно состоит из 4-8 тактов
-- Предложения могут быть симметричными или асимметричными
-
-2. Простые музыкальные формы
-Одночастная форма (A)
-- Самая простая музыкальная форма, состоящая из одного периода
-- Не делится на самостоятельные разделы
-- Часто используется в народных песнях и романсах
-- Пример: русская народная песня "Во поле береза стояла"
-
-Двухчастная форма (A-B)
-- Форма, состоящая из двух контрастных частей
-- Виды: без репризы и с репризой
-- Используется в песнях, танцах, инструментальных пьесах
-
-Трехчастная форма (A-B-A)
-- Классическая форма с репризой, самая распространенная в музыке
-- Структура: экспозиция - контрастная часть - реприза
-- Особенности: часть A устойчивая, B неустойчивая, реприза возвращает устойчивость
-
-3. Сложные музыкальные формы
-Форма рондо (A-B-A-C-A...)
-- Форма, в которой основная тема многократно повторяется
-- Рефрен чередуется с контрастными эпизодами
-- Создает ощущение движения по кругу
-- Часто используется в финалах сонат и симфоний
-
-Форма вариаций (A-A1-A2-A3...)
-- Форма, основанная на последовательном изменении основной тема
-- Типы: строгие (сохраняют гармонию) и свободные вариации
-- Этапы: первые вариации близки к теме, средние - максимальный контраст, финальные - возвращение
-
-Сонатная форма
-- Самая развитая и сложная форма классической музыке
-- Основные разделы: экспозиция, разработка, реприза
-- Характерен конфликт и его разрешение
-- Используется в первых частях сонат, симфоний, концертов
-
-4. Анализ музыкальных произведений
-Этапы музыкального анализа:
-- Общее знакомство: жанр, структура, тематические блоки
-- Гармонический анализ: тональный план, каденции, модуляции
-- Тематический анализ: мелодические и ритмические особенности
-- Фактурный анализ: голосоведение, текстура, инструментовка
-
-Методы анализа:
-- Целостный - произведение как единый организм
-- Сравнительный - сопоставление разных частей
-- Стилистический - особенности стиля композитора
-
-Заключение
-Музыкальная форма - это живой организм, развивающийся по своим законам. Понимание формы позволяет видеть логику музыкального развития и создавать целостные произведения."""
-
-    def get_harmony_text(self):
-        return """ГАРМОНИЯ И ГОЛОСОВЕДЕНИЕ
-
-Введение в гармонию
-Гармония - это фундаментальная дисциплина в музыке, изучающая сочетание звуков в вертикали (аккорды) и их последовательности. Голосоведение - это искусство ведения отдельных голосов в многоголосной музыке.
-
-1. Гармонические последовательности
-Определение гармонической последовательности
-- Это закономерная смена аккордов, создающая ощущение движения и развития
-- Основные типы: автентические, плагальные, полные каденционные
-
-Основные типы последовательностей
-Автентические последовательности:
-- Доминанта → Тоника (D → T)
-- Создают энергичное, решительное движение
-- Характерны для классической музыки
-
-Плагальные последовательности:
-- Субдоминанта → Тоника (S → T)
-- Мягкое, спокойное звучание
-- Часто используются в церковной музыке
-
-Полные каденционные последовательности:
-- Тоника → Субдоминанта → Доминанта → Тоника (T → S → D → T)
-- Наиболее полное и завершенное звучание
-- Классическая формула завершения музыкальной мысли
-
-2. Правила голосоведения
-Основные принципы движения голосов
-Параллельное движение:
-- Голоса движутся в одном направлении
-- Параллельные октавы и квинты запрещены
-- Параллельные терции и сексты разрешены
-
-Противодвижение:
-- Голоса движутся в противоположных направлениях
-- Создает богатую и независимую фактуру
-- Наиболее предпочтительный вид движения
-
-Косвенное движение:
-- Один голос остается на месте, другой движется
-- Создает плавные переходы между аккордами
-- Часто используется в каденциях
-
-3. Каденции и их виды
-Определение каденции
-- Это гармонический оборот, завершающий музыкальную мысль или ее часть
-
-Основные виды каденций
-Полная каденция:
-- Доминанта → Тоника (D → T)
-- Завершенное, окончательное звучание
-
-Половинная каденция:
-- Оканчивается на доминанте
-- Создает ощущение вопроса, незавершенности
-
-Плагальная каденция:
-- Субдоминанта → Тоника (S → T)
-- Мягкое, умиротворенное окончание
-
-Прерванная каденция:
-- Доминанта → Не тоника (D → VI ступень)
-- Неожиданный поворот, драматический эффект
-
-Заключение
-Гармония и голосоведение - это искусство создания выразительного и логичного музыкального целого. Понимание гармонии позволяет анализировать произведения и создавать осмысленные композиции."""
-
-    def get_dictation_text(self):
-        return """МУЗЫКАЛЬНЫЙ ДИКТАНТ
-
-Введение в музыкальный диктант
-Музыкальный диктант - это важнейший вид работы на уроках сольфеджио, развивающий музыкальный слух, память и мышление. Это процесс записи нотами музыкального материала, воспринимаемого на слух.
-
-1. Одноголосный диктант
-Что такое одноголосный диктант
-- Это запись одноголосной мелодии, проигрываемой преподавателем
-- Базовый навык для любого музыканта
-
-Этапы работы над одноголосным диктантом
-Первое прослушивание:
-- Определение общего характера мелодии
-- Запоминание ритмического рисунка
-- Определение размера и темпа
-- Выявление тональности и лада
-
-Второе прослушивание:
-- Уточнение метроритмической структуры
-- Запись ритма без нот
-- Определение фразировки и цезур
-- Выявление кульминационных точек
-
-Третье и последующие прослушивания:
-- Постепенное заполнение нотами
-- Проверка интервальных соотношений
-- Контроль за точностью записи
-- Уточнение деталей
-
-2. Методы развития слуха для диктанта
-Систематические тренировки
-- Регулярное написание диктантов
-- Поэтапное усложнение материала
-- Разнообразие тональностей и размеров
-
-Вспомогательные упражнения
-- Сольфеджирование - пение с называнием нот
-- Определение интервалов и аккордов на слух
-- Ритмические упражнения
-
-3. Практические советы
-Для начинающих
-- Начинайте с простых мелодий в одной тональности
-- Сначала записывайте ритм, потом высоту
-- Используйте внутреннее слуховое представление
-
-Общие рекомендаций
-- Сохранение спокойствия и концентрации
-- Создание комфортных условий для работы
-- Систематичность занятий
-
-Заключение
-Музыкальный диктант - это мощный инструмент развития музыкального сознания. Регулярная работа над диктантом позволяет развить тонкий музыкальный слух и научиться быстро анализировать музыку."""
-
-    def get_solfeggio_text(self):
-        return """СОЛЬФЕДЖИО И ВОКАЛИЗЫ
-
-Введение в сольфеджио и вокализы
-Сольфеджио и вокализы - это фундаментальные дисциплины в музыкальном образовании, развивающие слух, голос и музыкальное мышление. Они формируют основу профессиональной подготовки музыканта любого направления.
-
-1. Пение интервалов и аккордов
-Основные интервалы для пения
-Чистые интервалы:
-- Прима - повторение одного звука
-- Кварта - устойчивый, спокойный интервал
-- Квинта - пустой, гармоничный интервал
-- Октава - полное слияние звуков
-
-Большие и малые интервалы:
-- Секунды - шаговое движение
-- Терции - основа мажора и минор
-- Сексты - широкие, мелодичные
-- Септимы - напряженные, диссонирующие
-
-2. Чтение с листа
-Что такое чтение с листа
-- Это навык исполнения незнакомой музыки с первого прочтения нотного текста
-- Комплексное умение, сочетающее зрительное восприятие и слуховой контроль
-
-Этапы обучения чтению с листа
-Начальный уровень:
-- Простые мелодии в одной тональности
-- Основные длительности без сложных ритмов
-- Пение с тактированием
-
-Средний уровень:
-- Модуляции и отклонения
-- Сложные ритмические фигуры
-- Хроматические последования
-
-Продвинутый уровень:
-- Полифонические произведения
-- Современная нотация
-- Транспонирование
-
-3. Интонационные упражнения
-Цель интонационных упражнений
-- Развитие точности интонирования
-- Воспитание ладового чувства
-- Совершенствование музыкального слуха
-
-Виды интонационных упражнений
-- Упражнения на устойчивые ступени
-- Упражнения на вводные тоны
-- Хроматические упражнения
-
-Заключение
-Сольфеджио и вокализы формируют тонкий музыкальный слух, технически оснащенный голос и глубокое понимание музыкальной структуры. Регулярная работа открывает путь к свободному владению музыкальным языком."""
-
-
-def main():
     root = tk.Tk()
     
     # Устанавливаем иконку (если есть файл)
@@ -2754,6 +5742,7 @@ def main():
     root.geometry(f'{width}x{height}+{x}+{y}')
     
     app = SolfeggioApp(root)
+    root.protocol("WM_DELETE_WINDOW", app.on_close)
     root.mainloop()
 
 if __name__ == "__main__":